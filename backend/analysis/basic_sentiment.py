@@ -1,88 +1,59 @@
 from backend.analysis.engine import call_llm
+from backend.analysis.llm_resilience import WORKLOAD_INTERACTIVE
+from backend.analysis.local_sentiment import analyze_local
+from backend.analysis.review_sampler import BASIC_SAMPLE_TOKEN_BUDGET, stratified_sample
 
-def analyze_basic_sentiment(reviews: list[str]) -> dict:
-    """
-    📊 CX 통합 리포트 분석 (최종 안정판)
-
-    ✔ RAW 리뷰 개수 기준으로 sentiment 분포 보장
-    ✔ LLM은 '해석'만 담당
-    ✔ call_llm은 그대로 사용 (다른 서비스 영향 없음)
-    """
-
-    # ===============================
-    # 1. 입력 방어
-    # ===============================
-    if not reviews:
-        return {
-            "total": 0,
-            "positive": 0,
-            "neutral": 0,
-            "negative": 0,
-            "score": 0.0,
-            "keywords": [],
-            "summary": "",
-            "cx_report": {
-                "strengths": [],
-                "improvements": [],
-                "action_plans": [],
-                "issue_matrix": [],
-            },
-        }
-
-    sample_reviews = reviews[:50]
-    total_reviews = len(sample_reviews)
-
-    # ===============================
-    # 2. LLM 프롬프트 (해석 전용)
-    # ===============================
-    prompt = f"""
-아래는 고객 리뷰 텍스트 목록입니다.
-
-리뷰:
-{chr(10).join(sample_reviews)}
+# 고정 지시문 (system prefix 로 보내서 호출 간 캐시되게 한다. 리뷰/집계는 사용자 메시지에만)
+BASIC_INSTRUCTIONS = """
+사용자 메시지에 고객 리뷰 표본과 전체 리뷰 기준 자동 집계가 주어집니다.
+"(×N)" 으로 시작하는 줄은 거의 같은 리뷰 N건을 묶은 것입니다.
 
 아래 규칙을 반드시 지켜 JSON만 반환하세요.
 
 [규칙]
-1. sentiments는 리뷰 수와 동일한 길이로 작성
-2. 각 리뷰는 positive / neutral / negative 중 하나
-3. score는 전체 만족도 0~10점 (소수점 1자리)
-4. keywords는 핵심 키워드 5개
-5. strengths: 긍정적으로 반복 언급된 요소
-6. improvements: 부정적으로 반복 언급된 요소
-7. action_plans: 실행 계획 3개
-8. issue_matrix: 주요 이슈 (label, frequency 0~100, impact -5~5)
+1. score는 전체 만족도 0~10점 (소수점 1자리)
+2. summary는 전체 리뷰 요약 2~3문장
+3. strengths: 긍정적으로 반복 언급된 요소
+4. improvements: 부정적으로 반복 언급된 요소
+5. action_plans: 실행 계획 3개
+6. issue_matrix: 주요 이슈 (label, frequency 0~100, impact -5~5)
 
 [JSON 형식]
 
-{{
-  "sentiments": ["positive", "neutral", "..."],
+{
   "score": 7.5,
-  "keywords": ["키워드1", "키워드2", "키워드3", "키워드4", "키워드5"],
   "summary": "전체 리뷰 요약",
   "strengths": ["강점1", "강점2"],
   "improvements": ["개선1", "개선2"],
   "action_plans": [
-    {{ "title": "즉시 실행", "desc": "..." }},
-    {{ "title": "운영 개선", "desc": "..." }},
-    {{ "title": "중장기 전략", "desc": "..." }}
+    { "title": "즉시 실행", "desc": "..." },
+    { "title": "운영 개선", "desc": "..." },
+    { "title": "중장기 전략", "desc": "..." }
   ],
   "issue_matrix": [
-    {{ "label": "이슈명", "frequency": 80, "impact": -4 }}
+    { "label": "이슈명", "frequency": 80, "impact": -4 }
   ]
-}}
+}
 """
 
-    result = call_llm(prompt)
+
+def analyze_basic_sentiment(reviews: list[str], *, use_llm: bool = True) -> dict:
+    """
+    📊 CX 통합 리포트 분석 (최종 안정판)
+
+    ✔ 감성 개수 / 키워드 / 만족도는 로컬 lexicon 엔진으로 전체 리뷰 기준 계산
+    ✔ LLM은 '해석'(summary / strengths / action plan)만 담당
+    ✔ use_llm=False 또는 LLM 오류 시 로컬 결과만 반환
+    """
 
     # ===============================
-    # 3. LLM 에러 방어
+    # 1. 입력 방어
     # ===============================
-    if result.get("error"):
+    if not reviews:
         return {
-            "total": total_reviews,
+            "total": 0,
             "positive": 0,
-            "neutral": total_reviews,
+            "neutral": 0,
             "negative": 0,
             "score": 0.0,
             "keywords": [],
@@ -96,20 +67,56 @@ def analyze_basic_sentiment(reviews: list[str]) -> dict:
         }
 
     # ===============================
-    # 4. sentiment 개수 강제 보정 (🔥 핵심)
+    # 2. 로컬 감성 / 키워드 (전체 리뷰)
     # ===============================
-    sentiments = result.get("sentiments", [])
+    local = analyze_local(reviews)
+
+    base = {
+        "total": local["total"],
+        "positive": local["positive"],
+        "neutral": local["neutral"],
+        "negative": local["negative"],
+        "score": local["score"],
+        "keywords": local["keywords"],
+        "summary": "",
+        "cx_report": {
+            "strengths": [],
+            "improvements": [],
+            "action_plans": [],
+            "issue_matrix": [],
+        },
+    }
+
+    if not use_llm:
+        return base
 
-    # 부족하면 neutral로 채움
-    if len(sentiments) < total_reviews:
-        sentiments += ["neutral"] * (total_reviews - len(sentiments))
+    # 토큰 예산 안에서 중복을 묶은(×N) 대표 리뷰 표본
+    sample = stratified_sample(reviews, token_budget=BASIC_SAMPLE_TOKEN_BUDGET)
 
-    # 초과하면 자름
-    sentiments = sentiments[:total_reviews]
+    # ===============================
+    # 3. LLM 프롬프트 (해석 전용, 고정 지시문은 BASIC_INSTRUCTIONS)
+    # ===============================
+    prompt = f"""
+참고 (전체 {local["total"]}건 기준 자동 집계)
+- 긍정 {local["positive"]} / 중립 {local["neutral"]} / 부정 {local["negative"]}
+- 주요 키워드: {", ".join(local["keywords"])}
 
-    positive = sentiments.count("positive")
-    neutral = sentiments.count("neutral")
-    negative = sentiments.count("negative")
+리뷰 (전체 {local["total"]}건 중 표본):
+{sample["text"]}
+"""
+
+    result = call_llm(
+        prompt,
+        instructions=BASIC_INSTRUCTIONS,
+        caller="basic_sentiment",
+        workload=WORKLOAD_INTERACTIVE,
+    )
+
+    # ===============================
+    # 4. LLM 에러 방어 → 로컬 집계만 반환
+    # ===============================
+    if result.get("error"):
+        return base
 
     # ===============================
     # 5. Issue Matrix type 자동 보정
@@ -129,12 +136,8 @@ def analyze_basic_sentiment(reviews: list[str]) -> dict:
     # ===============================
     return {
         # 🔹 기존 프론트 호환 필드
-        "total": total_reviews,
-        "positive": positive,
-        "neutral": neutral,
-        "negative": negative,
-        "score": float(result.get("score", 0.0)),
-        "keywords": result.get("keywords", []),
+        **base,
+        "score": float(result.get("score", local["score"])),
         "summary": result.get("summary", ""),
 
         # 🔹 확장 CX 리포트
@@ -144,4 +147,4 @@ def analyze_basic_sentiment(reviews: list[str]) -> dict:
             "action_plans": result.get("action_plans", []),
             "issue_matrix": issue_matrix,
         },
-    }
\ No newline at end of file
+    }
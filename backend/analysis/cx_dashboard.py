@@ -1,4 +1,15 @@
-from backend.analysis.engine import call_llm
+from typing import Any, Iterator
+
+from backend.analysis.engine import call_llm, stream_llm
+from backend.analysis.llm_resilience import WORKLOAD_INTERACTIVE
+from backend.analysis.json_stream import JSONSectionParser
+from backend.analysis.prompt_builder import fit_text
+from backend.analysis.review_sampler import (
+    CX_SAMPLE_TOKEN_BUDGET,
+    format_strata_table,
+    stratified_sample,
+)
+from backend.core.serialization import dumps_str
 
 def _normalize_keyword_items(items: list[dict], min_size: int = 10, max_size: int = 40) -> list[dict]:
     """
@@ -101,31 +112,113 @@ def _post_process_cx_result(result: dict) -> dict:
     return result
 
 
-def analyze_cx_dashboard(reviews: list[str]) -> dict:
+REVIEW_SOURCE_INTRO = """아래는 실제 고객이 작성한 Google 리뷰 텍스트 데이터이다.
+리뷰는 기간 구간 × 별점 구간으로 나눈 층별 표본이며, 각 층 헤더에 그 층의 전체 리뷰 수가 있다.
+비율/분포를 판단할 때는 표본 줄 수가 아니라 층별 전체 리뷰 수를 기준으로 가중하라.
+"(×N)" 으로 시작하는 줄은 거의 같은 내용의 리뷰 N건을 하나로 묶은 것이므로 N건으로 취급하라.
+반드시 리뷰 텍스트에 직접 근거하여 분석하고,
+리뷰에 없는 사실은 절대 추측하지 마라."""
+
+DIGEST_SOURCE_INTRO = """아래는 기간 내 실제 Google 리뷰를 일자별로 요약한 digest 를 합산한 데이터이다.
+- review_count: 리뷰 수 / sentiment: 감성별 리뷰 수
+- themes / strengths / pains: 반복 주제와 언급 횟수(count)
+- positive_keywords / negative_keywords: 키워드와 누적 가중치(weight)
+- quotes: 대표 리뷰 원문 인용
+count / weight 가 클수록 반복적으로 언급된 내용이다.
+반드시 digest 에 담긴 내용에 직접 근거하여 분석하고,
+digest 에 없는 사실은 절대 추측하지 마라."""
+
+
+def analyze_cx_dashboard(reviews: list[dict] | list[str]) -> dict:
     """
     CX Nexus 대시보드용 리뷰 분석
     UI에 바로 표시 가능한 JSON 구조 반환
+
+    reviews: [{"text", "rating", "created_at"}, ...] (텍스트 목록도 허용)
+    별점 구간 × 기간 구간 층화 표본을 CX_SAMPLE_TOKEN_BUDGET 안에서 뽑아 보낸다.
     """
 
     if not reviews:
         return {}
 
-    sample_reviews = reviews[:200]
+    prompt = _build_review_prompt(reviews)
 
-    prompt = f"""
-너는 대량의 사용자 리뷰와 댓글에서 반복 주제와 감정 흐름을 분석하는 CX/여론 분석 전문 컨설턴트다.
+    result = call_llm(prompt, instructions=CX_INSTRUCTIONS, caller="cx_dashboard", workload=WORKLOAD_INTERACTIVE)
+    result = _post_process_cx_result(result)
+    return result
+
+
+KEYWORD_SECTIONS = ("positive_keywords", "negative_keywords", "neutral_keywords", "all_keywords")
+
+
+def stream_cx_dashboard(
+    reviews: list[dict] | list[str],
+    *,
+    tenant: str | None = None,
+) -> Iterator[tuple[str, Any]]:
+    """
+    analyze_cx_dashboard 의 스트리밍 버전.
+    LLM 응답의 최상위 섹션(executive_summary, action_plan, *_keywords 등)이 닫히는 대로
+    ("section", {"name", "data"}) 를 yield 하고, 마지막에 후처리까지 끝난 전체 결과를
+    ("result", dict) 로 yield 한다. (LLM 실패 시 ("result", {"error": True, ...}))
+    tenant: LLM 스케줄러 tenant (stream_llm 참고)
+    """
+
+    if not reviews:
+        yield "result", {}
+        return
+
+    prompt = _build_review_prompt(reviews)
+
+    parser = JSONSectionParser()
+    result: dict[str, Any] = {}
+    try:
+        for delta in stream_llm(
+            prompt, instructions=CX_INSTRUCTIONS, caller="cx_dashboard_stream", tenant=tenant
+        ):
+            for name, data in parser.feed(delta):
+                if name in KEYWORD_SECTIONS:
+                    data = _normalize_keyword_items(data, min_size=10, max_size=40)
+                result[name] = data
+                yield "section", {"name": name, "data": data}
+    except Exception as e:
+        yield "result", {"error": True, "message": str(e)}
+        return
+
+    if not result:
+        yield "result", {"error": True, "message": "LLM JSON 응답 파싱 실패"}
+        return
+
+    yield "result", _post_process_cx_result(result)
+
+
+def analyze_cx_dashboard_from_digest(digest: dict) -> dict:
+    """
+    일자별 digest 를 합산한 결과(review_digest.reduce_digests)로 대시보드 JSON 생성.
+    원본 리뷰 대신 크기가 제한된 digest 만 LLM 에 보낸다. (CX_SAMPLE_TOKEN_BUDGET 토큰 상한)
+    """
+
+    if not digest or not digest.get("review_count"):
+        return {}
+
+    prompt = _build_cx_prompt(
+        source_intro=DIGEST_SOURCE_INTRO,
+        source_label="digest",
+        source_text=fit_text(dumps_str(digest), CX_SAMPLE_TOKEN_BUDGET),
+    )
+
+    result = call_llm(prompt, instructions=CX_INSTRUCTIONS, caller="cx_dashboard_digest")
+    result = _post_process_cx_result(result)
+    return result
 
-아래는 실제 고객이 작성한 Google 리뷰 텍스트 데이터이다.
-반드시 리뷰 텍스트에 직접 근거하여 분석하고,
-리뷰에 없는 사실은 절대 추측하지 마라.
 
+CX_INSTRUCTIONS = """너는 대량의 사용자 리뷰와 댓글에서 반복 주제와 감정 흐름을 분석하는 CX/여론 분석 전문 컨설턴트다.
+
+사용자 메시지에 분석 대상 데이터(리뷰 표본 또는 digest)와 데이터 설명이 주어진다.
 이 결과는 CX Nexus 대시보드 UI에 바로 표시될 데이터다.
 따라서 반드시 JSON만 반환하라.
 설명, 마크다운, 코드블록, 부가 문장은 절대 출력하지 마라.
 
-리뷰:
-{chr(10).join(sample_reviews)}
-
 ==============================
 최상위 분석 원칙
 ==============================
@@ -642,87 +735,100 @@ JSON을 반환하기 전에 반드시 스스로 아래를 검증하라.
 
 반드시 아래 JSON 스키마만 반환하라.
 
-{{
-  "report_logic": {{
+{
+  "report_logic": {
     "repeated_strengths": ["반복 강점 1", "반복 강점 2"],
     "repeated_pains": ["반복 불만 1"],
     "primary_focus_type": "STRENGTH",
     "primary_focus_label": "핵심 축"
-  }},
-  "executive_summary": {{
+  },
+  "executive_summary": {
     "summary": "2~3문장 요약",
     "opportunity": "15~25자 한 줄 기회 문구"
-  }},
+  },
   "rating": 0.0,
-  "sentiment": {{
+  "sentiment": {
     "positive": 0.0,
     "neutral": 0.0,
     "negative": 0.0
-  }},
-  "nps": {{
+  },
+  "nps": {
     "score": 0.0,
     "promoters": 0.0,
     "passives": 0.0,
     "detractors": 0.0,
     "segment": "PASSIVES"
-  }},
+  },
   "drivers_of_satisfaction": [
-    {{
+    {
       "label": "만족 요인",
       "value": 0.0
-    }}
+    }
   ],
   "areas_for_improvement": [
-    {{
+    {
       "label": "개선 요인",
       "value": 0.0,
       "urgency": "HIGH",
       "reason": "리뷰 근거 설명"
-    }}
+    }
   ],
   "strategic_insights": [
-    {{
+    {
       "title": "인사이트 제목",
       "description": "왜 중요한지 설명"
-    }}
+    }
   ],
   "action_plan": [
-    {{
+    {
       "priority": "HIGH",
       "title": "실행 과제",
       "description": "구체적 실행 방안",
       "expected_effect": "기대 효과",
       "timeline": "2주 이내",
       "linked_to": "개선 요인 또는 기회"
-    }}
+    }
   ],
   "positive_keywords": [
-    {{
+    {
       "text": "대표 긍정 키워드",
       "size": 34
-    }}
+    }
   ],
   "negative_keywords": [
-    {{
+    {
       "text": "대표 부정 키워드",
       "size": 34
-    }}
+    }
   ],
   "neutral_keywords": [
-    {{
+    {
       "text": "대표 중립 키워드",
       "size": 34
-    }}
+    }
   ],
   "all_keywords": [
-    {{
+    {
       "text": "대표 전체 키워드",
       "size": 34
-    }}
+    }
   ]
-}}
+}
 """
 
-    result = call_llm(prompt)
-    result = _post_process_cx_result(result)
-    return result
+
+def _build_review_prompt(reviews: list[dict] | list[str]) -> str:
+    sample = stratified_sample(reviews, token_budget=CX_SAMPLE_TOKEN_BUDGET)
+    return _build_cx_prompt(
+        source_intro=REVIEW_SOURCE_INTRO + "\n\n층별 전체 리뷰 수:\n" + format_strata_table(sample),
+        source_label="리뷰",
+        source_text=sample["text"],
+    )
+
+
+def _build_cx_prompt(*, source_intro: str, source_label: str, source_text: str) -> str:
+    # 고정 지시문(CX_INSTRUCTIONS)은 system 쪽 prefix 로 보내고, 여기에는 호출마다 바뀌는 데이터만 둔다
+    return f"""{source_intro}
+
+{source_label}:
+{source_text}"""
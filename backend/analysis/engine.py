@@ -1,47 +1,216 @@
+from __future__ import annotations
+
 import json
 import re
-from openai import OpenAI
+import threading
+import time
+from typing import TYPE_CHECKING, Iterator
+
+from backend.analysis.llm_resilience import (
+    DEADLINE_SECONDS,
+    WORKLOAD_BATCH,
+    WORKLOAD_INTERACTIVE,
+    CircuitOpenError,
+    LLMUnavailable,
+    get_breaker,
+    is_transient_error,
+)
+from backend.analysis.llm_scheduler import scheduled
+from backend.analysis.llm_usage import record_llm_call, response_tokens
+from backend.analysis.model_router import MODEL_TIERS, call_model, model_endpoint, route
+from backend.analysis.tokens import count_tokens
+
+if TYPE_CHECKING:
+    from openai import OpenAI
+
+_client: OpenAI | None = None
+_client_lock = threading.Lock()
+
+SYSTEM_PROMPT = (
+    "너는 고객 리뷰 데이터를 분석하는 CX 분석 전문가다. "
+    "모든 응답은 반드시 한국어로 작성한다."
+)
+
+
+def get_client() -> OpenAI:
+    """
+    OpenAI 클라이언트는 첫 LLM 호출 때 만든다.
+    (import 시점에 만들면 OPENAI_API_KEY 가 없는 환경에서 서버 시작 자체가 실패하고, openai import 비용도 시작 시간에 붙는다)
+    재시도 / timeout 은 llm_resilience 에서 deadline 기준으로 관리
+    """
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                from openai import OpenAI
+
+                _client = OpenAI(max_retries=0)
+    return _client
+
+
+def _messages(prompt: str, instructions: str | None) -> list[dict]:
+    return [
+        {
+            "role": "system",
+            "content": f"{SYSTEM_PROMPT}\n\n{instructions}" if instructions else SYSTEM_PROMPT,
+        },
+        {
+            "role": "user",
+            "content": prompt,
+        },
+    ]
 
-client = OpenAI()
 
+def _extract_json(content: str | None) -> dict | None:
+    # 🔒 JSON만 안전하게 추출 (없거나 깨졌으면 None)
+    match = re.search(r"\{.*\}", content or "", re.DOTALL)
+    if not match:
+        return None
+    try:
+        return json.loads(match.group())
+    except json.JSONDecodeError:
+        return None
 
-def call_llm(prompt: str) -> dict:
+
+def call_llm(
+    prompt: str,
+    *,
+    instructions: str | None = None,
+    caller: str = "call_llm",
+    workload: str = WORKLOAD_BATCH,
+    model: str | None = None,
+) -> dict:
     """
     🔥 LLM 단일 호출 엔진 (최종본)
     - JSON 강제
     - 파싱 안정성 확보
+    - caller 별 입력/출력/캐시 토큰 · 지연 기록 (llm_usage)
+
+    instructions: 호출마다 바뀌지 않는 지시문. system 메시지에 붙여 prefix 를 고정하고
+    (provider prompt caching 대상), prompt 에는 호출마다 바뀌는 데이터만 넣는다.
+    workload: interactive(HTTP 응답 대기, hedge) / batch(재시도). deadline 초과나
+    circuit open 이면 {"error": True, "unavailable": True, ...} 를 바로 반환한다.
+    model: 지정하면 그 모델로 고정, 없으면 model_router 가 tier 를 고른다 (기본 tier: mini)
     """
+    messages = _messages(prompt, instructions)
 
-    try:
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {
-                    "role": "system",
-                    "content": (
-                        "너는 고객 리뷰 데이터를 분석하는 CX 분석 전문가다. "
-                        "모든 응답은 반드시 한국어로 작성한다."
-                    ),
-                },
-                {
-                    "role": "user",
-                    "content": prompt,
-                },
-            ],
+    def _create(model_name: str, timeout: float):
+        return get_client().chat.completions.create(
+            model=model_name,
+            messages=messages,
             temperature=0.3,
+            timeout=timeout,
         )
 
-        content = response.choices[0].message.content
+    started = time.perf_counter()
+    response = None
+    try:
+        response, _ = call_model(
+            _create,
+            model=model,
+            input_tokens=count_tokens(messages[0]["content"]) + count_tokens(prompt),
+            workload=workload,
+            caller=caller,
+        )
 
-        # 🔒 JSON만 안전하게 추출
-        match = re.search(r"\{.*\}", content, re.DOTALL)
-        if not match:
+        content = response.choices[0].message.content
+        prompt_tokens, completion_tokens, cached_tokens = response_tokens(
+            response, f"{instructions or ''}{prompt}", content or ""
+        )
+        parsed = _extract_json(content)
+        record_llm_call(
+            caller,
+            prompt_tokens=prompt_tokens,
+            completion_tokens=completion_tokens,
+            cached_tokens=cached_tokens,
+            elapsed=time.perf_counter() - started,
+            outcome="ok" if parsed is not None else "parse_error",
+        )
+        if parsed is None:
             raise ValueError("LLM JSON 응답 파싱 실패")
 
-        return json.loads(match.group())
+        return parsed
 
     except Exception as e:
+        if response is None:
+            record_llm_call(caller, elapsed=time.perf_counter() - started, error=True)
         return {
             "error": True,
             "message": str(e),
+            "unavailable": response is None and (isinstance(e, LLMUnavailable) or is_transient_error(e)),
         }
+
+
+def stream_llm(
+    prompt: str,
+    *,
+    instructions: str | None = None,
+    caller: str = "stream_llm",
+    tenant: str | None = None,
+) -> Iterator[str]:
+    """
+    call_llm 의 스트리밍 버전. 생성되는 텍스트 조각(delta)을 그대로 yield 한다.
+    JSON 추출/파싱은 호출 측(analysis.json_stream)에서 한다. 호출 실패 시 예외를 그대로 올린다.
+    tenant: 스트리밍 응답은 요청 context 밖(응답 iterator)에서 돌기 때문에 스케줄러 tenant 를 직접 넘긴다.
+    """
+    # 스트리밍은 hedge / tier fallback 없이 라우터 1순위 모델에 deadline / circuit breaker 만 적용
+    messages = _messages(prompt, instructions)
+    input_tokens = count_tokens(messages[0]["content"]) + count_tokens(prompt)
+    tier = route(input_tokens=input_tokens, workload=WORKLOAD_INTERACTIVE)[0]
+    model = MODEL_TIERS[tier]["model"]
+    with scheduled(workload=WORKLOAD_INTERACTIVE, tokens=input_tokens, tenant=tenant):
+        breaker = get_breaker(model_endpoint(model))
+        if not breaker.allow():
+            raise CircuitOpenError(f"LLM circuit open ({model})")
+
+        started = time.perf_counter()
+        first_token_seconds = None
+        usage = None
+        parts: list[str] = []
+        try:
+            stream = get_client().chat.completions.create(
+                model=model,
+                messages=messages,
+                temperature=0.3,
+                stream=True,
+                stream_options={"include_usage": True},
+                timeout=DEADLINE_SECONDS[WORKLOAD_INTERACTIVE],
+            )
+            for chunk in stream:
+                if chunk.usage is not None:
+                    usage = chunk
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta.content
+                if not delta:
+                    continue
+                if first_token_seconds is None:
+                    first_token_seconds = time.perf_counter() - started
+                    print(f"[llm] caller={caller} first_token={first_token_seconds:.2f}s")
+                parts.append(delta)
+                yield delta
+        except GeneratorExit:
+            # 클라이언트가 먼저 끊은 경우 — 장애가 아니므로 half_open 시험 호출만 풀어 준다
+            breaker.record_success()
+            raise
+        except Exception as e:
+            record_llm_call(caller, elapsed=time.perf_counter() - started, error=True)
+            if is_transient_error(e):
+                breaker.record_failure()
+            else:
+                breaker.record_success()
+            raise
+
+        breaker.record_success()
+        content = "".join(parts)
+        prompt_tokens, completion_tokens, cached_tokens = response_tokens(
+            usage, f"{instructions or ''}{prompt}", content
+        )
+        record_llm_call(
+            caller,
+            prompt_tokens=prompt_tokens,
+            completion_tokens=completion_tokens,
+            cached_tokens=cached_tokens,
+            elapsed=time.perf_counter() - started,
+            outcome="ok" if _extract_json(content) is not None else "parse_error",
+        )
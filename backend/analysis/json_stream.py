@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import json
+from typing import Any
+
+
+class JSONSectionParser:
+    """
+    스트리밍되는 LLM JSON 응답에서 최상위 객체의 멤버("key": value)가 닫히는 대로 꺼낸다.
+
+        parser = JSONSectionParser()
+        for chunk in stream:
+            for key, value in parser.feed(chunk):
+                ...
+
+    - 첫 "{" 이전 텍스트(```json 등)는 무시
+    - 문자열 안의 괄호 / 이스케이프는 구분해서 센다
+    - 파싱 불가능한 멤버는 건너뛰고 skipped 에 키를 남긴다
+    """
+
+    def __init__(self) -> None:
+        self.buffer = ""
+        self.depth = 0
+        self.in_string = False
+        self.escape = False
+        self.done = False
+        self.started = False
+        self.skipped: list[str] = []
+        self._pos = 0
+        self._member_start: int | None = None
+
+    def feed(self, chunk: str) -> list[tuple[str, Any]]:
+        self.buffer += chunk
+        sections: list[tuple[str, Any]] = []
+
+        if not self.started:
+            # 첫 "{" 전까지는 괄호 / 따옴표를 세지 않고 건너뛴다 (Here is "the" result [note]: {...})
+            start = self.buffer.find("{", self._pos)
+            if start < 0:
+                self._pos = len(self.buffer)
+                return sections
+            self._pos = start
+            self.started = True
+
+        while self._pos < len(self.buffer) and not self.done:
+            ch = self.buffer[self._pos]
+            index = self._pos
+            self._pos += 1
+
+            if self.in_string:
+                if self.escape:
+                    self.escape = False
+                elif ch == "\\":
+                    self.escape = True
+                elif ch == '"':
+                    self.in_string = False
+                continue
+
+            if ch == '"':
+                if self.depth == 1 and self._member_start is None:
+                    self._member_start = index
+                self.in_string = True
+            elif ch in "{[":
+                self.depth += 1
+            elif ch in "}]":
+                if self.depth == 1:
+                    self._close_member(index, sections)
+                    self.done = True
+                self.depth = max(self.depth - 1, 0)
+            elif ch == "," and self.depth == 1:
+                self._close_member(index, sections)
+
+        return sections
+
+    def _close_member(self, end: int, sections: list[tuple[str, Any]]) -> None:
+        if self._member_start is None:
+            return
+        member = self.buffer[self._member_start:end]
+        self._member_start = None
+
+        key_text, sep, value_text = member.partition(":")
+        if not sep:
+            return
+        try:
+            key = json.loads(key_text)
+        except ValueError:
+            return
+        try:
+            sections.append((key, json.loads(value_text)))
+        except ValueError:
+            self.skipped.append(key)
@@ -0,0 +1,306 @@
+"""
+LLM 호출 경로 공통 보호 장치
+- deadline: 호출 1건(재시도/hedge 포함)의 전체 제한 시간. 남은 시간을 OpenAI timeout 으로 넘긴다
+- hedge: interactive 호출은 최근 p95 지연만큼 기다려도 응답이 없으면 같은 요청을 1번 더 보내고 먼저 온 응답을 쓴다
+- retry: batch 호출은 일시적 오류(timeout / 연결 / 429 / 5xx)에 한해 deadline 안에서 재시도
+- circuit breaker: 일시적 오류가 연속되면 일정 시간 호출 자체를 막는다 (CircuitOpenError 즉시 발생)
+"""
+from __future__ import annotations
+
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, TypeVar
+
+T = TypeVar("T")
+
+WORKLOAD_INTERACTIVE = "interactive"
+WORKLOAD_BATCH = "batch"
+
+DEADLINE_SECONDS = {
+    WORKLOAD_INTERACTIVE: float(os.getenv("LLM_INTERACTIVE_DEADLINE_SECONDS", "45")),
+    WORKLOAD_BATCH: float(os.getenv("LLM_BATCH_DEADLINE_SECONDS", "90")),
+}
+BATCH_RETRIES = int(os.getenv("LLM_BATCH_RETRIES", "1"))
+RETRY_BACKOFF_SECONDS = 1.0
+
+# hedge 지연 = 최근 성공 지연 p95 (표본이 적으면 기본값)
+HEDGE_DEFAULT_DELAY_SECONDS = float(os.getenv("LLM_HEDGE_DEFAULT_DELAY_SECONDS", "8"))
+HEDGE_MIN_DELAY_SECONDS = float(os.getenv("LLM_HEDGE_MIN_DELAY_SECONDS", "1.5"))
+HEDGE_MIN_SAMPLES = 20
+LATENCY_WINDOW = 200
+
+BREAKER_FAILURE_THRESHOLD = int(os.getenv("LLM_BREAKER_FAILURE_THRESHOLD", "5"))
+BREAKER_RESET_SECONDS = float(os.getenv("LLM_BREAKER_RESET_SECONDS", "30"))
+
+DEFAULT_ENDPOINT = "openai"
+
+_transient_errors: tuple[type[BaseException], ...] | None = None
+
+_executor = ThreadPoolExecutor(
+    max_workers=int(os.getenv("LLM_MAX_CONCURRENT_CALLS", "16")),
+    thread_name_prefix="llm",
+)
+
+
+class LLMUnavailable(Exception):
+    """LLM 을 지금 쓸 수 없음 (호출 측은 로컬 fallback 으로 전환)"""
+
+
+class CircuitOpenError(LLMUnavailable):
+    pass
+
+
+class DeadlineExceeded(LLMUnavailable):
+    pass
+
+
+class CircuitBreaker:
+    """
+    closed → (연속 실패 failure_threshold 회) → open → (reset_seconds 경과) → half_open(시험 호출 1건)
+    시험 호출이 성공하면 closed, 실패하면 다시 open.
+    """
+
+    def __init__(self, name: str, failure_threshold: int, reset_seconds: float) -> None:
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at: float | None = None
+        self._trial_in_flight = False
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._opened_at is None:
+                return "closed"
+            if time.monotonic() - self._opened_at >= self.reset_seconds:
+                return "half_open"
+            return "open"
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if time.monotonic() - self._opened_at < self.reset_seconds or self._trial_in_flight:
+                return False
+            self._trial_in_flight = True
+            return True
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self._opened_at is not None:
+                print(f"[llm] breaker={self.name} closed")
+            self._failures = 0
+            self._opened_at = None
+            self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            reopen = self._trial_in_flight
+            self._trial_in_flight = False
+            if reopen or self._failures >= self.failure_threshold:
+                if self._opened_at is None or reopen:
+                    print(f"[llm] breaker={self.name} open (failures={self._failures})")
+                self._opened_at = time.monotonic()
+
+
+class LatencyWindow:
+    def __init__(self, size: int = LATENCY_WINDOW) -> None:
+        self._lock = threading.Lock()
+        self._samples: deque[float] = deque(maxlen=size)
+
+    def add(self, seconds: float) -> None:
+        with self._lock:
+            self._samples.append(seconds)
+
+    def percentile(self, q: float) -> float | None:
+        with self._lock:
+            samples = sorted(self._samples)
+        if not samples:
+            return None
+        return samples[min(int(len(samples) * q), len(samples) - 1)]
+
+    def hedge_delay(self) -> float:
+        with self._lock:
+            count = len(self._samples)
+        if count < HEDGE_MIN_SAMPLES:
+            return HEDGE_DEFAULT_DELAY_SECONDS
+        return max(self.percentile(0.95) or 0.0, HEDGE_MIN_DELAY_SECONDS)
+
+
+_registry_lock = threading.Lock()
+_breakers: dict[str, CircuitBreaker] = {}
+_latencies: dict[str, LatencyWindow] = {}
+
+_stats_lock = threading.Lock()
+RESILIENCE_STATS = {
+    "calls": 0,
+    "retries": 0,
+    "hedged": 0,
+    "hedge_wins": 0,
+    "deadline_exceeded": 0,
+    "circuit_rejected": 0,
+}
+
+
+def _count(field: str) -> None:
+    with _stats_lock:
+        RESILIENCE_STATS[field] += 1
+
+
+def get_breaker(name: str = DEFAULT_ENDPOINT) -> CircuitBreaker:
+    with _registry_lock:
+        if name not in _breakers:
+            _breakers[name] = CircuitBreaker(name, BREAKER_FAILURE_THRESHOLD, BREAKER_RESET_SECONDS)
+        return _breakers[name]
+
+
+def get_latency_window(name: str = DEFAULT_ENDPOINT) -> LatencyWindow:
+    with _registry_lock:
+        if name not in _latencies:
+            _latencies[name] = LatencyWindow()
+        return _latencies[name]
+
+
+def is_circuit_open(name: str = DEFAULT_ENDPOINT) -> bool:
+    return get_breaker(name).state == "open"
+
+
+def is_transient_error(error: BaseException) -> bool:
+    global _transient_errors
+    if _transient_errors is None:
+        # openai 는 실제 호출 경로에서만 필요하므로 시작 시 import 하지 않는다
+        import openai
+
+        _transient_errors = (
+            openai.APITimeoutError,
+            openai.APIConnectionError,
+            openai.RateLimitError,
+            openai.InternalServerError,
+            TimeoutError,
+            DeadlineExceeded,
+        )
+    return isinstance(error, _transient_errors)
+
+
+def get_resilience_stats() -> dict[str, Any]:
+    with _stats_lock:
+        stats: dict[str, Any] = dict(RESILIENCE_STATS)
+    with _registry_lock:
+        names = sorted(set(_breakers) | set(_latencies))
+    stats["endpoints"] = {
+        name: {
+            "breaker": get_breaker(name).state,
+            "p50_seconds": get_latency_window(name).percentile(0.5),
+            "p95_seconds": get_latency_window(name).percentile(0.95),
+        }
+        for name in names
+    }
+    return stats
+
+
+def _retry(fn: Callable[[float], T], end: float) -> T:
+    last_error: BaseException | None = None
+    for attempt in range(BATCH_RETRIES + 1):
+        remaining = end - time.monotonic()
+        if remaining <= 0:
+            break
+        if attempt:
+            _count("retries")
+        try:
+            return fn(remaining)
+        except Exception as e:
+            if not is_transient_error(e):
+                raise
+            last_error = e
+            if attempt < BATCH_RETRIES:
+                time.sleep(min(RETRY_BACKOFF_SECONDS * (attempt + 1), max(end - time.monotonic(), 0)))
+    if last_error is not None and time.monotonic() < end:
+        raise last_error
+    raise DeadlineExceeded(f"LLM deadline 초과 ({last_error})")
+
+
+def _hedged(fn: Callable[[float], T], end: float, delay: float) -> T:
+    started = time.monotonic()
+    first: Future = _executor.submit(fn, end - started)
+    pending = {first}
+    hedge_at = started + delay
+    hedged = False
+    last_error: BaseException | None = None
+
+    while True:
+        now = time.monotonic()
+        if now >= end:
+            break
+        timeout = (end if hedged else min(end, hedge_at)) - now
+        done, pending = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+        for future in done:
+            error = future.exception()
+            if error is None:
+                if hedged and future is not first:
+                    _count("hedge_wins")
+                return future.result()
+            if not is_transient_error(error):
+                raise error
+            last_error = error
+
+        # p95 를 넘기거나 첫 요청이 일시적 오류로 끝났으면 한 번 더 보낸다
+        if not hedged and end - time.monotonic() > 0 and (time.monotonic() >= hedge_at or not pending):
+            hedged = True
+            _count("hedged")
+            print(f"[llm] hedge after {time.monotonic() - started:.2f}s (p95 delay={delay:.2f}s)")
+            pending.add(_executor.submit(fn, end - time.monotonic()))
+            continue
+        if not pending:
+            break
+
+    # 원 요청 / hedge 가 모두 deadline 전에 일시적 오류로 끝났으면 그 오류를 그대로 올린다
+    if last_error is not None and time.monotonic() < end:
+        raise last_error
+    raise DeadlineExceeded(f"LLM deadline 초과 ({last_error})" if last_error else "LLM deadline 초과")
+
+
+def run_llm_call(
+    fn: Callable[[float], T],
+    *,
+    workload: str = WORKLOAD_BATCH,
+    endpoint: str = DEFAULT_ENDPOINT,
+    deadline: float | None = None,
+) -> T:
+    """
+    fn(timeout_seconds) 를 deadline / hedge(interactive) / retry(batch) / circuit breaker 로 감싸 실행한다.
+    fn 은 남은 시간을 OpenAI 요청 timeout 으로 넘겨 호출 1회를 수행해야 한다.
+    """
+    breaker = get_breaker(endpoint)
+    if not breaker.allow():
+        _count("circuit_rejected")
+        raise CircuitOpenError(f"LLM circuit open ({endpoint})")
+
+    _count("calls")
+    latencies = get_latency_window(endpoint)
+    started = time.monotonic()
+    end = started + (deadline or DEADLINE_SECONDS.get(workload, DEADLINE_SECONDS[WORKLOAD_BATCH]))
+
+    try:
+        if workload == WORKLOAD_INTERACTIVE:
+            result = _hedged(fn, end, latencies.hedge_delay())
+        else:
+            result = _retry(fn, end)
+    except Exception as e:
+        if isinstance(e, DeadlineExceeded):
+            _count("deadline_exceeded")
+        if is_transient_error(e):
+            breaker.record_failure()
+        else:
+            # 요청 자체 문제(400 등)는 장애가 아니므로 breaker 상태만 풀어 준다
+            breaker.record_success()
+        raise
+
+    breaker.record_success()
+    latencies.add(time.monotonic() - started)
+    return result
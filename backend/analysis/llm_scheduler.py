@@ -0,0 +1,305 @@
+"""
+프로세스 공용 LLM 스케줄러
+- 우선순위 클래스: interactive(HTTP 응답 대기) > batch. batch 는 동시 실행 수 상한이 더 낮아서 interactive 몫이 항상 남는다
+- 클래스 안에서는 tenant 별 가중 공정 큐(WFQ): 요청 비용(예상 토큰) / tenant 가중치 로 virtual finish time 을 매겨 작은 순서로 실행
+- 전역 토큰 버킷(분당 토큰 한도): REDIS_URL 이 있으면 Redis 로 여러 워커가 같은 버킷을 공유, 없으면 프로세스 로컬 버킷.
+  batch 는 버킷에 INTERACTIVE_RESERVE 비율만큼 남아 있을 때만 가져간다
+- 클래스별 대기 시간 통계 (get_scheduler_stats)
+
+    with llm_tenant(tenant_id):          # 배치/요청 단위로 tenant 지정 (없으면 "default")
+        ...
+        with scheduled(workload=..., tokens=...):
+            <LLM 호출 1건>
+"""
+from __future__ import annotations
+
+import contextvars
+import heapq
+import itertools
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Iterator
+
+from backend.analysis.llm_resilience import WORKLOAD_BATCH, WORKLOAD_INTERACTIVE, DeadlineExceeded
+
+PRIORITY = {WORKLOAD_INTERACTIVE: 0, WORKLOAD_BATCH: 1}
+
+MAX_CONCURRENT = int(os.getenv("LLM_SCHEDULER_MAX_CONCURRENT", "8"))
+CLASS_MAX_CONCURRENT = {
+    WORKLOAD_INTERACTIVE: MAX_CONCURRENT,
+    WORKLOAD_BATCH: int(os.getenv("LLM_SCHEDULER_BATCH_MAX_CONCURRENT", "6")),
+}
+QUEUE_TIMEOUT_SECONDS = {
+    WORKLOAD_INTERACTIVE: float(os.getenv("LLM_SCHEDULER_INTERACTIVE_QUEUE_TIMEOUT_SECONDS", "20")),
+    WORKLOAD_BATCH: float(os.getenv("LLM_SCHEDULER_BATCH_QUEUE_TIMEOUT_SECONDS", "600")),
+}
+
+# 분당 토큰 한도 (OpenAI 조직 TPM 보다 약간 낮게). 0 이면 버킷 비활성
+TOKENS_PER_MINUTE = int(os.getenv("LLM_TOKENS_PER_MINUTE", "150000"))
+# batch 가 건드리지 못하는 버킷 비율 (interactive 전용 여유분)
+INTERACTIVE_RESERVE = float(os.getenv("LLM_INTERACTIVE_TOKEN_RESERVE", "0.2"))
+# 출력 토큰 예상치 (입력 토큰에 더해 버킷에서 차감)
+OUTPUT_TOKEN_ESTIMATE = 800
+
+REDIS_BUCKET_KEY = "llm:token_bucket"
+
+# "tenant:weight,tenant:weight" (기본 가중치 1)
+TENANT_WEIGHTS = {
+    key.strip(): float(value)
+    for key, _, value in (
+        item.partition(":") for item in os.getenv("LLM_TENANT_WEIGHTS", "").split(",") if item.strip()
+    )
+    if value.strip()
+}
+
+WAIT_WINDOW = 500
+
+_current_tenant: contextvars.ContextVar[str] = contextvars.ContextVar("llm_tenant", default="default")
+
+
+@contextmanager
+def llm_tenant(tenant: Any) -> Iterator[None]:
+    """
+    이 블록 안의 LLM 호출을 tenant 몫으로 스케줄링한다.
+    """
+    token = _current_tenant.set(str(tenant))
+    try:
+        yield
+    finally:
+        _current_tenant.reset(token)
+
+
+def current_tenant() -> str:
+    return _current_tenant.get()
+
+
+# =========================================================
+# 토큰 버킷
+# =========================================================
+class LocalTokenBucket:
+    def __init__(self, capacity: float, refill_per_second: float) -> None:
+        self.capacity = capacity
+        self.refill_per_second = refill_per_second
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def take(self, amount: float, reserve: float = 0.0) -> float:
+        """
+        amount 를 가져가고 0 을 반환. 모자라면 가져가지 않고 다시 시도할 때까지 기다릴 초를 반환.
+        reserve: 가져간 뒤에도 남아 있어야 하는 양
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.refill_per_second)
+            self._updated = now
+            # 버킷 용량보다 큰 요청은 가득 찼을 때 통과시킨다 (영원히 못 들어가는 것 방지)
+            need = min(amount + reserve, self.capacity)
+            if self._tokens >= need:
+                self._tokens -= amount
+                return 0.0
+            return (need - self._tokens) / self.refill_per_second
+
+
+_REDIS_TAKE_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local amount = tonumber(ARGV[3])
+local reserve = tonumber(ARGV[4])
+local now = redis.call('TIME')
+now = tonumber(now[1]) + tonumber(now[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'updated')
+local tokens = tonumber(state[1]) or capacity
+local updated = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + (now - updated) * rate)
+local need = math.min(amount + reserve, capacity)
+local wait = 0
+if tokens >= need then
+  tokens = tokens - amount
+else
+  wait = (need - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'updated', now)
+redis.call('EXPIRE', KEYS[1], 3600)
+return tostring(wait)
+"""
+
+
+class RedisTokenBucket:
+    """
+    여러 워커 / 프로세스가 공유하는 버킷. 시간은 Redis 서버 시계를 쓴다.
+    Redis 오류 시에는 로컬 버킷으로 대신한다.
+    """
+
+    def __init__(self, capacity: float, refill_per_second: float, key: str = REDIS_BUCKET_KEY) -> None:
+        self.capacity = capacity
+        self.refill_per_second = refill_per_second
+        self.key = key
+        self._fallback = LocalTokenBucket(capacity, refill_per_second)
+        self._script = None
+
+    def take(self, amount: float, reserve: float = 0.0) -> float:
+        try:
+            if self._script is None:
+                from backend.core.redis_client import get_redis
+
+                self._script = get_redis().register_script(_REDIS_TAKE_SCRIPT)
+            return float(self._script(
+                keys=[self.key],
+                args=[self.capacity, self.refill_per_second, amount, reserve],
+            ))
+        except Exception as exc:
+            print(f"[scheduler] Redis 토큰 버킷 실패 → 로컬 버킷 사용: {exc}")
+            return self._fallback.take(amount, reserve)
+
+
+def _make_bucket():
+    if TOKENS_PER_MINUTE <= 0:
+        return None
+    if os.getenv("REDIS_URL"):
+        return RedisTokenBucket(TOKENS_PER_MINUTE, TOKENS_PER_MINUTE / 60)
+    return LocalTokenBucket(TOKENS_PER_MINUTE, TOKENS_PER_MINUTE / 60)
+
+
+# =========================================================
+# 스케줄러
+# =========================================================
+class LLMScheduler:
+    def __init__(self, bucket=None) -> None:
+        self.bucket = bucket
+        self._cond = threading.Condition()
+        self._seq = itertools.count()
+        self._queues: dict[str, list[tuple[float, int, float]]] = {workload: [] for workload in PRIORITY}
+        self._virtual_time: dict[str, float] = {workload: 0.0 for workload in PRIORITY}
+        self._last_finish: dict[tuple[str, str], float] = {}
+        self._active: dict[str, int] = {workload: 0 for workload in PRIORITY}
+        self._stats = {
+            workload: {"admitted": 0, "timeouts": 0, "wait_seconds": 0.0, "bucket_wait_seconds": 0.0}
+            for workload in PRIORITY
+        }
+        self._waits: dict[str, deque[float]] = {workload: deque(maxlen=WAIT_WINDOW) for workload in PRIORITY}
+
+    def _has_slot(self, workload: str) -> bool:
+        return (
+            sum(self._active.values()) < MAX_CONCURRENT
+            and self._active[workload] < CLASS_MAX_CONCURRENT[workload]
+        )
+
+    def _next_ticket(self) -> tuple[str, tuple[float, int, float]] | None:
+        for workload in sorted(PRIORITY, key=PRIORITY.get):
+            if self._queues[workload] and self._has_slot(workload):
+                return workload, self._queues[workload][0]
+        return None
+
+    def _enqueue(self, workload: str, tenant: str, cost: float) -> tuple[float, int, float]:
+        # WFQ: start = max(클래스 virtual time, tenant 의 직전 finish), finish = start + cost / weight
+        weight = TENANT_WEIGHTS.get(tenant, 1.0)
+        start = max(self._virtual_time[workload], self._last_finish.get((workload, tenant), 0.0))
+        finish = start + cost / weight
+        self._last_finish[(workload, tenant)] = finish
+        ticket = (finish, next(self._seq), start)
+        heapq.heappush(self._queues[workload], ticket)
+        return ticket
+
+    def _admit(self, workload: str, tenant: str, cost: float, timeout: float) -> None:
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            ticket = self._enqueue(workload, tenant, cost)
+            while self._next_ticket() != (workload, ticket):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._queues[workload].remove(ticket)
+                    heapq.heapify(self._queues[workload])
+                    self._stats[workload]["timeouts"] += 1
+                    self._cond.notify_all()
+                    raise DeadlineExceeded(f"LLM 스케줄러 대기 시간 초과 ({workload}, tenant={tenant})")
+                self._cond.wait(remaining)
+
+            heapq.heappop(self._queues[workload])
+            # 클래스 virtual time = 실행 중인 요청의 start tag
+            self._virtual_time[workload] = max(self._virtual_time[workload], ticket[2])
+            self._active[workload] += 1
+            self._cond.notify_all()
+
+    def _release(self, workload: str) -> None:
+        with self._cond:
+            self._active[workload] -= 1
+            self._cond.notify_all()
+
+    def _wait_for_tokens(self, workload: str, tokens: int, deadline: float) -> float:
+        """
+        토큰 버킷에서 tokens 를 가져올 때까지 대기. deadline(monotonic) 을 넘기면 DeadlineExceeded
+        """
+        if self.bucket is None or tokens <= 0:
+            return 0.0
+        reserve = 0.0 if workload == WORKLOAD_INTERACTIVE else self.bucket.capacity * INTERACTIVE_RESERVE
+        waited = 0.0
+        while True:
+            wait = self.bucket.take(tokens, reserve)
+            if wait <= 0:
+                return waited
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                with self._cond:
+                    self._stats[workload]["timeouts"] += 1
+                raise DeadlineExceeded(f"LLM 토큰 버킷 대기 시간 초과 ({workload}, tokens={tokens})")
+            wait = min(wait, 5.0, remaining)
+            time.sleep(wait)
+            waited += wait
+
+    @contextmanager
+    def slot(self, *, workload: str, tokens: int, tenant: str | None = None) -> Iterator[None]:
+        workload = workload if workload in PRIORITY else WORKLOAD_BATCH
+        tenant = tenant or current_tenant()
+        cost = max(tokens, 1)
+        started = time.monotonic()
+
+        # 슬롯 대기와 토큰 버킷 대기를 합쳐서 QUEUE_TIMEOUT_SECONDS 안에 끝나야 한다
+        deadline = started + QUEUE_TIMEOUT_SECONDS[workload]
+        self._admit(workload, tenant, cost, QUEUE_TIMEOUT_SECONDS[workload])
+        try:
+            bucket_wait = self._wait_for_tokens(workload, tokens, deadline)
+            waited = time.monotonic() - started
+            with self._cond:
+                stats = self._stats[workload]
+                stats["admitted"] += 1
+                stats["wait_seconds"] += waited
+                stats["bucket_wait_seconds"] += bucket_wait
+                self._waits[workload].append(waited)
+            if waited >= 1.0:
+                print(f"[scheduler] {workload} tenant={tenant} waited {waited:.2f}s (bucket {bucket_wait:.2f}s)")
+            yield
+        finally:
+            self._release(workload)
+
+    def stats(self) -> dict[str, Any]:
+        with self._cond:
+            result = {}
+            for workload in PRIORITY:
+                waits = sorted(self._waits[workload])
+                result[workload] = {
+                    **self._stats[workload],
+                    "queued": len(self._queues[workload]),
+                    "active": self._active[workload],
+                    "p50_wait_seconds": waits[len(waits) // 2] if waits else 0.0,
+                    "p95_wait_seconds": waits[min(int(len(waits) * 0.95), len(waits) - 1)] if waits else 0.0,
+                }
+        return result
+
+
+_scheduler = LLMScheduler(_make_bucket())
+
+
+def scheduled(*, workload: str, tokens: int, tenant: str | None = None):
+    """
+    LLM 호출 1건을 스케줄러 슬롯 안에서 실행하는 context manager.
+    tokens: 입력 토큰 수 (출력 예상치 OUTPUT_TOKEN_ESTIMATE 는 여기서 더한다)
+    """
+    return _scheduler.slot(workload=workload, tokens=tokens + OUTPUT_TOKEN_ESTIMATE, tenant=tenant)
+
+
+def get_scheduler_stats() -> dict[str, Any]:
+    return _scheduler.stats()
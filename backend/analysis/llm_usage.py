@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import os
+import threading
+from typing import Any
+
+from backend.analysis.tokens import count_tokens
+from backend.core import metrics
+
+# 호출 지점(caller)별 누적 토큰 / 지연 통계 (비용·지연 대시보드용)
+_stats_lock = threading.Lock()
+LLM_USAGE_STATS: dict[str, dict[str, Any]] = {}
+
+# 1 이면 호출마다 [llm] / [router] 로그 (평소에는 실패 / fallback 만, 나머지는 /metrics 로 본다)
+LLM_DEBUG_LOG = os.getenv("LLM_DEBUG_LOG", "0") == "1"
+
+LLM_CALL_SECONDS = metrics.histogram(
+    "llm_call_duration_seconds",
+    "LLM 호출 1건 소요 시간 (재시도 / hedge / fallback 포함, outcome: ok / error / parse_error)",
+    ["caller", "outcome"],
+    buckets=(0.25, 0.5, 1.0, 2.0, 4.0, 8.0, 15.0, 30.0, 45.0, 60.0, 90.0),
+)
+LLM_TOKENS = metrics.counter("llm_tokens_total", "LLM 토큰 수 (kind: prompt / completion / cached)", ["caller", "kind"])
+LLM_ERRORS = metrics.counter("llm_call_errors_total", "LLM 호출 실패 수 (응답 JSON 파싱 실패 포함)", ["caller"])
+
+
+def _empty_stats() -> dict[str, Any]:
+    return {
+        "calls": 0,
+        "errors": 0,
+        "prompt_tokens": 0,
+        "completion_tokens": 0,
+        # provider prompt cache 에서 재사용된 입력 토큰 (prompt_tokens 에 포함된 값)
+        "cached_tokens": 0,
+        "latency_seconds": 0.0,
+        "max_latency_seconds": 0.0,
+    }
+
+
+def response_tokens(response: Any, prompt: str = "", completion: str = "") -> tuple[int, int, int]:
+    """
+    (입력, 출력, 캐시 입력) 토큰. API 응답의 usage 를 우선 쓰고, 없으면 로컬 토큰 수로 대신한다.
+    """
+    usage = getattr(response, "usage", None)
+    prompt_tokens = getattr(usage, "prompt_tokens", None)
+    completion_tokens = getattr(usage, "completion_tokens", None)
+    details = getattr(usage, "prompt_tokens_details", None)
+    cached_tokens = getattr(details, "cached_tokens", None) or 0
+    return (
+        prompt_tokens if prompt_tokens is not None else count_tokens(prompt),
+        completion_tokens if completion_tokens is not None else count_tokens(completion),
+        cached_tokens,
+    )
+
+
+def record_llm_call(
+    caller: str,
+    *,
+    prompt_tokens: int = 0,
+    completion_tokens: int = 0,
+    cached_tokens: int = 0,
+    elapsed: float = 0.0,
+    error: bool = False,
+    outcome: str | None = None,
+) -> None:
+    """
+    outcome: 지정하지 않으면 error 여부로 ok / error. 응답은 받았지만 JSON 이 없거나 깨졌으면 parse_error
+    ("ok" 가 아닌 outcome 은 모두 오류로 센다)
+    """
+    outcome = outcome or ("error" if error else "ok")
+    error = outcome != "ok"
+    with _stats_lock:
+        stats = LLM_USAGE_STATS.setdefault(caller, _empty_stats())
+        stats["calls"] += 1
+        stats["errors"] += int(error)
+        stats["prompt_tokens"] += prompt_tokens
+        stats["completion_tokens"] += completion_tokens
+        stats["cached_tokens"] += cached_tokens
+        stats["latency_seconds"] += elapsed
+        stats["max_latency_seconds"] = max(stats["max_latency_seconds"], elapsed)
+
+    LLM_CALL_SECONDS.observe(elapsed, caller=caller, outcome=outcome)
+    if error:
+        LLM_ERRORS.inc(caller=caller)
+    for kind, tokens in (("prompt", prompt_tokens), ("completion", completion_tokens), ("cached", cached_tokens)):
+        if tokens:
+            LLM_TOKENS.inc(tokens, caller=caller, kind=kind)
+
+    if error or LLM_DEBUG_LOG:
+        print(
+            f"[llm] caller={caller} in={prompt_tokens} cached={cached_tokens} out={completion_tokens} "
+            f"{elapsed:.2f}s{f' {outcome}' if error else ''}"
+        )
+
+
+def get_llm_usage_stats() -> dict[str, dict[str, Any]]:
+    with _stats_lock:
+        return {caller: dict(stats) for caller, stats in LLM_USAGE_STATS.items()}
@@ -0,0 +1,194 @@
+"""
+LLM 없이 동작하는 한국어 리뷰 감성 / 키워드 엔진.
+- 감성: 어간 사전(lexicon) 매칭 + 부정어(안/못/않/없) 반전 + 강조어 가중치
+- 키워드: 조사/어미를 떼어낸 unigram + bigram 문서 빈도
+외부 의존성 없이 정규식만 사용한다. (리뷰 수천 건 기준 수십 ms)
+"""
+from __future__ import annotations
+
+import re
+from collections import Counter
+
+# 어간 → 가중치. 긴 어간이 먼저 매칭된다. (예: "불친절" 이 "친절" 보다 우선)
+POSITIVE_LEXICON = {
+    "좋": 1.0, "맛있": 1.5, "맛집": 1.0, "친절": 1.5, "깨끗": 1.0, "청결": 1.0,
+    "만족": 1.5, "추천": 1.5, "최고": 2.0, "훌륭": 1.5, "빠르": 1.0, "빨리": 0.5,
+    "편하": 1.0, "편리": 1.0, "넓": 0.5, "저렴": 1.0, "가성비": 1.0, "재방문": 1.5,
+    "감사": 1.0, "신선": 1.0, "예쁘": 1.0, "이쁘": 1.0, "아늑": 1.0, "쾌적": 1.0,
+    "정성": 1.0, "푸짐": 1.0, "완벽": 2.0, "꼼꼼": 1.0, "맛나": 1.5, "든든": 1.0,
+    "괜찮": 0.5, "기분좋": 1.5, "행복": 1.5, "즐겁": 1.0, "굿": 1.0,
+    "대박": 1.5, "짱": 1.5, "감동": 1.5, "세심": 1.0, "상냥": 1.0, "따뜻": 1.0,
+}
+
+NEGATIVE_LEXICON = {
+    "별로": 1.5, "불친절": 2.0, "더럽": 1.5, "지저분": 1.5, "느리": 1.0, "비싸": 1.0,
+    "최악": 2.5, "실망": 2.0, "불편": 1.5, "불만": 1.5, "짜요": 0.5, "싱겁": 0.5,
+    "늦": 1.0, "좁": 0.5, "시끄럽": 1.0, "냄새": 1.0, "불결": 2.0, "비추": 2.0,
+    "아쉽": 1.0, "아쉬": 1.0, "무례": 2.0, "환불": 1.5, "불쾌": 2.0, "엉망": 2.0,
+    "후회": 2.0, "맛없": 2.0, "대기": 0.5, "기다리": 0.5, "오래걸": 1.0, "문제": 1.0,
+    "불량": 1.5, "짜증": 2.0, "불친": 2.0, "성의없": 2.0, "바가지": 2.0,
+    "다시는": 1.5, "거지같": 2.5, "쓰레기": 2.5, "형편없": 2.0, "비위생": 2.0,
+}
+
+NEGATION_PREFIXES = ("안", "못")
+NEGATION_SUFFIX_PATTERN = re.compile(r"(않|못하|없|아니|안되|안돼)")
+INTENSIFIERS = {"너무": 1.5, "정말": 1.5, "진짜": 1.5, "완전": 1.5, "매우": 1.5, "아주": 1.5, "엄청": 1.5, "넘": 1.3}
+
+# 조사 / 어미 (긴 것 먼저 제거)
+_SUFFIXES = sorted(
+    [
+        "에서는", "으로는", "이에요", "이었어요", "였어요", "습니다", "입니다", "해요", "했어요",
+        "네요", "어요", "아요", "에서", "으로", "에게", "까지", "부터", "처럼", "보다",
+        "은", "는", "이", "가", "을", "를", "에", "도", "로", "와", "과", "의", "만", "요", "고", "다",
+    ],
+    key=len,
+    reverse=True,
+)
+
+STOPWORDS = {
+    "너무", "정말", "진짜", "완전", "매우", "아주", "엄청", "그냥", "조금", "좀", "많이", "다시",
+    "그리고", "근데", "하지만", "그래서", "또", "더", "잘", "안", "못", "것", "거", "수", "때",
+    "여기", "이곳", "저희", "제가", "우리", "있", "있어", "있고", "있는", "없는", "했는데", "하는",
+    "합니다", "있습니다", "같아요", "같습니다", "ㅎㅎ", "ㅋㅋ", "ㅠㅠ",
+}
+
+_TOKEN_PATTERN = re.compile(r"[가-힣A-Za-z0-9]+")
+
+
+def _compile_lexicon(lexicon: dict[str, float]) -> re.Pattern:
+    stems = sorted(lexicon, key=len, reverse=True)
+    return re.compile("|".join(re.escape(stem) for stem in stems))
+
+
+_STEM_WEIGHTS = {
+    **{stem: weight for stem, weight in POSITIVE_LEXICON.items()},
+    **{stem: -weight for stem, weight in NEGATIVE_LEXICON.items()},
+}
+_STEM_PATTERN = _compile_lexicon(_STEM_WEIGHTS)
+
+
+def tokenize(text: str) -> list[str]:
+    return _TOKEN_PATTERN.findall(text or "")
+
+
+def score_sentiment(text: str) -> float:
+    """
+    리뷰 1건 감성 점수. 양수 = 긍정, 음수 = 부정, 0 = 중립
+    """
+    tokens = tokenize(text)
+    score = 0.0
+    boost = 1.0
+
+    for index, token in enumerate(tokens):
+        if token in INTENSIFIERS:
+            boost = INTENSIFIERS[token]
+            continue
+
+        match = _STEM_PATTERN.search(token)
+        if not match:
+            continue
+
+        weight = _STEM_WEIGHTS[match.group()] * boost
+        boost = 1.0
+
+        # 부정어: 앞 토큰이 안/못, 또는 같은 토큰 뒤쪽이나 다음 토큰에 않/없/못하/아니
+        rest = token[match.end():]
+        following = tokens[index + 1] if index + 1 < len(tokens) else ""
+        previous = tokens[index - 1] if index > 0 else ""
+        negated = (
+            previous in NEGATION_PREFIXES
+            or bool(NEGATION_SUFFIX_PATTERN.search(rest))
+            or bool(NEGATION_SUFFIX_PATTERN.match(following))
+        )
+        score += -weight if negated else weight
+
+    return score
+
+
+def label_sentiment(score: float, threshold: float = 0.5) -> str:
+    if score >= threshold:
+        return "positive"
+    if score <= -threshold:
+        return "negative"
+    return "neutral"
+
+
+def classify_sentiments(texts: list[str]) -> list[str]:
+    return [label_sentiment(score_sentiment(text)) for text in texts]
+
+
+def satisfaction_score(scores: list[float]) -> float:
+    """
+    전체 만족도 0~10 (리뷰별 점수를 -1~1 로 자른 평균 기준)
+    """
+    if not scores:
+        return 0.0
+    clipped = [max(-1.0, min(1.0, score / 2)) for score in scores]
+    return round(5 + 5 * sum(clipped) / len(clipped), 1)
+
+
+def _strip_suffix(token: str) -> str:
+    for suffix in _SUFFIXES:
+        if token.endswith(suffix) and len(token) - len(suffix) >= 2:
+            return token[: -len(suffix)]
+    return token
+
+
+def _content_tokens(text: str) -> list[str]:
+    tokens = []
+    for token in tokenize(text):
+        if token in STOPWORDS or token.isdigit():
+            continue
+        token = _strip_suffix(token)
+        if len(token) < 2 or token in STOPWORDS:
+            continue
+        tokens.append(token)
+    return tokens
+
+
+def extract_keywords(texts: list[str], limit: int = 5, min_df: int = 2) -> list[str]:
+    """
+    unigram + bigram 문서 빈도 상위 키워드.
+    bigram 은 min_df 이상 등장할 때만 쓰고, bigram 에 포함된 unigram 은 중복으로 보지 않는다.
+    """
+    unigram_df: Counter[str] = Counter()
+    bigram_df: Counter[str] = Counter()
+
+    for text in texts:
+        tokens = _content_tokens(text)
+        unigram_df.update(set(tokens))
+        bigram_df.update({f"{a} {b}" for a, b in zip(tokens, tokens[1:])})
+
+    candidates: list[tuple[float, str]] = []
+    for phrase, df in bigram_df.items():
+        if df >= min_df:
+            # 구(phrase)가 의미 단위라 같은 빈도면 unigram 보다 우선
+            candidates.append((df * 1.5, phrase))
+    for word, df in unigram_df.items():
+        candidates.append((float(df), word))
+
+    keywords: list[str] = []
+    for _, phrase in sorted(candidates, key=lambda item: (-item[0], item[1])):
+        if any(phrase in chosen or chosen in phrase for chosen in keywords):
+            continue
+        keywords.append(phrase)
+        if len(keywords) >= limit:
+            break
+    return keywords
+
+
+def analyze_local(texts: list[str], keyword_limit: int = 5) -> dict:
+    """
+    전체 리뷰에 대한 감성 개수 / 만족도 / 키워드 (LLM 미사용)
+    """
+    scores = [score_sentiment(text) for text in texts]
+    labels = [label_sentiment(score) for score in scores]
+    return {
+        "total": len(texts),
+        "positive": labels.count("positive"),
+        "neutral": labels.count("neutral"),
+        "negative": labels.count("negative"),
+        "score": satisfaction_score(scores),
+        "keywords": extract_keywords(texts, limit=keyword_limit),
+        "sentiments": labels,
+    }
@@ -0,0 +1,229 @@
+"""
+LLM 모델 라우터
+요청마다 입력 토큰 수 / workload(interactive · batch) / 관측된 지연·오류율을 보고 모델 tier 순서를 정하고,
+앞 tier 가 실패(deadline 초과 / circuit open / 일시적 오류)하면 다음 tier 로 넘어간다.
+
+기본 정책
+1. 입력이 tier 의 max_input_tokens 를 넘거나 circuit 이 열린 tier 는 제외
+2. 호출 측 기본 tier(preferred)를 우선 (기존 모델 품질 유지)
+3. batch 이고 입력이 SMALL_INPUT_TOKENS 이하면 더 싼 tier 를 우선 (짧은 분류 요청)
+4. interactive 는 preferred 의 p95 가 INTERACTIVE_P95_SECONDS 를 넘으면 더 빠른 tier 를 우선
+5. 최근 오류율이 ERROR_RATE_THRESHOLD 이상인 tier 는 뒤로
+"""
+from __future__ import annotations
+
+import os
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, TypeVar
+
+from backend.analysis.llm_resilience import (
+    DEADLINE_SECONDS,
+    WORKLOAD_BATCH,
+    WORKLOAD_INTERACTIVE,
+    LLMUnavailable,
+    get_breaker,
+    get_latency_window,
+    is_transient_error,
+    run_llm_call,
+)
+from backend.analysis.llm_scheduler import scheduled
+from backend.analysis.llm_usage import LLM_DEBUG_LOG
+
+T = TypeVar("T")
+
+# 가격: USD / 1M tokens (입력, 출력). 환경변수로 모델명 교체 가능
+MODEL_TIERS: dict[str, dict[str, Any]] = {
+    "mini": {
+        "model": os.getenv("LLM_MODEL_MINI", "gpt-4o-mini"),
+        "input_cost": 0.15,
+        "output_cost": 0.60,
+        "max_input_tokens": 120_000,
+    },
+    "standard": {
+        "model": os.getenv("LLM_MODEL_STANDARD", "gpt-4.1-mini"),
+        "input_cost": 0.40,
+        "output_cost": 1.60,
+        "max_input_tokens": 900_000,
+    },
+}
+
+SMALL_INPUT_TOKENS = int(os.getenv("LLM_ROUTER_SMALL_INPUT_TOKENS", "800"))
+INTERACTIVE_P95_SECONDS = float(os.getenv("LLM_ROUTER_INTERACTIVE_P95_SECONDS", "12"))
+ERROR_RATE_THRESHOLD = float(os.getenv("LLM_ROUTER_ERROR_RATE_THRESHOLD", "0.3"))
+ERROR_WINDOW = 50
+ERROR_MIN_SAMPLES = 10
+# 마지막이 아닌 tier 는 남은 deadline 에서 뒤 tier 1개당 이만큼을 fallback 몫으로 남긴다
+FALLBACK_RESERVE_SECONDS = float(os.getenv("LLM_ROUTER_FALLBACK_RESERVE_SECONDS", "10"))
+
+_lock = threading.Lock()
+_outcomes: dict[str, deque[bool]] = {}
+ROUTER_STATS: dict[str, dict[str, int]] = {}
+
+
+def _tier_stats(tier: str) -> dict[str, int]:
+    return ROUTER_STATS.setdefault(tier, {"routed": 0, "succeeded": 0, "failed": 0, "fallbacks": 0})
+
+
+def _record_outcome(tier: str, ok: bool) -> None:
+    with _lock:
+        _outcomes.setdefault(tier, deque(maxlen=ERROR_WINDOW)).append(ok)
+        _tier_stats(tier)["succeeded" if ok else "failed"] += 1
+
+
+def error_rate(tier: str) -> float:
+    with _lock:
+        outcomes = list(_outcomes.get(tier, ()))
+    if len(outcomes) < ERROR_MIN_SAMPLES:
+        return 0.0
+    return outcomes.count(False) / len(outcomes)
+
+
+def model_endpoint(model: str) -> str:
+    # breaker / 지연 통계는 모델 단위로 분리
+    return f"openai:{model}"
+
+
+def endpoint_name(tier: str) -> str:
+    return model_endpoint(MODEL_TIERS[tier]["model"])
+
+
+def all_circuits_open() -> bool:
+    """
+    모든 tier 의 circuit 이 열려 있음 = LLM 을 지금 쓸 수 없음 (호출 측 로컬 fallback 판단용)
+    """
+    return all(get_breaker(endpoint_name(tier)).state == "open" for tier in MODEL_TIERS)
+
+
+def route(
+    *,
+    input_tokens: int,
+    workload: str = WORKLOAD_BATCH,
+    preferred: str = "mini",
+) -> list[str]:
+    """
+    시도할 tier 순서. (첫 번째가 1순위, 나머지는 fallback)
+    """
+    candidates = [
+        tier for tier, spec in MODEL_TIERS.items()
+        if input_tokens <= spec["max_input_tokens"] and get_breaker(endpoint_name(tier)).state != "open"
+    ]
+    if not candidates:
+        # 전부 열려 있으면 half_open 시험 호출이 가능한 순서대로 (run_llm_call 이 판단)
+        candidates = [tier for tier, spec in MODEL_TIERS.items() if input_tokens <= spec["max_input_tokens"]]
+
+    def p95(tier: str) -> float:
+        return get_latency_window(endpoint_name(tier)).percentile(0.95) or 0.0
+
+    def cost(tier: str) -> float:
+        return MODEL_TIERS[tier]["input_cost"]
+
+    def sort_key(tier: str) -> tuple:
+        unhealthy = error_rate(tier) >= ERROR_RATE_THRESHOLD
+        if workload == WORKLOAD_BATCH and input_tokens <= SMALL_INPUT_TOKENS:
+            return (unhealthy, cost(tier), tier != preferred)
+        if workload == WORKLOAD_INTERACTIVE and p95(preferred) > INTERACTIVE_P95_SECONDS:
+            return (unhealthy, p95(tier), tier != preferred)
+        return (unhealthy, tier != preferred, cost(tier))
+
+    return sorted(candidates, key=sort_key)
+
+
+def call_model(
+    fn: Callable[[str, float], T],
+    *,
+    model: str | None,
+    input_tokens: int,
+    workload: str = WORKLOAD_BATCH,
+    preferred: str = "mini",
+    caller: str = "",
+) -> tuple[T, str]:
+    """
+    model 을 지정하면 그 모델만 (annotation 처럼 모델을 고정해야 하는 경우), 아니면 call_routed.
+    호출 전체(fallback 포함)가 스케줄러 슬롯 1개를 쓴다 (llm_scheduler).
+    """
+    with scheduled(workload=workload, tokens=input_tokens):
+        if model:
+            result = run_llm_call(
+                lambda timeout: fn(model, timeout),
+                workload=workload,
+                endpoint=model_endpoint(model),
+            )
+            return result, model
+        return call_routed(fn, input_tokens=input_tokens, workload=workload, preferred=preferred, caller=caller)
+
+
+def call_routed(
+    fn: Callable[[str, float], T],
+    *,
+    input_tokens: int,
+    workload: str = WORKLOAD_BATCH,
+    preferred: str = "mini",
+    caller: str = "",
+) -> tuple[T, str]:
+    """
+    route() 순서대로 fn(model, timeout) 을 run_llm_call 로 실행한다.
+    앞 tier 가 LLM 장애(deadline / circuit open / 일시적 오류)로 실패하면 남은 deadline 안에서 다음 tier 로.
+    마지막 tier 가 아니면 뒤 tier 몫(FALLBACK_RESERVE_SECONDS × 뒤 tier 수)을 남기고 쓴다
+    (긴 JSON 을 만드는 느린 정상 응답은 기다리면서, 앞 tier 가 멈춰도 fallback 할 시간은 남김).
+    반환: (결과, 사용한 model)
+    """
+    order = route(input_tokens=input_tokens, workload=workload, preferred=preferred)
+    if LLM_DEBUG_LOG:
+        print(
+            f"[router] caller={caller} workload={workload} in={input_tokens} "
+            f"preferred={preferred} order={','.join(order)}"
+        )
+
+    end = time.monotonic() + DEADLINE_SECONDS.get(workload, DEADLINE_SECONDS[WORKLOAD_BATCH])
+    last_error: BaseException | None = None
+    for index, tier in enumerate(order):
+        remaining = end - time.monotonic()
+        if remaining <= 0:
+            break
+
+        model = MODEL_TIERS[tier]["model"]
+        with _lock:
+            _tier_stats(tier)["routed"] += 1
+            if index:
+                _tier_stats(tier)["fallbacks"] += 1
+        if index:
+            print(f"[router] caller={caller} fallback → {tier} ({model}) after {last_error}")
+
+        # 예약분이 너무 커도 이 tier 가 남은 시간의 절반은 쓴다
+        reserve = min(FALLBACK_RESERVE_SECONDS * (len(order) - index - 1), remaining / 2)
+        try:
+            result = run_llm_call(
+                lambda timeout: fn(model, timeout),
+                workload=workload,
+                endpoint=endpoint_name(tier),
+                deadline=remaining - reserve,
+            )
+        except Exception as e:
+            if not (isinstance(e, LLMUnavailable) or is_transient_error(e)):
+                raise
+            _record_outcome(tier, False)
+            last_error = e
+            continue
+
+        _record_outcome(tier, True)
+        return result, model
+
+    if isinstance(last_error, LLMUnavailable):
+        raise last_error
+    raise LLMUnavailable(f"모든 모델 tier 실패 ({last_error})")
+
+
+def get_router_stats() -> dict[str, Any]:
+    with _lock:
+        stats = {tier: dict(values) for tier, values in ROUTER_STATS.items()}
+    for tier in MODEL_TIERS:
+        stats.setdefault(tier, {"routed": 0, "succeeded": 0, "failed": 0, "fallbacks": 0})
+        stats[tier].update({
+            "model": MODEL_TIERS[tier]["model"],
+            "breaker": get_breaker(endpoint_name(tier)).state,
+            "p95_seconds": get_latency_window(endpoint_name(tier)).percentile(0.95),
+            "error_rate": round(error_rate(tier), 3),
+        })
+    return stats
@@ -0,0 +1,59 @@
+"""
+LLM 프롬프트 공통 빌더
+- 입력 정리: Google 번역 안내문 / 원문 중복 제거, 반복 이모지·자모·문장부호 축약, 공백 정리
+- 토큰 예산: 글자 수가 아니라 토큰 수 기준으로 필드별로 자른다 (한글은 글자당 토큰 수가 들쭉날쭉)
+"""
+from __future__ import annotations
+
+import re
+from typing import Any
+
+from backend.analysis.tokens import count_tokens, truncate_tokens
+
+# Google 자동 번역 리뷰: "(Google 번역 제공) 번역문 (원문) 원문" → 번역문만 남김
+_ORIGINAL_MARKER = re.compile(r"\(\s*(?:원문|Original)\s*\)", re.IGNORECASE)
+_BOILERPLATE = re.compile(r"\(\s*(?:Google\s*번역\s*제공|Translated\s+by\s+Google)\s*\)", re.IGNORECASE)
+
+_EMOJI_RUN = re.compile(r"([\U0001F000-\U0001FAFF\u2600-\u27bf\u2b00-\u2bff])(?:\ufe0f?\1)+\ufe0f?")
+# "ㅋㅋㅋㅋ", "!!!!", "~~~~" 같은 반복은 2개로 (숫자/글자는 건드리지 않음)
+_SYMBOL_RUN = re.compile(r"([ㄱ-ㅎㅏ-ㅣ!?.~^;♡♥])\1{2,}")
+_SPACES = re.compile(r"[ \t\u00a0\u200b]+")
+_BLANK_LINES = re.compile(r"\n\s*\n+")
+
+
+def clean_text(text: str) -> str:
+    if not text:
+        return ""
+
+    marker = _ORIGINAL_MARKER.search(text)
+    if marker and marker.start() > 0:
+        text = text[:marker.start()]
+    text = _BOILERPLATE.sub("", text)
+
+    text = _EMOJI_RUN.sub(r"\1", text)
+    text = _SYMBOL_RUN.sub(r"\1\1", text)
+    text = _SPACES.sub(" ", text)
+    text = _BLANK_LINES.sub("\n\n", text)
+    return "\n".join(line.strip() for line in text.strip().splitlines())
+
+
+def fit_text(text: str, max_tokens: int) -> str:
+    """
+    정리(clean_text) 후 max_tokens 안으로 자른다.
+    """
+    return truncate_tokens(clean_text(text), max_tokens)
+
+
+def build_prompt(template: str, budgets: dict[str, int], **fields: Any) -> str:
+    """
+    template.format(**fields). budgets 에 있는 필드는 fit_text 로 토큰 예산에 맞춘 뒤 넣는다.
+    """
+    values = {
+        name: fit_text(str(value or ""), budgets[name]) if name in budgets else value
+        for name, value in fields.items()
+    }
+    return template.format(**values)
+
+
+def prompt_tokens(*parts: str) -> int:
+    return sum(count_tokens(part) for part in parts if part)
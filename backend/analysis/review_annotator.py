@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+from typing import Any
+
+from backend.analysis.engine import call_llm
+
+ANNOTATION_MODEL = "gpt-4o-mini"
+ANNOTATION_PROMPT_VERSION = 1
+
+SENTIMENTS = ("positive", "neutral", "negative")
+MAX_ASPECTS = 5
+MAX_KEYWORDS = 5
+
+# 고정 지시문 (batch 청크마다 같은 prefix → prompt cache 재사용). 리뷰 목록은 사용자 메시지에만
+ANNOTATION_INSTRUCTIONS = f"""
+사용자 메시지는 번호가 붙은 실제 Google 리뷰 목록이다. 각 리뷰를 독립적으로 annotation 하라.
+리뷰에 없는 내용은 절대 추측하지 마라.
+
+규칙
+- sentiment: positive / neutral / negative 중 하나
+- score: -1.0(매우 부정) ~ 1.0(매우 긍정)
+- aspects: 리뷰가 평가하는 측면 최대 {MAX_ASPECTS}개. label 은 "무엇 + 상태" 짧은 명사구 (예: 응대 친절, 대기 시간)
+- keywords: 워드클라우드용 의미 단위 명사구 최대 {MAX_KEYWORDS}개
+- polarity: 해당 aspect / keyword 가 언급된 문맥의 감성 (positive / neutral / negative)
+- 결과는 리뷰 번호(i) 순서대로 모두 반환
+
+반드시 아래 JSON 만 반환하라.
+{{
+  "annotations": [
+    {{
+      "i": 0,
+      "sentiment": "positive",
+      "score": 0.8,
+      "aspects": [{{"label": "응대 친절", "polarity": "positive"}}],
+      "keywords": [{{"text": "친절한 직원", "polarity": "positive"}}]
+    }}
+  ]
+}}
+"""
+
+
+def sentiment_from_rating(rating: int | None) -> dict[str, Any]:
+    """
+    텍스트 없는(별점만 있는) 리뷰는 LLM 없이 별점으로 감성만 정한다.
+    """
+    if rating is not None and rating >= 4:
+        sentiment, score = "positive", 1.0 if rating == 5 else 0.5
+    elif rating is not None and rating <= 2:
+        sentiment, score = "negative", -1.0 if rating == 1 else -0.5
+    else:
+        sentiment, score = "neutral", 0.0
+
+    return {
+        "sentiment": sentiment,
+        "sentiment_score": score,
+        "aspects": [],
+        "keywords": [],
+        "model": "rating",
+    }
+
+
+def _normalize_tagged(items: Any, name_field: str, limit: int) -> list[dict]:
+    if not isinstance(items, list):
+        return []
+
+    result = []
+    seen = set()
+    for item in items:
+        if not isinstance(item, dict):
+            continue
+        name = str(item.get(name_field, "")).strip()
+        polarity = str(item.get("polarity", "neutral")).strip().lower()
+        if not name or name in seen:
+            continue
+        if polarity not in SENTIMENTS:
+            polarity = "neutral"
+        seen.add(name)
+        result.append({name_field: name, "polarity": polarity})
+    return result[:limit]
+
+
+def _normalize_annotation(item: dict, rating: int | None) -> dict[str, Any]:
+    sentiment = str(item.get("sentiment", "")).strip().lower()
+    if sentiment not in SENTIMENTS:
+        return sentiment_from_rating(rating)
+
+    try:
+        score = max(-1.0, min(1.0, float(item.get("score", 0.0))))
+    except (TypeError, ValueError):
+        score = 0.0
+
+    return {
+        "sentiment": sentiment,
+        "sentiment_score": score,
+        "aspects": _normalize_tagged(item.get("aspects"), "label", MAX_ASPECTS),
+        "keywords": _normalize_tagged(item.get("keywords"), "text", MAX_KEYWORDS),
+        "model": ANNOTATION_MODEL,
+    }
+
+
+def annotate_reviews(reviews: list[dict[str, Any]]) -> list[dict[str, Any]] | dict[str, Any]:
+    """
+    리뷰 여러 건을 LLM 1회로 annotation.
+    reviews: [{"comment": str, "rating": int | None}, ...]
+    반환: 입력과 같은 순서의 annotation 목록 (실패 시 {"error": True, ...})
+    """
+    if not reviews:
+        return []
+
+    lines = [
+        f"[{index}] (별점 {r.get('rating') or '-'}) {r['comment'].strip()}"
+        for index, r in enumerate(reviews)
+    ]
+
+    prompt = f"""
+리뷰 {len(reviews)}건:
+{chr(10).join(lines)}
+"""
+
+    # annotation 은 모델별로 결과가 섞이지 않게 ANNOTATION_MODEL 로 고정 (라우팅 안 함)
+    result = call_llm(
+        prompt,
+        instructions=ANNOTATION_INSTRUCTIONS,
+        caller="review_annotator",
+        model=ANNOTATION_MODEL,
+    )
+    if not isinstance(result, dict) or result.get("error") is True:
+        return result
+
+    by_index: dict[int, dict] = {}
+    for item in result.get("annotations") or []:
+        if not isinstance(item, dict):
+            continue
+        try:
+            by_index[int(item.get("i"))] = item
+        except (TypeError, ValueError):
+            continue
+
+    # 누락된 리뷰는 별점 기반 annotation 으로 채운다
+    return [
+        _normalize_annotation(by_index[index], r.get("rating"))
+        if index in by_index
+        else sentiment_from_rating(r.get("rating"))
+        for index, r in enumerate(reviews)
+    ]
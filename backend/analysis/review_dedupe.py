@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+import os
+import re
+import threading
+import zlib
+from collections import defaultdict
+
+from backend.analysis.prompt_builder import clean_text
+from backend.analysis.tokens import count_tokens
+
+# MinHash 설정: 32 permutation = 8 band × 4 row (LSH)
+NUM_PERM = 32
+BANDS = 8
+ROWS_PER_BAND = NUM_PERM // BANDS
+SHINGLE_SIZE = 3
+# 추정 Jaccard 유사도가 이 값 이상이면 같은 리뷰로 묶음
+SIMILARITY_THRESHOLD = float(os.getenv("REVIEW_DEDUPE_THRESHOLD", "0.7"))
+
+_PRIME = (1 << 61) - 1
+_PERMUTATIONS = [
+    (
+        (zlib.crc32(f"a{i}".encode()) * 2654435761 + 1) % _PRIME or 1,
+        zlib.crc32(f"b{i}".encode()) % _PRIME,
+    )
+    for i in range(NUM_PERM)
+]
+
+_NOISE_PATTERN = re.compile(r"[^가-힣A-Za-z0-9]+")
+_REPEAT_PATTERN = re.compile(r"(.)\1{2,}")
+
+# 프로세스 누적 통계
+_stats_lock = threading.Lock()
+DEDUPE_STATS = {
+    "runs": 0,
+    "reviews": 0,
+    "clusters": 0,
+    "tokens_before": 0,
+    "tokens_after": 0,
+}
+
+
+def get_dedupe_stats() -> dict:
+    with _stats_lock:
+        return dict(DEDUPE_STATS)
+
+
+def _normalize(text: str) -> str:
+    # 공백/문장부호 제거 + "ㅋㅋㅋㅋ", "!!!!" 같은 반복 축약
+    text = _NOISE_PATTERN.sub("", text.lower())
+    return _REPEAT_PATTERN.sub(r"\1\1", text)
+
+
+def _shingles(normalized: str) -> set[int]:
+    if len(normalized) <= SHINGLE_SIZE:
+        return {zlib.crc32(normalized.encode())}
+    return {
+        zlib.crc32(normalized[i:i + SHINGLE_SIZE].encode())
+        for i in range(len(normalized) - SHINGLE_SIZE + 1)
+    }
+
+
+def _minhash(shingles: set[int]) -> tuple[int, ...]:
+    return tuple(min((a * s + b) % _PRIME for s in shingles) for a, b in _PERMUTATIONS)
+
+
+def _similarity(sig_a: tuple[int, ...], sig_b: tuple[int, ...]) -> float:
+    return sum(1 for x, y in zip(sig_a, sig_b) if x == y) / NUM_PERM
+
+
+def format_weighted_review(text: str, count: int) -> str:
+    return f"(×{count}) {text}" if count > 1 else text
+
+
+def dedupe_reviews(reviews: list[str], threshold: float = SIMILARITY_THRESHOLD) -> tuple[list[dict], dict]:
+    """
+    거의 같은 리뷰를 하나의 대표 리뷰 + 개수(count)로 묶는다.
+
+    1) 정규화 문자열이 같은 리뷰는 바로 합침
+    2) 나머지는 문자 3-gram MinHash + LSH 로 후보 쌍을 찾고 추정 Jaccard >= threshold 면 합침
+    대표 리뷰는 묶음 안에서 가장 많이 반복된 표현(clean_text 로 정리), 순서는 묶음의 첫 등장 순서를 유지한다.
+
+    반환: ([{"text", "count"}, ...], {"reviews", "clusters", "tokens_before", "tokens_after", ...})
+    """
+    # 1) exact (정규화 기준)
+    groups: dict[str, list[int]] = {}
+    for index, review in enumerate(reviews):
+        key = _normalize(review)
+        if not key:
+            continue
+        groups.setdefault(key, []).append(index)
+
+    keys = list(groups)
+    signatures = [_minhash(_shingles(key)) for key in keys]
+
+    # 2) LSH banding → 후보 쌍 → union-find
+    parent = list(range(len(keys)))
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    for band in range(BANDS):
+        buckets: dict[tuple[int, ...], list[int]] = defaultdict(list)
+        start = band * ROWS_PER_BAND
+        for i, signature in enumerate(signatures):
+            buckets[signature[start:start + ROWS_PER_BAND]].append(i)
+
+        for members in buckets.values():
+            head = members[0]
+            for other in members[1:]:
+                root_a, root_b = find(head), find(other)
+                if root_a != root_b and _similarity(signatures[head], signatures[other]) >= threshold:
+                    parent[root_b] = root_a
+
+    clusters: dict[int, list[str]] = defaultdict(list)
+    for i, key in enumerate(keys):
+        clusters[find(i)].append(key)
+
+    items = []
+    for members in sorted(clusters.values(), key=lambda m: min(groups[k][0] for k in m)):
+        # 가장 많이 반복된 표현을 대표로 (같으면 더 긴 쪽)
+        top = max(members, key=lambda k: (len(groups[k]), len(k)))
+        items.append({
+            "text": clean_text(reviews[groups[top][0]]),
+            "count": sum(len(groups[k]) for k in members),
+        })
+
+    tokens_before = count_tokens("\n".join(reviews))
+    tokens_after = count_tokens("\n".join(format_weighted_review(i["text"], i["count"]) for i in items))
+    stats = {
+        "reviews": len(reviews),
+        "clusters": len(items),
+        "tokens_before": tokens_before,
+        "tokens_after": tokens_after,
+        "token_reduction": round(1 - tokens_after / tokens_before, 3) if tokens_before else 0.0,
+    }
+
+    with _stats_lock:
+        DEDUPE_STATS["runs"] += 1
+        for field in ("reviews", "clusters", "tokens_before", "tokens_after"):
+            DEDUPE_STATS[field] += stats[field]
+
+    return items, stats
+
+
+def collapse_reviews(reviews: list[str], limit: int | None = None) -> list[str]:
+    """
+    프롬프트용: 중복을 묶은 리뷰를 "(×N) 대표 리뷰" 형태로 반환하고 토큰 절감량을 로그로 남긴다.
+    """
+    items, stats = dedupe_reviews(reviews)
+    print(
+        f"[dedupe] reviews={stats['reviews']} clusters={stats['clusters']} "
+        f"tokens {stats['tokens_before']}→{stats['tokens_after']} "
+        f"(-{stats['token_reduction'] * 100:.1f}%)"
+    )
+    lines = [format_weighted_review(item["text"], item["count"]) for item in items]
+    return lines[:limit] if limit is not None else lines
@@ -0,0 +1,176 @@
+from __future__ import annotations
+
+from collections import Counter
+from typing import Any, Iterable
+
+from backend.analysis.engine import call_llm
+from backend.analysis.review_dedupe import collapse_reviews
+
+DIGEST_VERSION = 1
+
+# 하루 digest / 합산 digest 크기 상한 (기간이 길어져도 LLM 입력이 커지지 않게)
+DAILY_ITEM_LIMIT = 10
+DAILY_KEYWORD_LIMIT = 20
+DAILY_QUOTE_LIMIT = 3
+REDUCED_ITEM_LIMIT = 20
+REDUCED_KEYWORD_LIMIT = 30
+REDUCED_QUOTE_LIMIT = 10
+
+# 고정 지시문 (매장/일자마다 같은 prefix 라 batch 호출에서 prompt cache 로 재사용된다)
+DAILY_DIGEST_INSTRUCTIONS = f"""
+사용자 메시지는 한 매장의 하루 동안 작성된 실제 Google 리뷰와 리뷰 수이다.
+나중에 여러 날의 요약을 합산해서 기간 리포트를 만들 것이므로,
+리뷰에 직접 근거한 내용만 짧은 명사구로 집계하라.
+리뷰에 없는 사실은 절대 추측하지 마라.
+
+규칙
+- count 는 해당 내용을 언급한 리뷰 수
+- weight 는 키워드 중요도 (1~10, 반복 언급일수록 크게)
+- label / text 는 "무엇 + 상태" 형태의 짧은 명사구 (예: 응대 친절, 대기 시간)
+- themes 는 감성과 무관한 반복 주제
+- quotes 는 대표 리뷰 원문 최대 {DAILY_QUOTE_LIMIT}개 (80자 이내로 자르기)
+- sentiment 는 감성별 리뷰 수 (합 = 사용자 메시지의 리뷰 수)
+- "(×N)" 으로 시작하는 줄은 거의 같은 리뷰 N건을 묶은 것이므로 N건으로 센다
+
+반드시 아래 JSON 만 반환하라.
+{{
+  "sentiment": {{"positive": 0, "neutral": 0, "negative": 0}},
+  "themes": [{{"label": "주제", "count": 0}}],
+  "strengths": [{{"label": "강점", "count": 0}}],
+  "pains": [{{"label": "불만", "count": 0}}],
+  "positive_keywords": [{{"text": "긍정 키워드", "weight": 0}}],
+  "negative_keywords": [{{"text": "부정 키워드", "weight": 0}}],
+  "quotes": ["대표 리뷰"]
+}}
+"""
+
+
+def _empty_digest(review_count: int = 0) -> dict:
+    return {
+        "version": DIGEST_VERSION,
+        "review_count": review_count,
+        "sentiment": {"positive": 0, "neutral": 0, "negative": 0},
+        "themes": [],
+        "strengths": [],
+        "pains": [],
+        "positive_keywords": [],
+        "negative_keywords": [],
+        "quotes": [],
+    }
+
+
+def _to_int(value: Any) -> int:
+    try:
+        return max(int(round(float(value))), 0)
+    except (TypeError, ValueError):
+        return 0
+
+
+def _normalize_counted(items: Any, key: str, limit: int) -> list[dict]:
+    """
+    [{"label"|"text": str, key: number}, ...] 정리 — 빈 값 제거 / 같은 label 합산 / 상위 limit 개
+    """
+    if not isinstance(items, list):
+        return []
+
+    name_field = "text" if key == "weight" else "label"
+    counter: Counter[str] = Counter()
+    for item in items:
+        if not isinstance(item, dict):
+            continue
+        name = str(item.get(name_field, "")).strip()
+        if not name:
+            continue
+        counter[name] += _to_int(item.get(key, 1)) or 1
+
+    return [{name_field: name, key: value} for name, value in counter.most_common(limit)]
+
+
+def _normalize_daily_digest(result: dict, review_count: int) -> dict:
+    digest = _empty_digest(review_count)
+
+    sentiment = result.get("sentiment") if isinstance(result.get("sentiment"), dict) else {}
+    digest["sentiment"] = {
+        name: _to_int(sentiment.get(name, 0))
+        for name in ("positive", "neutral", "negative")
+    }
+
+    for field in ("themes", "strengths", "pains"):
+        digest[field] = _normalize_counted(result.get(field), "count", DAILY_ITEM_LIMIT)
+    for field in ("positive_keywords", "negative_keywords"):
+        digest[field] = _normalize_counted(result.get(field), "weight", DAILY_KEYWORD_LIMIT)
+
+    quotes = result.get("quotes") if isinstance(result.get("quotes"), list) else []
+    digest["quotes"] = [str(q).strip() for q in quotes if str(q).strip()][:DAILY_QUOTE_LIMIT]
+
+    return digest
+
+
+def summarize_daily_reviews(reviews: list[str]) -> dict:
+    """
+    한 매장의 하루치 리뷰를 구조화된 digest 로 요약 (LLM 1회).
+    실패 시 {"error": True, ...} 를 그대로 반환한다.
+    """
+    if not reviews:
+        return _empty_digest()
+
+    prompt = f"""
+리뷰 수: {len(reviews)}
+
+리뷰:
+{chr(10).join(collapse_reviews(reviews))}
+"""
+
+    result = call_llm(prompt, instructions=DAILY_DIGEST_INSTRUCTIONS, caller="review_digest")
+    if not isinstance(result, dict) or result.get("error") is True:
+        return result
+
+    return _normalize_daily_digest(result, len(reviews))
+
+
+def reduce_digests(digests: Iterable[dict]) -> dict:
+    """
+    일자별 digest 를 합산해서 기간 digest 를 만든다. (LLM 호출 없음)
+    digests 는 최신 일자가 먼저 오도록 넘긴다. (quotes 는 최신 순으로 채움)
+    """
+    merged = _empty_digest()
+    merged["days"] = 0
+
+    counters: dict[str, Counter[str]] = {
+        field: Counter()
+        for field in ("themes", "strengths", "pains", "positive_keywords", "negative_keywords")
+    }
+
+    for digest in digests:
+        if not digest:
+            continue
+        merged["days"] += 1
+        merged["review_count"] += _to_int(digest.get("review_count"))
+
+        for name, value in (digest.get("sentiment") or {}).items():
+            if name in merged["sentiment"]:
+                merged["sentiment"][name] += _to_int(value)
+
+        for field in ("themes", "strengths", "pains"):
+            for item in digest.get(field) or []:
+                counters[field][item["label"]] += _to_int(item.get("count"))
+        for field in ("positive_keywords", "negative_keywords"):
+            for item in digest.get(field) or []:
+                counters[field][item["text"]] += _to_int(item.get("weight"))
+
+        for quote in digest.get("quotes") or []:
+            if len(merged["quotes"]) < REDUCED_QUOTE_LIMIT:
+                merged["quotes"].append(quote)
+
+    for field in ("themes", "strengths", "pains"):
+        merged[field] = [
+            {"label": label, "count": count}
+            for label, count in counters[field].most_common(REDUCED_ITEM_LIMIT)
+        ]
+    for field in ("positive_keywords", "negative_keywords"):
+        merged[field] = [
+            {"text": text, "weight": weight}
+            for text, weight in counters[field].most_common(REDUCED_KEYWORD_LIMIT)
+        ]
+
+    return merged
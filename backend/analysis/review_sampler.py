@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+import math
+import os
+from datetime import datetime
+from typing import Any
+
+from backend.analysis.review_dedupe import dedupe_reviews, format_weighted_review
+from backend.analysis.tokens import count_tokens, truncate_tokens
+
+# 프롬프트에 넣을 리뷰 본문 토큰 예산 (프롬프트 크기를 기간과 무관하게 고정)
+CX_SAMPLE_TOKEN_BUDGET = int(os.getenv("CX_SAMPLE_TOKEN_BUDGET", "6000"))
+BASIC_SAMPLE_TOKEN_BUDGET = int(os.getenv("BASIC_SAMPLE_TOKEN_BUDGET", "2500"))
+TIME_SLICES = int(os.getenv("REVIEW_SAMPLE_TIME_SLICES", "4"))
+# 리뷰 1건 최대 토큰 (긴 리뷰 1건이 예산을 다 쓰지 않게)
+MAX_REVIEW_TOKENS = int(os.getenv("REVIEW_SAMPLE_MAX_REVIEW_TOKENS", "200"))
+# 층별 헤더 줄("### 기간 | 별점 | 전체 N건 중 표본 M줄") 몫으로 미리 빼 두는 토큰
+HEADER_TOKEN_RESERVE = 30
+
+RATING_BUCKETS = (
+    ("★4-5", lambda r: r is not None and r >= 4),
+    ("★3", lambda r: r == 3),
+    ("★1-2", lambda r: r is not None and r <= 2),
+    ("별점없음", lambda r: r is None),
+)
+
+
+def _rating_bucket(rating: Any) -> str:
+    try:
+        rating = int(rating) if rating is not None else None
+    except (TypeError, ValueError):
+        rating = None
+    for name, match in RATING_BUCKETS:
+        if match(rating):
+            return name
+    return "별점없음"
+
+
+def _time_slices(timestamps: list[datetime], slices: int) -> list[tuple[datetime, datetime]]:
+    start, end = min(timestamps), max(timestamps)
+    if slices <= 1 or start == end:
+        return [(start, end)]
+    step = (end - start) / slices
+    return [(start + step * i, start + step * (i + 1)) for i in range(slices)]
+
+
+def _slice_index(ts: datetime, bounds: list[tuple[datetime, datetime]]) -> int:
+    for index, (_, end) in enumerate(bounds):
+        if ts <= end:
+            return index
+    return len(bounds) - 1
+
+
+def _informativeness(item: dict) -> float:
+    # 길고(정보량) 반복 언급된(대표성) 리뷰 우선
+    return min(count_tokens(item["text"]), MAX_REVIEW_TOKENS) * (1 + math.log(item["count"]))
+
+
+def _truncate(text: str) -> str:
+    return truncate_tokens(text.strip(), MAX_REVIEW_TOKENS)
+
+
+def stratified_sample(
+    reviews: list[dict[str, Any]] | list[str],
+    token_budget: int = CX_SAMPLE_TOKEN_BUDGET,
+    time_slices: int = TIME_SLICES,
+) -> dict[str, Any]:
+    """
+    별점 구간 × 기간 구간으로 층화해서 token_budget 안에 들어가는 대표 리뷰를 고른다.
+
+    reviews: [{"text": str, "rating": int | None, "created_at": datetime | None}, ...] 또는 텍스트 목록
+    - 층(stratum)별 예산 = 절반은 리뷰 수 비례 + 절반은 균등 (적은 부정 리뷰 구간도 표본 확보)
+    - 층 안에서는 거의 같은 리뷰를 묶고(×N) 길고 반복된 리뷰부터 채운다
+    - 남은 예산은 다른 층에 다시 배분
+
+    반환: {"text": 프롬프트용 본문, "strata": [층별 전체/표본 수], "total": 전체 리뷰 수, "tokens": 본문 토큰 수}
+    """
+    records = [
+        r if isinstance(r, dict) else {"text": r}
+        for r in reviews
+    ]
+    records = [r for r in records if r.get("text") and r["text"].strip()]
+    if not records:
+        return {"text": "", "strata": [], "total": 0, "tokens": 0}
+
+    timestamps = [r["created_at"] for r in records if r.get("created_at")]
+    bounds = _time_slices(timestamps, time_slices) if timestamps else []
+
+    # 1) 층 나누기
+    strata: dict[tuple[int, str], list[str]] = {}
+    for r in records:
+        slice_index = _slice_index(r["created_at"], bounds) if bounds and r.get("created_at") else -1
+        strata.setdefault((slice_index, _rating_bucket(r.get("rating"))), []).append(r["text"])
+
+    # 2) 층별 후보 (중복 묶기 + 정보량 순 정렬)
+    candidates: dict[tuple[int, str], list[dict]] = {}
+    for key, texts in strata.items():
+        items, _ = dedupe_reviews(texts)
+        candidates[key] = sorted(items, key=_informativeness, reverse=True)
+
+    # 3) 예산 배분 후 채우기 (남은 예산은 다음 라운드에서 재배분)
+    total = len(records)
+    picked: dict[tuple[int, str], list[str]] = {key: [] for key in strata}
+    cursor = {key: 0 for key in strata}
+    # 헤더 몫은 예산의 절반까지만 (작은 예산에서 본문 예산이 0 이하가 되지 않게)
+    header_reserve = min(HEADER_TOKEN_RESERVE * len(strata), token_budget // 2)
+    remaining = token_budget - header_reserve
+
+    while remaining > 0:
+        active = [key for key in strata if cursor[key] < len(candidates[key])]
+        if not active:
+            break
+
+        active_total = sum(len(strata[key]) for key in active)
+        spent = 0
+        for key in active:
+            share = remaining * (0.5 * len(strata[key]) / active_total + 0.5 / len(active))
+            used = 0
+            while cursor[key] < len(candidates[key]):
+                item = candidates[key][cursor[key]]
+                line = format_weighted_review(_truncate(item["text"]), item["count"])
+                cost = count_tokens(line) + 1
+                if used + cost > share and (used > 0 or cost > remaining - spent):
+                    break
+                picked[key].append(line)
+                cursor[key] += 1
+                used += cost
+            spent += used
+
+        if spent == 0:
+            break
+        remaining -= spent
+
+    # 예산이 너무 작아 한 줄도 못 넣었으면 가장 큰 층의 대표 리뷰 1건을 예산에 맞게 잘라서 넣는다
+    if not any(picked.values()):
+        key = max(strata, key=lambda k: len(strata[k]))
+        item = candidates[key][0]
+        budget = max(token_budget - header_reserve - 1, 1)
+        picked[key].append(format_weighted_review(truncate_tokens(item["text"].strip(), budget), item["count"]))
+
+    # 4) 층별 헤더 + 본문 (기간 순 → 별점 구간 순)
+    bucket_order = {name: i for i, (name, _) in enumerate(RATING_BUCKETS)}
+    sections = []
+    summary = []
+    for key in sorted(strata, key=lambda k: (k[0], bucket_order[k[1]])):
+        slice_index, bucket = key
+        if slice_index >= 0:
+            start, end = bounds[slice_index]
+            period = f"{start.date().isoformat()}~{end.date().isoformat()}"
+        else:
+            period = "전체 기간"
+
+        summary.append({
+            "period": period,
+            "rating_bucket": bucket,
+            "total": len(strata[key]),
+            "sampled_lines": len(picked[key]),
+        })
+        if picked[key]:
+            sections.append(
+                f"### {period} | {bucket} | 전체 {len(strata[key])}건 중 표본 {len(picked[key])}줄\n"
+                + "\n".join(picked[key])
+            )
+
+    text = "\n\n".join(sections)
+    tokens = count_tokens(text)
+    print(
+        f"[sampler] reviews={total} strata={len(strata)} "
+        f"lines={sum(len(lines) for lines in picked.values())} tokens={tokens}/{token_budget}"
+    )
+    return {"text": text, "strata": summary, "total": total, "tokens": tokens}
+
+
+def format_strata_table(sample: dict[str, Any]) -> str:
+    """
+    프롬프트용 층별 전체 리뷰 수 표
+    """
+    lines = [f"- {s['period']} | {s['rating_bucket']}: 전체 {s['total']}건" for s in sample["strata"]]
+    return f"전체 리뷰 {sample['total']}건\n" + "\n".join(lines)
@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import math
+import os
+import threading
+from functools import lru_cache
+
+try:
+    import tiktoken
+except ImportError:  # tiktoken 미설치 시 문자 수 기반 추정
+    tiktoken = None
+
+TOKEN_ENCODING = "o200k_base"  # gpt-4o / gpt-4o-mini 계열
+# "estimate" 면 tiktoken 을 쓰지 않고 항상 추정치 (오프라인 벤치마크 / tiktoken 없는 환경 재현용)
+TOKEN_COUNTER_ENV = "TOKEN_COUNTER"
+
+# 같은 리뷰/헤더를 여러 번 세는 경우가 많아서 짧은 텍스트만 캐시 (긴 본문은 캐시하지 않음)
+TOKEN_CACHE_SIZE = 8192
+TOKEN_CACHE_MAX_CHARS = 2000
+
+_encoding = None
+_encoding_failed = False
+_encoding_lock = threading.Lock()
+
+
+def _get_encoding():
+    """
+    tiktoken 인코딩. 처음 쓸 때 BPE 파일을 내려받으므로 (TIKTOKEN_CACHE_DIR 에 미리 받아 두면 네트워크 불필요)
+    오프라인 등으로 실패하면 한 번만 로그를 남기고 이후에는 추정치를 쓴다.
+    """
+    global _encoding, _encoding_failed
+    if _encoding is not None or _encoding_failed or tiktoken is None:
+        return _encoding
+    if os.getenv(TOKEN_COUNTER_ENV) == "estimate":
+        return None
+    with _encoding_lock:
+        if _encoding is None and not _encoding_failed:
+            try:
+                _encoding = tiktoken.get_encoding(TOKEN_ENCODING)
+            except Exception as exc:
+                _encoding_failed = True
+                print(f"[tokens] tiktoken 인코딩 로드 실패 → 추정치 사용: {exc}")
+    return _encoding
+
+
+def estimate_tokens(text: str) -> int:
+    hangul = sum(1 for ch in text if "가" <= ch <= "힣")
+    return math.ceil(hangul / 1.3 + (len(text) - hangul) / 4)
+
+
+def _count_tokens(text: str) -> int:
+    encoding = _get_encoding()
+    if encoding is not None:
+        return len(encoding.encode(text, disallowed_special=()))
+    return estimate_tokens(text)
+
+
+_count_tokens_cached = lru_cache(maxsize=TOKEN_CACHE_SIZE)(_count_tokens)
+
+
+def count_tokens(text: str) -> int:
+    """
+    프롬프트 토큰 수. tiktoken 이 있으면 정확히, 없으면 추정치
+    (한글 1.3자당 1토큰, 그 외 4자당 1토큰)
+    """
+    if not text:
+        return 0
+    if len(text) <= TOKEN_CACHE_MAX_CHARS:
+        return _count_tokens_cached(text)
+    return _count_tokens(text)
+
+
+def get_token_cache_stats() -> dict:
+    info = _count_tokens_cached.cache_info()
+    return {"hits": info.hits, "misses": info.misses, "size": info.currsize}
+
+
+def truncate_tokens(text: str, max_tokens: int, suffix: str = "…") -> str:
+    """
+    text 를 max_tokens 토큰 이하로 자른다. (잘린 경우 suffix 를 붙이고 suffix 토큰도 예산에 포함)
+    """
+    if not text or max_tokens <= 0:
+        return ""
+    if count_tokens(text) <= max_tokens:
+        return text
+
+    budget = max(max_tokens - count_tokens(suffix), 1)
+    encoding = _get_encoding()
+    if encoding is not None:
+        tokens = encoding.encode(text, disallowed_special=())
+        return encoding.decode(tokens[:budget]).rstrip() + suffix
+
+    # 추정 모드: 비율로 먼저 자른 뒤 넘치면 조금씩 줄인다
+    end = max(int(len(text) * budget / estimate_tokens(text)), 1)
+    while end > 1 and estimate_tokens(text[:end]) > budget:
+        end = min(end - 1, int(end * 0.95))
+    return text[:end].rstrip() + suffix
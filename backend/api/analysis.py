@@ -1,9 +1,17 @@
+from typing import Any, Iterator
+
 from fastapi import APIRouter, UploadFile, File, Depends, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
 
+from backend.core.serialization import dumps_str
 from backend.db.session import get_db
-from backend.service.analysis_service import analyze_store_cx_by_period, analyze_file_sentiment
+from backend.service.analysis_service import (
+    analyze_store_cx_by_period,
+    analyze_file_sentiment,
+    stream_store_cx_by_period,
+)
 
 router = APIRouter(
     prefix="/analysis",
@@ -13,9 +21,10 @@ router = APIRouter(
 
 @router.post("/file")
 async def analyze_file(
-    file: UploadFile = File(...)
+    file: UploadFile = File(...),
+    llm: bool = Query(True, description="False 면 LLM 없이 로컬 감성/키워드 집계만 반환"),
 ):
-    return await analyze_file_sentiment(file)
+    return await analyze_file_sentiment(file, use_llm=llm)
 
 
 @router.post("/cx-analysis")
@@ -35,4 +44,36 @@ def analyze_cx_dashboard_api(
         from_date=from_date,
         to_date=to_date,
         db=db,
-    )
\ No newline at end of file
+    )
+
+
+def _sse(events: Iterator[tuple[str, Any]]) -> Iterator[str]:
+    for event, data in events:
+        yield f"event: {event}\ndata: {dumps_str(data)}\n\n"
+
+
+@router.post("/cx-analysis/stream")
+def stream_cx_dashboard_api(
+    store_id: str = Query(..., description="store_id"),
+    from_date: str = Query(..., alias="from"),
+    to_date: str = Query(..., alias="to"),
+    db: Session = Depends(get_db),
+):
+    """
+    📊 CX 대시보드 분석 (Server-Sent Events)
+    - event: meta    → 리뷰 수 / 별점 분포
+    - event: section → {"name", "data"} LLM 섹션이 완성될 때마다
+    - event: done    → /cx-analysis 와 같은 최종 응답
+    - event: error   → LLM 실패
+    """
+    events = stream_store_cx_by_period(
+        store_id=store_id,
+        from_date=from_date,
+        to_date=to_date,
+        db=db,
+    )
+    return StreamingResponse(
+        _sse(events),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -1,12 +1,22 @@
 from __future__ import annotations
 
 import os
+from typing import List, Optional
 
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 
 from backend.db.session import get_db
-from backend.service.review_signal_service import run_analyze_reviews_batch
+from backend.service.review_annotation_service import (
+    ANNOTATION_CHUNK_SIZE,
+    run_annotate_reviews_batch,
+)
+from backend.service.review_signal_service import (
+    CLAIM_CHUNK_SIZE,
+    list_dead_letter_reviews,
+    requeue_dead_letter_reviews,
+    run_analyze_reviews_batch,
+)
 
 router = APIRouter(prefix="/batch", tags=["batch"])
 
@@ -32,6 +42,8 @@ def batch_status(secret: str = Query(...), _: None = Depends(_verify_secret)):
 def trigger_analyze_reviews(
     tenant_id: int = Query(..., description="대상 tenant_id"),
     store_id: str = Query(default="store_7", description="대상 store_id"),
+    chunk_size: int = Query(default=CLAIM_CHUNK_SIZE, ge=1, le=500, description="한 번에 점유할 리뷰 수"),
+    worker_id: Optional[str] = Query(default=None, description="lease 소유자 식별자 (미지정 시 자동 생성)"),
     _: None = Depends(_verify_secret),
     db: Session = Depends(get_db),
 ):
@@ -39,11 +51,18 @@ def trigger_analyze_reviews(
     google_reviews (is_analyzed='N') → signals + notifications 적재 배치.
 
     GitHub Actions에서 하루 1회 호출.
+    chunk 단위 lease 점유 방식이라 여러 워커가 동시에 호출해도 된다.
     실패 건이 있어도 200 반환 (failed 카운트로 확인).
     전체 배치 자체가 실패하면 500 반환.
     """
     try:
-        stats = run_analyze_reviews_batch(db=db, store_id=store_id, tenant_id=tenant_id)
+        stats = run_analyze_reviews_batch(
+            db=db,
+            store_id=store_id,
+            tenant_id=tenant_id,
+            worker_id=worker_id,
+            chunk_size=chunk_size,
+        )
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"배치 실행 중 오류 발생: {e}")
 
@@ -53,3 +72,73 @@ def trigger_analyze_reviews(
         "tenant_id": tenant_id,
         "result": stats,
     }
+
+
+@router.post("/trigger/annotate-reviews")
+def trigger_annotate_reviews(
+    store_id: Optional[str] = Query(default=None, description="대상 store_id (미지정 시 전체)"),
+    chunk_size: int = Query(default=ANNOTATION_CHUNK_SIZE, ge=1, le=100, description="LLM 1회당 리뷰 수"),
+    max_reviews: Optional[int] = Query(default=None, ge=1, description="이번 실행에서 처리할 최대 리뷰 수"),
+    _: None = Depends(_verify_secret),
+    db: Session = Depends(get_db),
+):
+    """
+    review_annotations 가 없는 리뷰를 annotation 하는 배치.
+    리뷰 동기화 직후 백그라운드로도 돌지만, 누락/실패분 보충용으로 주기 호출한다.
+    """
+    try:
+        stats = run_annotate_reviews_batch(
+            db,
+            store_id=store_id,
+            chunk_size=chunk_size,
+            max_reviews=max_reviews,
+        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"배치 실행 중 오류 발생: {e}")
+
+    return {
+        "status": "completed",
+        "store_id": store_id,
+        "result": stats,
+    }
+
+
+@router.get("/dead-letter")
+def get_dead_letter_reviews(
+    store_id: Optional[str] = Query(default=None, description="대상 store_id (미지정 시 전체)"),
+    limit: int = Query(default=100, ge=1, le=1000),
+    _: None = Depends(_verify_secret),
+    db: Session = Depends(get_db),
+):
+    """
+    재시도 예산을 소진해 분석에서 제외된(is_analyzed='D') 리뷰 목록.
+    """
+    items = list_dead_letter_reviews(db, store_id=store_id, limit=limit)
+    return {
+        "store_id": store_id,
+        "count": len(items),
+        "items": items,
+    }
+
+
+@router.post("/dead-letter/requeue")
+def requeue_dead_letter(
+    id: Optional[List[int]] = Query(default=None, description="재투입할 google_reviews.id (여러 번 지정 가능)"),
+    store_id: Optional[str] = Query(default=None, description="id 미지정 시 해당 store 의 dead-letter 전체 재투입"),
+    all_stores: bool = Query(default=False, alias="all", description="id / store_id 없이 모든 store 의 dead-letter 재투입"),
+    _: None = Depends(_verify_secret),
+    db: Session = Depends(get_db),
+):
+    """
+    dead-letter 리뷰를 재시도 예산을 초기화해서 다시 분석 대기('N')로 돌린다.
+    id, store_id, all=true 중 하나는 지정해야 한다.
+    """
+    try:
+        requeued_ids = requeue_dead_letter_reviews(db, ids=id, store_id=store_id, all_stores=all_stores)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    return {
+        "status": "ok",
+        "requeued_count": len(requeued_ids),
+        "requeued_ids": requeued_ids,
+    }
@@ -1,21 +1,22 @@
 from fastapi import APIRouter, Depends, Query
-from sqlalchemy.orm import Session
-from sqlalchemy import func, case
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import func, case, select
 from datetime import datetime
 
-from backend.db.session import get_db
+from backend.core.responses import FastJSONResponse
+from backend.db.session import get_async_read_db
 from backend.db.models import GoogleReview
 from backend.service.churn import calculate_churn_score, churn_level
 
 router = APIRouter()
 
 
-@router.get("/stores/{store_id}/customers")
-def list_customers(
+@router.get("/stores/{store_id}/customers", response_class=FastJSONResponse)
+async def list_customers(
     store_id: str,
     page: int = Query(1, ge=1),
     limit: int = Query(20, le=100),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_read_db),
 ):
     """
     특정 매장의 리뷰를 기준으로 고객(리뷰 작성자) 목록 + 이탈 위험도 조회
@@ -25,14 +26,13 @@ def list_customers(
     offset = (page - 1) * limit
 
     # 전체 고객 수 계산
-    total_customers = (
-        db.query(func.count(func.distinct(GoogleReview.author_name)))
-        .filter(GoogleReview.store_id == store_id)
-        .scalar()
+    total_customers = await db.scalar(
+        select(func.count(func.distinct(GoogleReview.author_name)))
+        .where(GoogleReview.store_id == store_id)
     )
 
-    rows = (
-        db.query(
+    rows = (await db.execute(
+        select(
             GoogleReview.author_name.label("author_name"),
             func.count().label("review_count"),
             func.avg(GoogleReview.rating).label("avg_rating"),
@@ -47,13 +47,12 @@ def list_customers(
                 / func.count()
             ).label("negative_ratio"),
         )
-        .filter(GoogleReview.store_id == store_id)
+        .where(GoogleReview.store_id == store_id)
         .group_by(GoogleReview.author_name)
         .order_by(func.max(GoogleReview.created_at_google).desc())
         .limit(limit)
         .offset(offset)
-        .all()
-    )
+    )).all()
 
     customers = []
     churn_scores = []
@@ -93,11 +92,11 @@ def list_customers(
         else 0
     )
 
-    return {
+    return FastJSONResponse({
         "total_customers": total_customers,
         "high_risk": high_risk,
         "average_satisfaction": avg_satisfaction,
         "page": page,
         "limit": limit,
         "customers": customers,
-    }
\ No newline at end of file
+    })
\ No newline at end of file
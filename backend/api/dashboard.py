@@ -5,7 +5,7 @@ from sqlalchemy.orm import Session
 from datetime import date
 from typing import Literal
 
-from backend.db.session import get_db
+from backend.db.session import get_read_db
 from backend.service.dashboard_service import get_rating_trend
 
 router = APIRouter(
@@ -17,10 +17,10 @@ router = APIRouter(
 @router.get("/rating-trend")
 def rating_trend(
     store_id: str = Query(..., description="Google store_id"),
-    unit: Literal["day", "month"] = Query("day"),
+    unit: Literal["day", "week", "month"] = Query("day"),
     from_date: date | None = Query(None, alias="from"),
     to_date: date | None = Query(None, alias="to"),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
     """
     평점 추이 API
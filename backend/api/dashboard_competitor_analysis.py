@@ -1,32 +1,45 @@
-from fastapi import APIRouter, Depends, Query
+from datetime import date
+
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy import text
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from backend.db.session import get_db
+from backend.core.responses import FastJSONResponse
+from backend.db.session import get_async_read_db
 
 router = APIRouter(prefix="/dashboard", tags=["dashboard"])
 
 
-@router.get("/competitor-analysis")
-def get_competitor_analysis_dashboard(
+def _to_date(value: str | None) -> date | None:
+    # asyncpg 는 cast(:x as date) 파라미터에 문자열을 넘기면 거부하므로 date 로 변환해서 바인딩
+    if not value:
+        return None
+    try:
+        return date.fromisoformat(value[:10])
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"잘못된 날짜 형식입니다: {value}")
+
+
+@router.get("/competitor-analysis", response_class=FastJSONResponse)
+async def get_competitor_analysis_dashboard(
     tenant_id: int = Query(...),
     # 시작일: 프론트에서 ?from=2026-01-01 형태로 들어옴
     from_date: str | None = Query(None, alias="from"),
     # 종료일: 프론트에서 ?to=2026-03-31 형태로 들어옴
     to_date: str | None = Query(None, alias="to"),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_read_db),
 ):
     # 모든 SQL에서 공통으로 쓰는 파라미터
     params = {
         "tenant_id": tenant_id,
-        "from_date": from_date,
-        "to_date": to_date,
+        "from_date": _to_date(from_date),
+        "to_date": _to_date(to_date),
     }
 
     # KPI
     # - tenant_id 기준 조회
     # - detected_at이 기간 안에 들어오는 데이터만 집계
-    kpi_row = db.execute(
+    kpi_row = (await db.execute(
         text("""
             select
                 count(*) filter (where signal_type = 'RISK') as issue_hit_count,
@@ -38,12 +51,12 @@ def get_competitor_analysis_dashboard(
               and (:to_date is null or detected_at < cast(:to_date as date) + interval '1 day')
         """),
         params,
-    ).mappings().first()
+    )).mappings().first()
 
     # 키워드 히트 현황
     # - RISK 타입만
     # - 기간 안의 데이터만 집계
-    keyword_hits = db.execute(
+    keyword_hits = (await db.execute(
         text("""
             select
                 signal_keyword as keyword,
@@ -69,12 +82,12 @@ def get_competitor_analysis_dashboard(
             limit 20
         """),
         params,
-    ).mappings().all()
+    )).mappings().all()
 
     # 경쟁사 상세 리스트
     # - RISK 타입만
     # - 기간 필터도 같이 적용
-    competitor_details = db.execute(
+    competitor_details = (await db.execute(
         text("""
             select
                 signal_keyword as keyword,
@@ -102,9 +115,9 @@ def get_competitor_analysis_dashboard(
             limit 30
         """),
         params,
-    ).mappings().all()
+    )).mappings().all()
 
-    return {
+    return FastJSONResponse({
         "tenant_id": tenant_id,
         "kpis": {
             "issue_hit_count": int(kpi_row["issue_hit_count"] or 0),
@@ -134,4 +147,4 @@ def get_competitor_analysis_dashboard(
             }
             for row in competitor_details
         ],
-    }
\ No newline at end of file
+    })
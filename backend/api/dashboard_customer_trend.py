@@ -1,20 +1,33 @@
-from fastapi import APIRouter, Depends, Query
+from datetime import date
+
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy import text
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from backend.db.session import get_db
+from backend.core.responses import FastJSONResponse
+from backend.db.session import get_async_read_db
 
 router = APIRouter(prefix="/dashboard", tags=["dashboard"])
 
 
-@router.get("/customer-trend")
-def get_customer_trend_dashboard(
+def _to_date(value: str | None) -> date | None:
+    # asyncpg 는 cast(:x as date) 파라미터에 문자열을 넘기면 거부하므로 date 로 변환해서 바인딩
+    if not value:
+        return None
+    try:
+        return date.fromisoformat(value[:10])
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"잘못된 날짜 형식입니다: {value}")
+
+
+@router.get("/customer-trend", response_class=FastJSONResponse)
+async def get_customer_trend_dashboard(
     tenant_id: int = Query(...),
     # 프론트에서 ?from=2026-01-01 형태로 들어옴
     from_date: str | None = Query(None, alias="from"),
     # 프론트에서 ?to=2026-03-31 형태로 들어옴
     to_date: str | None = Query(None, alias="to"),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_read_db),
 ):
     print("[customer-trend] tenant_id =", tenant_id)
     print("[customer-trend] from_date =", from_date)
@@ -22,14 +35,14 @@ def get_customer_trend_dashboard(
 
     params = {
         "tenant_id": tenant_id,
-        "from_date": from_date,
-        "to_date": to_date,
+        "from_date": _to_date(from_date),
+        "to_date": _to_date(to_date),
     }
 
     # ------------------------------------------------------------
     # 1) 상단 KPI
     # ------------------------------------------------------------
-    kpi_row = db.execute(
+    kpi_row = (await db.execute(
         text("""
             select
                 count(*) as signal_hit_count,
@@ -44,13 +57,13 @@ def get_customer_trend_dashboard(
               and (:to_date is null or detected_at < cast(:to_date as date) + interval '1 day')
         """),
         params,
-    ).mappings().first()
+    )).mappings().first()
 
     # ------------------------------------------------------------
     # 2) 순위표용 키워드 히트 현황
     #    - 사용자가 선택한 기간 기준
     # ------------------------------------------------------------
-    keyword_hits = db.execute(
+    keyword_hits = (await db.execute(
         text("""
             select
                 signal_keyword as keyword,
@@ -67,7 +80,7 @@ def get_customer_trend_dashboard(
             limit 20
         """),
         params,
-    ).mappings().all()
+    )).mappings().all()
 
     # ------------------------------------------------------------
     # 3) 일별 추이용 데이터
@@ -75,7 +88,7 @@ def get_customer_trend_dashboard(
     #    - 실제 감지된 키워드만 날짜별 count
     #    - 순위표 기준과 맞추기 위해 keyword/category/level 조합 유지
     # ------------------------------------------------------------
-    daily_trend = db.execute(
+    daily_trend = (await db.execute(
         text("""
             select
                 to_char(detected_at::date, 'YYYY-MM-DD') as bucket_date,
@@ -91,14 +104,14 @@ def get_customer_trend_dashboard(
             order by bucket_date asc, keyword asc, category asc, level asc
         """),
         {"tenant_id": tenant_id},
-    ).mappings().all()
+    )).mappings().all()
 
     # ------------------------------------------------------------
     # 4) 월별 추이용 데이터
     #    - 오늘 기준 최근 6개월
     #    - HIGH / MEDIUM / LOW 총 건수 집계
     # ------------------------------------------------------------
-    monthly_trend = db.execute(
+    monthly_trend = (await db.execute(
         text("""
             select
                 to_char(date_trunc('month', detected_at), 'YYYY-MM') as bucket_month,
@@ -112,12 +125,12 @@ def get_customer_trend_dashboard(
             order by bucket_month asc
         """),
         {"tenant_id": tenant_id},
-    ).mappings().all()
+    )).mappings().all()
 
     # ------------------------------------------------------------
     # 5) 신규 영업기회 카드
     # ------------------------------------------------------------
-    opportunity_cards = db.execute(
+    opportunity_cards = (await db.execute(
         text("""
             select
                 company_name,
@@ -147,9 +160,9 @@ def get_customer_trend_dashboard(
             limit 20
         """),
         params,
-    ).mappings().all()
+    )).mappings().all()
 
-    return {
+    return FastJSONResponse({
         "tenant_id": tenant_id,
         "kpis": {
             "signal_hit_count": int(kpi_row["signal_hit_count"] or 0),
@@ -190,4 +203,4 @@ def get_customer_trend_dashboard(
             }
             for row in opportunity_cards
         ],
-    }
\ No newline at end of file
+    })
@@ -6,7 +6,6 @@ import pprint
 from fastapi import APIRouter, Request, Depends, HTTPException
 from fastapi.responses import RedirectResponse
 from sqlalchemy.orm import Session
-from google_auth_oauthlib.flow import Flow
 
 from backend.db.session import get_db
 from backend.db.models import OAuthAccount
@@ -39,6 +38,8 @@ def connect_google_business(request: Request):
         str(request.base_url).rstrip("/") + CALLBACK_PATH
     )
 
+    from google_auth_oauthlib.flow import Flow
+
     flow = Flow.from_client_secrets_file(
         CLIENT_SECRET_FILE,
         scopes=SCOPES,
@@ -82,6 +83,8 @@ def google_business_callback(
         str(request.base_url).rstrip("/") + CALLBACK_PATH
     )
 
+    from google_auth_oauthlib.flow import Flow
+
     flow = Flow.from_client_secrets_file(
         CLIENT_SECRET_FILE,
         scopes=SCOPES,
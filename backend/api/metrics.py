@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import os
+
+from fastapi import APIRouter, Header, HTTPException
+from fastapi.responses import PlainTextResponse
+
+from backend.analysis.llm_resilience import get_resilience_stats
+from backend.analysis.llm_scheduler import get_scheduler_stats
+from backend.analysis.tokens import get_token_cache_stats
+from backend.core import metrics
+from backend.core.responses import get_response_stats
+
+router = APIRouter(tags=["metrics"])
+
+# 설정하면 Authorization: Bearer <METRICS_TOKEN> 인 요청만 허용
+METRICS_TOKEN = os.getenv("METRICS_TOKEN")
+
+# 현재 상태 값(get_*_stats)은 스냅샷 직전에 gauge 로, 누적 값은 counter(set_total) 로 옮긴다.
+# 워커 간 합산해도 의미가 있는 값만 둔다
+LLM_SCHEDULER_QUEUED = metrics.gauge("llm_scheduler_queued", "LLM 스케줄러 대기 중인 호출 수", ["workload"])
+LLM_SCHEDULER_ACTIVE = metrics.gauge("llm_scheduler_active", "LLM 스케줄러 실행 중인 호출 수", ["workload"])
+LLM_SCHEDULER_ADMITTED = metrics.counter("llm_scheduler_admitted_total", "LLM 스케줄러 실행 허가 수", ["workload"])
+LLM_SCHEDULER_TIMEOUTS = metrics.counter("llm_scheduler_timeouts_total", "LLM 스케줄러 대기 시간 초과 수", ["workload"])
+LLM_SCHEDULER_WAIT_SECONDS = metrics.counter("llm_scheduler_wait_seconds_total", "LLM 스케줄러 대기 시간 합계", ["workload"])
+LLM_BREAKER_OPEN = metrics.gauge("llm_breaker_open", "circuit breaker 가 열린 워커 수", ["endpoint"])
+HTTP_RESPONSE_BYTES = metrics.gauge("http_response_bytes", "응답 본문 누적 바이트 (kind: raw / sent)", ["kind"])
+TOKEN_CACHE_LOOKUPS = metrics.gauge("token_count_cache_lookups", "count_tokens 캐시 누적 조회 수", ["result"])
+
+
+def _collect_llm() -> None:
+    for workload, stats in get_scheduler_stats().items():
+        LLM_SCHEDULER_QUEUED.set(stats["queued"], workload=workload)
+        LLM_SCHEDULER_ACTIVE.set(stats["active"], workload=workload)
+        LLM_SCHEDULER_ADMITTED.set_total(stats["admitted"], workload=workload)
+        LLM_SCHEDULER_TIMEOUTS.set_total(stats["timeouts"], workload=workload)
+        LLM_SCHEDULER_WAIT_SECONDS.set_total(stats["wait_seconds"], workload=workload)
+    for endpoint, stats in get_resilience_stats()["endpoints"].items():
+        LLM_BREAKER_OPEN.set(1 if stats["breaker"] == "open" else 0, endpoint=endpoint)
+
+
+def _collect_process() -> None:
+    responses = get_response_stats()
+    HTTP_RESPONSE_BYTES.set(responses["bytes_raw"], kind="raw")
+    HTTP_RESPONSE_BYTES.set(responses["bytes_sent"], kind="sent")
+    tokens = get_token_cache_stats()
+    TOKEN_CACHE_LOOKUPS.set(tokens["hits"], result="hit")
+    TOKEN_CACHE_LOOKUPS.set(tokens["misses"], result="miss")
+
+
+metrics.register_collector(_collect_llm)
+metrics.register_collector(_collect_process)
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+def get_metrics(authorization: str | None = Header(default=None)):
+    """
+    Prometheus text format. REDIS_URL 이 있으면 모든 워커 합산 (core.metrics 참고)
+    """
+    if METRICS_TOKEN and authorization != f"Bearer {METRICS_TOKEN}":
+        raise HTTPException(status_code=401, detail="metrics token 이 필요합니다.")
+
+    return PlainTextResponse(
+        metrics.render_metrics(),
+        media_type="text/plain; version=0.0.4; charset=utf-8",
+    )
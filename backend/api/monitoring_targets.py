@@ -2,9 +2,10 @@ from typing import Optional
 
 from fastapi import APIRouter, Depends, Query
 from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from backend.db.session import get_db
+from backend.db.session import get_async_db, get_db
 from backend.service.monitoring_target_service import collect_monitoring_targets_from_news
 from backend.service.monitoring_target_sync_service import (
     sync_industry_targets_to_monitoring_targets,
@@ -15,12 +16,12 @@ router = APIRouter(prefix="/monitoring-targets", tags=["monitoring-targets"])
 
 
 @router.get("/list")
-def get_monitoring_targets(
+async def get_monitoring_targets(
     tenant_id: int = Query(...),
     target_role: Optional[str] = Query(default=None),
     status: Optional[str] = Query(default=None),
     limit: int = Query(default=50, ge=1, le=200),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     sql = """
         select
@@ -66,7 +67,7 @@ def get_monitoring_targets(
         limit :limit
     """
 
-    rows = db.execute(text(sql), params).mappings().all()
+    rows = (await db.execute(text(sql), params)).mappings().all()
 
     return {
         "tenant_id": tenant_id,
@@ -4,9 +4,10 @@ from typing import Optional
 
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy import bindparam, text
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from backend.db.session import get_db
+from backend.db.session import get_async_read_db, get_db
 
 router = APIRouter(prefix="/notifications", tags=["notifications"])
 
@@ -57,12 +58,12 @@ def _fetch_group_ids(db: Session, base_row: dict) -> list[int]:
 
 
 @router.get("")
-def get_notifications(
+async def get_notifications(
     tenant_id: int = Query(default=7),
     is_read: Optional[bool] = Query(default=False),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_read_db),
 ):
-    rows = db.execute(
+    rows = (await db.execute(
         text(
             """
             SELECT
@@ -83,7 +84,7 @@ def get_notifications(
             """
         ),
         {"tenant_id": tenant_id, "is_read": is_read},
-    ).mappings().all()
+    )).mappings().all()
     return [dict(r) for r in rows]
 
 
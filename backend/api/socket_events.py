@@ -3,14 +3,26 @@ from __future__ import annotations
 import asyncio
 import json
 import os
+import time
 
 import redis.asyncio as aioredis
 
+from backend.core import metrics
 from backend.core.socket_manager import emit_new_alert
 
 
 ALERT_CHANNEL = "alert_channel"
 
+REDIS_LISTENER_LAG_SECONDS = metrics.histogram(
+    "redis_listener_lag_seconds",
+    "메시지 publish(published_at) ~ 리스너 수신까지 지연",
+    ["channel"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+)
+REDIS_LISTENER_MESSAGES = metrics.counter(
+    "redis_listener_messages_total", "리스너 수신 메시지 수", ["channel", "outcome"]
+)
+
 
 async def redis_listener() -> None:
     """
@@ -36,10 +48,16 @@ async def redis_listener() -> None:
 
                 try:
                     data = json.loads(message["data"])
+                    if data.get("published_at"):
+                        REDIS_LISTENER_LAG_SECONDS.observe(
+                            max(time.time() - float(data["published_at"]), 0.0), channel=ALERT_CHANNEL
+                        )
                     tenant_id = data.get("tenant_id", 7)
                     print(f"[Redis Listener] 메시지 수신: {data}")
                     await emit_new_alert(tenant_id, data)
+                    REDIS_LISTENER_MESSAGES.inc(channel=ALERT_CHANNEL, outcome="ok")
                 except Exception as e:
+                    REDIS_LISTENER_MESSAGES.inc(channel=ALERT_CHANNEL, outcome="error")
                     print(f"[Redis Listener] 메시지 처리 오류: {e}")
 
         except Exception as e:
@@ -1,13 +1,18 @@
-from fastapi import APIRouter, HTTPException, Depends, Query
+from fastapi import APIRouter, BackgroundTasks, HTTPException, Depends, Query
 from sqlalchemy.orm import Session
 from sqlalchemy import func
-from googleapiclient.discovery import build
 import base64
 
 from backend.service.google_review_service import sync_all_reviews_for_user
-from backend.db.session import get_db
+from backend.service.review_annotation_service import annotate_reviews_in_background
+from backend.core.responses import FastJSONResponse
+from backend.db.session import get_db, get_read_db
 from backend.db.models import GoogleReview, User
-from backend.collectors.business_profile_client import load_credentials
+from backend.collectors.business_profile_client import (
+    build_service,
+    list_locations,
+    load_credentials,
+)
 # from backend.api.auth import get_current_user
 from backend.service.customer_service import get_store_customers_by_period
 
@@ -52,27 +57,16 @@ def list_stores(
     print("SESSION USER EMAIL:", current_user.email)
     print("======================================\n")
 
-    creds = load_credentials(
+    listing = list_locations(
         user_id=current_user.id,
         db=db,
     )
 
-    print("✔ Credentials loaded successfully\n")
-
-    account_service = build(
-        "mybusinessaccountmanagement",
-        "v1",
-        credentials=creds,
-    )
-
-    accounts = (
-        account_service.accounts()
-        .list()
-        .execute()
-        .get("accounts", [])
-    )
+    accounts = listing["accounts"]
+    locations = listing["locations"]
 
     print("GOOGLE BUSINESS ACCOUNTS COUNT:", len(accounts))
+    print("LOCATIONS FOUND:", len(locations))
 
     if not accounts:
         print("❌ NO GOOGLE BUSINESS ACCOUNTS FOUND\n")
@@ -81,72 +75,61 @@ def list_stores(
             detail="연결된 Google Business 계정이 없습니다.",
         )
 
-    location_service = build(
-        "mybusinessbusinessinformation",
-        "v1",
-        credentials=creds,
-    )
+    # 전체 매장 집계를 한 번의 GROUP BY 쿼리로 조회
+    store_ids = [loc["name"] for loc in locations]
+    agg_by_store = {}
+    if store_ids:
+        agg_rows = (
+            db.query(
+                GoogleReview.store_id,
+                func.avg(GoogleReview.rating).label("avg_rating"),
+                func.count(GoogleReview.id).label("review_count"),
+            )
+            .filter(GoogleReview.store_id.in_(store_ids))
+            .group_by(GoogleReview.store_id)
+            .all()
+        )
+        agg_by_store = {row.store_id: row for row in agg_rows}
 
     results: list[dict] = []
 
-    for account in accounts:
-        account_name = account["name"]  # accounts/{accountId}
-        print("→ ACCOUNT:", account_name)
+    for loc in locations:
+        store_id = loc["name"]
+        address = loc.get("storefrontAddress", {})
+        categories = loc.get("categories", {})
 
-        locations = (
-            location_service.accounts()
-            .locations()
-            .list(parent=account_name)
-            .execute()
-            .get("locations", [])
-        )
+        agg = agg_by_store.get(store_id)
 
-        print("  LOCATIONS FOUND:", len(locations))
-
-        for loc in locations:
-            store_id = loc["name"]
-            address = loc.get("storefrontAddress", {})
-            categories = loc.get("categories", {})
+        avg_rating = (
+            round(float(agg.avg_rating), 2)
+            if agg is not None and agg.avg_rating is not None
+            else None
+        )
 
-            agg = (
-                db.query(
-                    func.avg(GoogleReview.rating).label("avg_rating"),
-                    func.count(GoogleReview.id).label("review_count"),
+        review_count = agg.review_count if agg is not None else 0
+
+        results.append({
+            "store_key": encode_store_key(store_id),
+            "store_id": store_id,
+            "name": loc.get("title"),
+            "address": " ".join(
+                filter(
+                    None,
+                    [
+                        address.get("locality"),
+                        address.get("administrativeArea"),
+                    ],
                 )
-                .filter(GoogleReview.store_id == store_id)
-                .one()
-            )
-
-            avg_rating = (
-                round(float(agg.avg_rating), 2)
-                if agg.avg_rating is not None
-                else None
-            )
-
-            review_count = agg.review_count or 0
-
-            results.append({
-                "store_key": encode_store_key(store_id),
-                "store_id": store_id,
-                "name": loc.get("title"),
-                "address": " ".join(
-                    filter(
-                        None,
-                        [
-                            address.get("locality"),
-                            address.get("administrativeArea"),
-                        ],
-                    )
-                ),
-                "category": (
-                    categories
-                    .get("primaryCategory", {})
-                    .get("displayName")
-                ),
-                "status": loc.get("openInfo", {}).get("status", "UNKNOWN"),
-                "rating": avg_rating,
-                "review_count": review_count,
-            })
+            ),
+            "category": (
+                categories
+                .get("primaryCategory", {})
+                .get("displayName")
+            ),
+            "status": loc.get("openInfo", {}).get("status", "UNKNOWN"),
+            "rating": avg_rating,
+            "review_count": review_count,
+        })
 
     print("✅ FINAL STORE COUNT:", len(results))
     print("======================================\n")
@@ -170,29 +153,41 @@ def get_store_detail(
 
     store_id = decode_store_key(store_key)
 
-    creds = load_credentials(
-        user_id=current_user.id,
-        db=db,
-    )
-
-    service = build(
-        "mybusinessbusinessinformation",
-        "v1",
-        credentials=creds,
+    # 캐시된 매장 목록에 있으면 Google API 재호출 없이 사용
+    location = next(
+        (
+            loc
+            for loc in list_locations(user_id=current_user.id, db=db)["locations"]
+            if loc["name"] == store_id
+        ),
+        None,
     )
 
-    try:
-        location = (
-            service.locations()
-            .get(name=store_id)
-            .execute()
+    if location is None:
+        creds = load_credentials(
+            user_id=current_user.id,
+            db=db,
         )
-    except Exception:
-        raise HTTPException(
-            status_code=404,
-            detail="매장 정보를 찾을 수 없습니다.",
+
+        service = build_service(
+            "mybusinessbusinessinformation",
+            "v1",
+            credentials=creds,
+            user_id=current_user.id,
         )
 
+        try:
+            location = (
+                service.locations()
+                .get(name=store_id)
+                .execute()
+            )
+        except Exception:
+            raise HTTPException(
+                status_code=404,
+                detail="매장 정보를 찾을 수 없습니다.",
+            )
+
     address = location.get("storefrontAddress", {})
     categories = location.get("categories", {})
 
@@ -262,6 +257,7 @@ def get_store_detail(
 
 @router.post("/sync-reviews")
 def sync_reviews(
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
     # current_user: User = Depends(get_current_user),
 ):
@@ -274,22 +270,28 @@ def sync_reviews(
         db=db,
     )
 
+    # 새로 들어온 리뷰는 응답 후 백그라운드에서 1회 annotation
+    if result["saved"] or result["updated"]:
+        background_tasks.add_task(annotate_reviews_in_background)
+
     return {
         "message": "리뷰 동기화 완료",
         **result,
     }
 
 
-@router.get("/{store_id}/customers")
+@router.get("/{store_id}/customers", response_class=FastJSONResponse)
 def get_store_customers(
     store_id: str,
     from_date: str | None = Query(None, alias="from"),
     to_date: str | None = Query(None, alias="to"),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
-    return get_store_customers_by_period(
-        db=db,
-        store_id=store_id,
-        from_date=from_date,
-        to_date=to_date,
+    return FastJSONResponse(
+        get_store_customers_by_period(
+            db=db,
+            store_id=store_id,
+            from_date=from_date,
+            to_date=to_date,
+        )
     )
\ No newline at end of file
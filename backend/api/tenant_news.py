@@ -3,7 +3,7 @@ from typing import Optional
 from fastapi import APIRouter, Depends, Query
 from sqlalchemy.orm import Session
 
-from backend.db.session import get_db
+from backend.db.session import get_db, get_read_db
 from backend.service.tenant_news_service import collect_b2b_tenants_news
 from sqlalchemy import text
 
@@ -21,7 +21,7 @@ def run_tenant_news_collection(
 def get_tenant_news_list(
     tenant_id: int = Query(...),
     limit: int = Query(default=20, ge=1, le=100),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
     sql = text("""
         select
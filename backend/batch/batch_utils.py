@@ -3,9 +3,31 @@ from __future__ import annotations
 import uuid
 from datetime import datetime, timedelta, timezone
 
+from backend.core import metrics
+
 
 VALID_PERIOD_TYPES = {"1D", "7D", "30D", "90D", "365D"}
 
+# 배치 작업 1건(대상 store / tenant × period_type) 소요 시간
+# 대상(store / tenant) 은 histogram 라벨에 넣지 않는다 (매장 수 × 버킷 수만큼 series 가 늘어남)
+BATCH_JOB_SECONDS = metrics.histogram(
+    "batch_job_duration_seconds",
+    "배치 작업 1건 소요 시간",
+    ["job", "period_type", "status"],
+    buckets=(0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 600.0),
+)
+# 대상별 마지막 소요 시간 — 대상당 series 1개라서 느린 매장 / tenant 를 찾을 때 쓴다
+BATCH_JOB_LAST_SECONDS = metrics.gauge(
+    "batch_job_last_duration_seconds",
+    "대상별 마지막 배치 작업 소요 시간",
+    ["job", "target", "period_type", "status"],
+)
+
+
+def observe_batch_job(seconds: float, *, job: str, target: str, period_type: str, status: str) -> None:
+    BATCH_JOB_SECONDS.observe(seconds, job=job, period_type=period_type, status=status)
+    BATCH_JOB_LAST_SECONDS.set(seconds, job=job, target=target, period_type=period_type, status=status)
+
 
 def utc_now() -> datetime:
     return datetime.now(timezone.utc)
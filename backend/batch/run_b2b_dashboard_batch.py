@@ -2,14 +2,17 @@ from __future__ import annotations
 
 import argparse
 import os
+import time
 from pathlib import Path
 from typing import Any
 
 from dotenv import load_dotenv
 
-from backend.batch.batch_utils import make_batch_run_id, resolve_window, utc_now
+from backend.batch.batch_utils import make_batch_run_id, observe_batch_job, resolve_window, utc_now
+from backend.core import metrics
 from backend.db.session import SessionLocal
 from backend.service.b2b_cache_service import (
+    make_b2b_cache_writer,
     make_error_response,
     resolve_b2b_status,
     save_b2b_cache_result,
@@ -230,6 +233,7 @@ def run_b2b_dashboard_batch(
     print(f"[b2b-batch] total_jobs={total_jobs}")
 
     db = SessionLocal()
+    writer = make_b2b_cache_writer()
 
     try:
         for tenant_id in target_tenant_ids:
@@ -241,6 +245,7 @@ def run_b2b_dashboard_batch(
                 if include_customer_trend:
                     done += 1
                     print(f"[b2b-batch] ({done}/{total_jobs}) tenant={tenant_id} CUSTOMER_TREND {period_type}")
+                    job_started = time.perf_counter()
                     try:
                         response_json = build_customer_trend_json(
                             db=db,
@@ -252,6 +257,13 @@ def run_b2b_dashboard_batch(
                     except Exception as exc:
                         status = "ERROR"
                         response_json = make_error_response(str(exc))
+                    observe_batch_job(
+                        time.perf_counter() - job_started,
+                        job="b2b_customer_trend",
+                        target=str(tenant_id),
+                        period_type=period_type,
+                        status=status,
+                    )
 
                     save_b2b_cache_result(
                         tenant_id=tenant_id,
@@ -263,15 +275,17 @@ def run_b2b_dashboard_batch(
                         status=status,
                         response_json=response_json,
                         batch_run_id=batch_run_id,
+                        writer=writer,
                     )
                     success += int(status == "SUCCESS")
                     no_data += int(status == "NO_DATA")
                     error += int(status == "ERROR")
-                    print(f"[b2b-batch] saved CUSTOMER_TREND {period_type} status={status}")
+                    print(f"[b2b-batch] buffered CUSTOMER_TREND {period_type} status={status}")
 
                 if include_competitor_analysis:
                     done += 1
                     print(f"[b2b-batch] ({done}/{total_jobs}) tenant={tenant_id} COMPETITOR_ANALYSIS {period_type}")
+                    job_started = time.perf_counter()
                     try:
                         response_json = build_competitor_analysis_json(
                             db=db,
@@ -283,6 +297,13 @@ def run_b2b_dashboard_batch(
                     except Exception as exc:
                         status = "ERROR"
                         response_json = make_error_response(str(exc))
+                    observe_batch_job(
+                        time.perf_counter() - job_started,
+                        job="b2b_competitor_analysis",
+                        target=str(tenant_id),
+                        period_type=period_type,
+                        status=status,
+                    )
 
                     save_b2b_cache_result(
                         tenant_id=tenant_id,
@@ -294,15 +315,26 @@ def run_b2b_dashboard_batch(
                         status=status,
                         response_json=response_json,
                         batch_run_id=batch_run_id,
+                        writer=writer,
                     )
                     success += int(status == "SUCCESS")
                     no_data += int(status == "NO_DATA")
                     error += int(status == "ERROR")
-                    print(f"[b2b-batch] saved COMPETITOR_ANALYSIS {period_type} status={status}")
+                    print(f"[b2b-batch] buffered COMPETITOR_ANALYSIS {period_type} status={status}")
     finally:
+        # 중간에 예외 / 중단이 나도 버퍼에 남은 결과는 저장한다
+        try:
+            writer.flush()
+        except Exception as exc:
+            print(f"[b2b-batch] 남은 cache 결과 저장 실패 rows={len(writer)}: {exc}")
         db.close()
+        metrics.push_snapshot(key="batch:b2b_dashboard")
 
-    print(f"[b2b-batch] done success={success} no_data={no_data} error={error}")
+    print(
+        f"[b2b-batch] done success={success} no_data={no_data} error={error} "
+        f"flushes={writer.stats['flushes']} unique_blobs={writer.stats['unique_blobs']} "
+        f"new_blobs={writer.stats['blobs_written']}"
+    )
 
 
 def parse_args() -> argparse.Namespace:
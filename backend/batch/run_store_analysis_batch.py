@@ -1,16 +1,21 @@
 from __future__ import annotations
 
 import argparse
+import time
 from pathlib import Path
 
 from dotenv import load_dotenv
 from sqlalchemy.orm import Session
 
-from backend.batch.batch_utils import make_batch_run_id, resolve_window, utc_now
+from backend.analysis.llm_scheduler import llm_tenant
+from backend.batch.batch_utils import make_batch_run_id, observe_batch_job, resolve_window, utc_now
+from backend.core import metrics
 from backend.db.models import GoogleReview
 from backend.db.session import SessionLocal
-from backend.service.analysis_service import analyze_store_cx_by_period
+from backend.service.analysis_service import analyze_store_cx_from_digests
+from backend.service.review_digest_service import ensure_daily_digests
 from backend.service.cx_cache_service import (
+    make_cx_cache_writer,
     make_error_response,
     resolve_cx_status,
     save_cx_cache_result,
@@ -55,17 +60,47 @@ def run_store_analysis_batch(
     no_reviews = 0
     error = 0
 
+    writer = make_cx_cache_writer()
+
     print(f"[store-batch] batch_run_id={batch_run_id}")
     print(f"[store-batch] stores={len(target_store_ids)} periods={period_types} total_jobs={total_jobs}")
 
+    # 가장 긴 기간 기준으로 매장당 1번만 digest 갱신 → 각 기간은 digest 합산만
+    windows = {period_type: resolve_window(period_type, batch_now) for period_type in period_types}
+    digest_from = min(start.date() for start, _ in windows.values())
+    digest_to = max(end.date() for _, end in windows.values())
+
     try:
         for store_id in target_store_ids:
+            digest_error = None
+            digest_started = time.perf_counter()
+            try:
+                # LLM 스케줄러는 매장 단위로 공정 분배 (큰 매장이 배치 슬롯을 독차지하지 않게)
+                with llm_tenant(f"store:{store_id}"):
+                    ensure_daily_digests(
+                        db,
+                        store_id=store_id,
+                        from_date=digest_from,
+                        to_date=digest_to,
+                    )
+            except Exception as exc:
+                db.rollback()
+                digest_error = str(exc)
+                print(f"[store-batch] digest 갱신 실패 store_id={store_id}: {exc}")
+            observe_batch_job(
+                time.perf_counter() - digest_started,
+                job="store_digest",
+                target=str(store_id),
+                period_type="ALL",
+                status="ERROR" if digest_error is not None else "SUCCESS",
+            )
+
             for period_type in period_types:
                 done += 1
-                window_start_at, window_end_at = resolve_window(period_type, batch_now)
+                window_start_at, window_end_at = windows[period_type]
 
-                from_date = window_start_at.date().isoformat()
-                to_date = window_end_at.date().isoformat()
+                from_date = window_start_at.date()
+                to_date = window_end_at.date()
 
                 print(
                     f"[store-batch] ({done}/{total_jobs}) "
@@ -73,17 +108,29 @@ def run_store_analysis_batch(
                     f"from={from_date} to={to_date}"
                 )
 
+                job_started = time.perf_counter()
                 try:
-                    response_json = analyze_store_cx_by_period(
-                        store_id=store_id,
-                        from_date=from_date,
-                        to_date=to_date,
-                        db=db,
-                    )
+                    if digest_error is not None:
+                        raise RuntimeError(digest_error)
+                    with llm_tenant(f"store:{store_id}"):
+                        response_json = analyze_store_cx_from_digests(
+                            store_id=store_id,
+                            from_date=from_date,
+                            to_date=to_date,
+                            db=db,
+                            refresh_digests=False,
+                        )
                     status = resolve_cx_status(response_json)
                 except Exception as exc:
                     status = "ERROR"
                     response_json = make_error_response(str(exc))
+                observe_batch_job(
+                    time.perf_counter() - job_started,
+                    job="store_cx",
+                    target=str(store_id),
+                    period_type=period_type,
+                    status=status,
+                )
 
                 save_cx_cache_result(
                     store_id=store_id,
@@ -94,6 +141,7 @@ def run_store_analysis_batch(
                     status=status,
                     response_json=response_json,
                     batch_run_id=batch_run_id,
+                    writer=writer,
                 )
 
                 if status == "SUCCESS":
@@ -104,15 +152,24 @@ def run_store_analysis_batch(
                     error += 1
 
                 print(
-                    f"[store-batch] saved "
+                    f"[store-batch] buffered "
                     f"store_id={store_id} period_type={period_type} status={status}"
                 )
     finally:
+        # 중간에 예외 / 중단이 나도 버퍼에 남은 결과는 저장한다
+        try:
+            writer.flush()
+        except Exception as exc:
+            print(f"[store-batch] 남은 cache 결과 저장 실패 rows={len(writer)}: {exc}")
         db.close()
+        # 배치 CLI 는 /metrics 를 받지 않으므로 끝날 때 스냅샷을 올린다 (REDIS_URL 있을 때)
+        metrics.push_snapshot(key="batch:store_analysis")
 
     print(
         f"[store-batch] done "
-        f"success={success} no_reviews={no_reviews} error={error}"
+        f"success={success} no_reviews={no_reviews} error={error} "
+        f"flushes={writer.stats['flushes']} unique_blobs={writer.stats['unique_blobs']} "
+        f"new_blobs={writer.stats['blobs_written']}"
     )
 
 
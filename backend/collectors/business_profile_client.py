@@ -1,15 +1,25 @@
-from typing import List, Dict
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Any, List, Dict, Optional
+import hashlib
 import os
+import threading
+
+from dateutil.parser import isoparse
 
-from googleapiclient.discovery import build
-from google.oauth2.credentials import Credentials
-from google.auth.transport.requests import Request
-from google.auth.exceptions import RefreshError
 from sqlalchemy.orm import Session
 from fastapi import HTTPException
 
+from backend.core.cache import SingleFlight, TTLCache
+from backend.core.serialization import dumps_str, loads
 from backend.db.models import OAuthAccount
 
+# googleapiclient / google-auth 는 import 가 무거워서 실제로 Google API 를 부를 때 불러온다
+if TYPE_CHECKING:
+    from google.oauth2.credentials import Credentials
+
 
 # -------------------------------------------------
 # Environment variables
@@ -17,6 +27,135 @@ from backend.db.models import OAuthAccount
 GOOGLE_CLIENT_ID = os.getenv("GOOGLE_CLIENT_ID")
 GOOGLE_CLIENT_SECRET = os.getenv("GOOGLE_CLIENT_SECRET")
 
+# 매장(Location) 목록은 자주 바뀌지 않으므로 user 별로 잠시 캐시
+LOCATIONS_CACHE_TTL_SECONDS = float(os.getenv("GOOGLE_LOCATIONS_CACHE_TTL_SECONDS", "300"))
+SERVICE_CACHE_TTL_SECONDS = float(os.getenv("GOOGLE_SERVICE_CACHE_TTL_SECONDS", "1800"))
+
+# reviews.list 최대 pageSize / Location 병렬 수집 스레드 수
+REVIEWS_PAGE_SIZE = 50
+REVIEW_FETCH_WORKERS = int(os.getenv("GOOGLE_REVIEW_FETCH_WORKERS", "8"))
+
+# access_token 만료 이 시간(초) 전부터는 새로 refresh
+TOKEN_REFRESH_MARGIN_SECONDS = float(os.getenv("GOOGLE_TOKEN_REFRESH_MARGIN_SECONDS", "300"))
+
+_credentials_cache = TTLCache(maxsize=1024, ttl_seconds=TOKEN_REFRESH_MARGIN_SECONDS)
+_token_flight = SingleFlight()
+_locations_cache = TTLCache(maxsize=1024, ttl_seconds=LOCATIONS_CACHE_TTL_SECONDS)
+_service_cache = TTLCache(maxsize=512, ttl_seconds=SERVICE_CACHE_TTL_SECONDS)
+
+
+def _token_fingerprint(refresh_token: str) -> str:
+    # refresh_token 이 바뀌면(재연결) 다른 캐시 키가 되도록 짧은 hash 만 사용
+    return hashlib.sha256(refresh_token.encode("utf-8")).hexdigest()[:16]
+
+
+def _seconds_until_expiry(expiry: Optional[datetime]) -> float:
+    if expiry is None:
+        return 0.0
+    # google-auth 는 expiry 를 naive UTC 로 다룬다
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    return (expiry - now).total_seconds()
+
+
+def _redis():
+    if not os.getenv("REDIS_URL"):
+        return None
+    try:
+        from backend.core.redis_client import get_redis
+
+        return get_redis()
+    except Exception:
+        return None
+
+
+def _redis_token_key(key: tuple) -> str:
+    return "google:token:" + ":".join(str(part) for part in key)
+
+
+def _get_shared_token(key: tuple) -> Optional[Dict[str, Any]]:
+    client = _redis()
+    if client is None:
+        return None
+    try:
+        raw = client.get(_redis_token_key(key))
+    except Exception as exc:
+        print(f"[GoogleAuth] Redis 토큰 조회 실패: {exc}")
+        return None
+    return loads(raw) if raw else None
+
+
+def _set_shared_token(key: tuple, token: str, expiry: datetime, ttl: float) -> None:
+    client = _redis()
+    if client is None:
+        return
+    try:
+        client.set(
+            _redis_token_key(key),
+            dumps_str({"token": token, "expiry": expiry.isoformat()}),
+            ex=max(int(ttl), 1),
+        )
+    except Exception as exc:
+        print(f"[GoogleAuth] Redis 토큰 저장 실패: {exc}")
+
+
+def _new_credentials(
+    oauth: OAuthAccount,
+    token: Optional[str] = None,
+    expiry: Optional[datetime] = None,
+) -> Credentials:
+    from google.oauth2.credentials import Credentials
+
+    return Credentials(
+        token=token,
+        expiry=expiry,
+        refresh_token=oauth.refresh_token,
+        token_uri="https://oauth2.googleapis.com/token",
+        client_id=GOOGLE_CLIENT_ID,
+        client_secret=GOOGLE_CLIENT_SECRET,
+        scopes=oauth.scope.split(" ") if oauth.scope else None,
+    )
+
+
+def _cache_credentials(key: tuple, creds: Credentials) -> float:
+    ttl = _seconds_until_expiry(creds.expiry) - TOKEN_REFRESH_MARGIN_SECONDS
+    if ttl > 0:
+        _credentials_cache.set(key, creds, ttl_seconds=ttl)
+    return ttl
+
+
+def _load_or_refresh_credentials(key: tuple, oauth: OAuthAccount) -> Credentials:
+    from google.auth.exceptions import RefreshError
+    from google.auth.transport.requests import Request
+
+    # 대기하는 동안 다른 스레드가 갱신했을 수 있으므로 한 번 더 확인
+    creds = _credentials_cache.get(key)
+    if creds is not None:
+        return creds
+
+    # 다른 worker 가 받아 둔 access_token 재사용
+    shared = _get_shared_token(key)
+    if shared:
+        expiry = datetime.fromisoformat(shared["expiry"])
+        if _seconds_until_expiry(expiry) > TOKEN_REFRESH_MARGIN_SECONDS:
+            creds = _new_credentials(oauth, token=shared["token"], expiry=expiry)
+            _cache_credentials(key, creds)
+            return creds
+
+    creds = _new_credentials(oauth)
+    try:
+        creds.refresh(Request())
+    except RefreshError:
+        # 🔥 핵심 수정 포인트
+        raise HTTPException(
+            status_code=401,
+            detail="Google 인증이 만료되었습니다. 다시 Google 계정을 연결해주세요."
+        )
+
+    ttl = _cache_credentials(key, creds)
+    if ttl > 0:
+        _set_shared_token(key, creds.token, creds.expiry, ttl)
+    return creds
+
 
 def load_credentials(
     *,
@@ -26,6 +165,10 @@ def load_credentials(
     """
     OAuthAccount 테이블 기반으로
     Google API Credentials 생성
+
+    access_token 은 만료 TOKEN_REFRESH_MARGIN_SECONDS 전까지 캐시해서 재사용한다.
+    (프로세스 내부 + REDIS_URL 이 있으면 worker 간 공유)
+    만료가 가까울 때만 refresh 하고, 동시 요청은 SingleFlight 로 1번만 refresh 한다.
     """
 
     oauth = (
@@ -43,49 +186,118 @@ def load_credentials(
             detail="Google 계정이 연결되어 있지 않습니다. 다시 로그인해주세요."
         )
 
-    creds = Credentials(
-        token=None,  # access_token은 refresh로 항상 새로 받음
-        refresh_token=oauth.refresh_token,
-        token_uri="https://oauth2.googleapis.com/token",
-        client_id=GOOGLE_CLIENT_ID,
-        client_secret=GOOGLE_CLIENT_SECRET,
-        scopes=oauth.scope.split(" ") if oauth.scope else None,
-    )
+    key = (user_id, _token_fingerprint(oauth.refresh_token))
+    creds = _credentials_cache.get(key)
+    if creds is not None:
+        return creds
 
-    try:
-        if not creds.valid:
-            creds.refresh(Request())
-    except RefreshError:
-        # 🔥 핵심 수정 포인트
-        raise HTTPException(
-            status_code=401,
-            detail="Google 인증이 만료되었습니다. 다시 Google 계정을 연결해주세요."
-        )
+    return _token_flight.do(key, lambda: _load_or_refresh_credentials(key, oauth))
 
-    return creds
 
+_discovery_cache = None
+_discovery_docs: Dict[tuple, str] = {}
 
-def fetch_all_google_reviews(
+
+def _get_discovery_cache():
+    """
+    discovery 문서를 프로세스 메모리에 보관하는 cache (URL → 문서 문자열).
+    googleapiclient 의 Cache 를 상속해야 해서 처음 쓸 때 클래스를 만든다.
+    """
+    global _discovery_cache
+    if _discovery_cache is not None:
+        return _discovery_cache
+
+    from googleapiclient.discovery_cache import base as discovery_cache_base
+
+    class _MemoryDiscoveryCache(discovery_cache_base.Cache):
+        def __init__(self) -> None:
+            self._docs: Dict[str, str] = {}
+
+        def get(self, url):
+            return self._docs.get(url)
+
+        def set(self, url, content):
+            self._docs[url] = content
+
+    _discovery_cache = _MemoryDiscoveryCache()
+    return _discovery_cache
+
+
+def _build(service_name: str, version: str, credentials: Credentials):
+    """
+    discovery 문서를 (service, version) 당 1번만 읽고 build_from_document 로 클라이언트 생성.
+    번들(static) 문서가 없으면 네트워크로 받은 문서를 메모리 캐시에 보관한다.
+    """
+    from googleapiclient.discovery import build, build_from_document
+    from googleapiclient.discovery_cache import get_static_doc
+
+    doc = _discovery_docs.get((service_name, version))
+    if doc is None:
+        doc = get_static_doc(service_name, version)
+        if doc is None:
+            return build(
+                service_name,
+                version,
+                credentials=credentials,
+                cache=_get_discovery_cache(),
+                static_discovery=False,
+            )
+        _discovery_docs[(service_name, version)] = doc
+
+    return build_from_document(doc, credentials=credentials)
+
+
+def build_service(
+    service_name: str,
+    version: str,
+    *,
+    credentials: Credentials,
+    user_id: Optional[int] = None,
+):
+    """
+    discovery 클라이언트 build() 결과를 캐시해서 재사용한다.
+
+    httplib2 기반 클라이언트는 스레드 간 공유가 안전하지 않아서
+    (user_id, service, version, thread) 단위로 캐시한다.
+    같은 credentials 객체일 때만 재사용한다. (load_credentials 가 토큰 만료 전까지 같은 객체를 돌려준다)
+    """
+    if user_id is None:
+        return _build(service_name, version, credentials)
+
+    key = (user_id, service_name, version, threading.get_ident())
+    cached = _service_cache.get(key)
+    if cached is not None and cached[0] is credentials:
+        return cached[1]
+
+    service = _build(service_name, version, credentials)
+    _service_cache.set(key, (credentials, service))
+    return service
+
+
+def list_locations(
     *,
     user_id: int,
     db: Session,
-) -> List[Dict]:
+) -> Dict[str, Any]:
     """
-    로그인한 유저의 Google 계정 기준으로
-    접근 가능한 모든 Account / 모든 Location의 리뷰 수집
+    user 의 Google Business Account / Location 목록.
+    {"accounts": [account_name, ...], "locations": [location(+account_name), ...]}
+    GOOGLE_LOCATIONS_CACHE_TTL_SECONDS 동안 캐시한다.
     """
+    cached = _locations_cache.get(user_id)
+    if cached is not None:
+        return cached
 
-    # 🔑 user_id 기반 Credentials
     creds = load_credentials(
         user_id=user_id,
         db=db,
     )
 
-    # 1️⃣ Business Account 조회
-    account_service = build(
+    account_service = build_service(
         "mybusinessaccountmanagement",
         "v1",
         credentials=creds,
+        user_id=user_id,
     )
 
     accounts = (
@@ -95,59 +307,144 @@ def fetch_all_google_reviews(
         .get("accounts", [])
     )
 
-    if not accounts:
-        return []
-
-    # 2️⃣ Location 서비스
-    location_service = build(
+    location_service = build_service(
         "mybusinessbusinessinformation",
         "v1",
         credentials=creds,
+        user_id=user_id,
     )
 
-    # 3️⃣ Review 서비스
-    review_service = build(
-        "mybusinessreviews",
-        "v1",
-        credentials=creds,
-    )
-
-    all_reviews: List[Dict] = []
-
-    # 4️⃣ Account → Location → Review 전체 순회
+    locations: List[Dict] = []
     for account in accounts:
         account_name = account["name"]  # accounts/{accountId}
 
-        locations = (
+        for loc in (
             location_service.accounts()
             .locations()
             .list(parent=account_name)
             .execute()
             .get("locations", [])
+        ):
+            locations.append({**loc, "account_name": account_name})
+
+    result = {
+        "accounts": [account["name"] for account in accounts],
+        "locations": locations,
+    }
+    _locations_cache.set(user_id, result)
+    return result
+
+
+def invalidate_locations_cache(user_id: int) -> None:
+    _locations_cache.delete(user_id)
+
+
+def fetch_location_reviews(
+    *,
+    user_id: int,
+    creds: Credentials,
+    location_name: str,
+    since: Optional[datetime] = None,
+) -> List[Dict]:
+    """
+    한 Location 의 리뷰를 updateTime 내림차순으로 받아온다.
+    since(high-water mark)보다 오래된 리뷰가 나오면 그 뒤 페이지는 받지 않는다.
+    """
+    review_service = build_service(
+        "mybusinessreviews",
+        "v1",
+        credentials=creds,
+        user_id=user_id,
+    )
+
+    reviews: List[Dict] = []
+
+    request = (
+        review_service.accounts()
+        .locations()
+        .reviews()
+        .list(
+            parent=location_name,
+            pageSize=REVIEWS_PAGE_SIZE,
+            orderBy="updateTime desc",
         )
+    )
 
-        for loc in locations:
-            location_name = loc["name"]  # accounts/.../locations/...
+    while request:
+        response = request.execute()
 
-            request = (
-                review_service.accounts()
-                .locations()
-                .reviews()
-                .list(parent=location_name)
+        for review in response.get("reviews", []):
+            update_time = parse_google_time(review.get("updateTime"))
+            if since is not None and update_time is not None and update_time < since:
+                return reviews
+            reviews.append(review)
+
+        request = (
+            review_service.accounts()
+            .locations()
+            .reviews()
+            .list_next(request, response)
+        )
+
+    return reviews
+
+
+def fetch_google_reviews_incremental(
+    *,
+    user_id: int,
+    db: Session,
+    high_water_marks: Optional[Dict[str, datetime]] = None,
+) -> Dict[str, List[Dict]]:
+    """
+    접근 가능한 모든 Location 의 신규/수정 리뷰를 병렬로 수집한다.
+    반환: {location_name: [review, ...]}
+    """
+    high_water_marks = high_water_marks or {}
+
+    creds = load_credentials(
+        user_id=user_id,
+        db=db,
+    )
+    locations = list_locations(user_id=user_id, db=db)["locations"]
+    if not locations:
+        return {}
+
+    location_names = [loc["name"] for loc in locations]
+
+    with ThreadPoolExecutor(max_workers=min(REVIEW_FETCH_WORKERS, len(location_names))) as pool:
+        futures = {
+            name: pool.submit(
+                fetch_location_reviews,
+                user_id=user_id,
+                creds=creds,
+                location_name=name,
+                since=high_water_marks.get(name),
             )
+            for name in location_names
+        }
+        return {name: future.result() for name, future in futures.items()}
 
-            while request:
-                response = request.execute()
-                all_reviews.extend(response.get("reviews", []))
 
-                request = (
-                    review_service.accounts()
-                    .locations()
-                    .reviews()
-                    .list_next(request, response)
-                )
+def fetch_all_google_reviews(
+    *,
+    user_id: int,
+    db: Session,
+) -> List[Dict]:
+    """
+    로그인한 유저의 Google 계정 기준으로
+    접근 가능한 모든 Account / 모든 Location의 리뷰 수집
+    """
+    by_location = fetch_google_reviews_incremental(user_id=user_id, db=db)
+    return [review for reviews in by_location.values() for review in reviews]
+
 
-    return all_reviews
+def parse_google_time(value: Optional[str]) -> Optional[datetime]:
+    if not value:
+        return None
+    try:
+        return isoparse(value)
+    except ValueError:
+        return None
 
 
 def extract_review_texts(reviews: List[Dict]) -> List[str]:
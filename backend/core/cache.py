@@ -0,0 +1,186 @@
+from __future__ import annotations
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable
+
+from backend.core.serialization import dumps, loads
+
+_MISSING = object()
+
+
+class TTLCache:
+    """
+    프로세스 내부 LRU + TTL 캐시 (thread-safe).
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl_seconds: float = 60.0) -> None:
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+        self._data: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return default
+            expires_at, value = item
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl_seconds: float | None = None) -> None:
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        with self._lock:
+            self._data[key] = (time.monotonic() + ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key: Hashable) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+
+class SingleFlight:
+    """
+    같은 key 에 대한 동시 호출을 1회로 합친다.
+    먼저 들어온 스레드만 loader 를 실행하고, 나머지는 그 결과를 기다려 공유한다.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._calls: dict[Hashable, dict[str, Any]] = {}
+
+    def do(self, key: Hashable, loader: Callable[[], Any]) -> Any:
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = {"event": threading.Event(), "value": None, "error": None}
+                self._calls[key] = call
+
+        if not leader:
+            call["event"].wait()
+            if call["error"] is not None:
+                raise call["error"]
+            return call["value"]
+
+        try:
+            call["value"] = loader()
+            return call["value"]
+        except Exception as exc:
+            call["error"] = exc
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call["event"].set()
+
+
+class ReadThroughCache:
+    """
+    L1(프로세스 내부 TTL LRU) → L2(Redis, 선택) → loader 순서로 조회하는 read-through 캐시.
+
+    - REDIS_URL 이 없거나 Redis 오류가 나면 L2 는 건너뛴다.
+    - L1 miss 가 동시에 몰려도 SingleFlight 로 loader 는 key 당 1번만 실행된다.
+    - loader 가 None 을 반환해도 캐시해서 빈 결과 조회가 원본을 두드리지 않게 한다.
+    """
+
+    def __init__(
+        self,
+        namespace: str,
+        *,
+        maxsize: int = 1024,
+        local_ttl_seconds: float = 60.0,
+        redis_ttl_seconds: int = 3600,
+    ) -> None:
+        self.namespace = namespace
+        self.redis_ttl_seconds = redis_ttl_seconds
+        self._local = TTLCache(maxsize=maxsize, ttl_seconds=local_ttl_seconds)
+        self._flight = SingleFlight()
+
+    def _redis_key(self, key: tuple) -> str:
+        return "cache:" + self.namespace + ":" + ":".join(str(part) for part in key)
+
+    def _redis(self):
+        if not os.getenv("REDIS_URL"):
+            return None
+        try:
+            from backend.core.redis_client import get_redis
+
+            return get_redis()
+        except Exception:
+            return None
+
+    def _redis_get(self, key: tuple) -> Any:
+        client = self._redis()
+        if client is None:
+            return _MISSING
+        try:
+            raw = client.get(self._redis_key(key))
+        except Exception as exc:
+            print(f"[Cache] Redis 조회 실패 ({self.namespace}): {exc}")
+            return _MISSING
+        if raw is None:
+            return _MISSING
+        return loads(raw)
+
+    def _redis_set(self, key: tuple, value: Any) -> None:
+        client = self._redis()
+        if client is None:
+            return
+        try:
+            client.set(self._redis_key(key), dumps(value), ex=self.redis_ttl_seconds)
+        except Exception as exc:
+            print(f"[Cache] Redis 저장 실패 ({self.namespace}): {exc}")
+
+    def _redis_delete(self, key: tuple) -> None:
+        client = self._redis()
+        if client is None:
+            return
+        try:
+            client.delete(self._redis_key(key))
+        except Exception as exc:
+            print(f"[Cache] Redis 삭제 실패 ({self.namespace}): {exc}")
+
+    def get(self, key: tuple, loader: Callable[[], Any]) -> Any:
+        value = self._local.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+
+        def load() -> Any:
+            # 대기하는 동안 다른 스레드가 채웠을 수 있으므로 한 번 더 확인
+            cached = self._local.get(key, _MISSING)
+            if cached is not _MISSING:
+                return cached
+
+            cached = self._redis_get(key)
+            if cached is _MISSING:
+                cached = loader()
+                self._redis_set(key, cached)
+
+            self._local.set(key, cached)
+            return cached
+
+        return self._flight.do(key, load)
+
+    def set(self, key: tuple, value: Any) -> None:
+        self._local.set(key, value)
+        self._redis_set(key, value)
+
+    def invalidate(self, key: tuple) -> None:
+        self._local.delete(key)
+        self._redis_delete(key)
+
+    def clear_local(self) -> None:
+        self._local.clear()
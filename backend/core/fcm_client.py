@@ -4,11 +4,17 @@ import json
 import os
 from typing import List
 
-import firebase_admin
-from firebase_admin import credentials, messaging
+from backend.core import metrics
+
+FCM_DISPATCHES = metrics.counter("fcm_dispatches_total", "FCM 일괄 발송 호출 수", ["outcome"])
+FCM_MESSAGES = metrics.counter("fcm_messages_total", "FCM 기기별 발송 결과 수", ["outcome"])
 
 
 def _initialize() -> None:
+    # firebase_admin 은 import 가 무거워서 첫 발송 때 불러온다
+    import firebase_admin
+    from firebase_admin import credentials
+
     if firebase_admin._apps:
         return
 
@@ -32,20 +38,30 @@ def send_fcm_to_devices(tokens: List[str], title: str, body: str) -> None:
     등록된 기기 토큰 목록에 FCM 푸시 알림 일괄 발송.
     """
     if not tokens:
+        FCM_DISPATCHES.inc(outcome="skipped")
         print("[FCM] 등록된 기기 없음 — 발송 스킵")
         return
 
-    _initialize()
+    try:
+        _initialize()
+        from firebase_admin import messaging
 
-    message = messaging.MulticastMessage(
-        notification=messaging.Notification(
-            title=title,
-            body=body,
-        ),
-        tokens=tokens,
-    )
+        message = messaging.MulticastMessage(
+            notification=messaging.Notification(
+                title=title,
+                body=body,
+            ),
+            tokens=tokens,
+        )
+
+        response = messaging.send_each_for_multicast(message)
+    except Exception:
+        FCM_DISPATCHES.inc(outcome="error")
+        raise
 
-    response = messaging.send_each_for_multicast(message)
+    FCM_DISPATCHES.inc(outcome="ok")
+    FCM_MESSAGES.inc(response.success_count, outcome="success")
+    FCM_MESSAGES.inc(response.failure_count, outcome="failure")
     print(f"[FCM] 발송 완료 — 성공: {response.success_count} / 실패: {response.failure_count}")
 
     # 실패한 토큰 로그
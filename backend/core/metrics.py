@@ -0,0 +1,349 @@
+"""
+프로세스 내 메트릭 레지스트리 (Prometheus text format, 외부 의존성 없음)
+
+    REQUESTS = metrics.counter("app_requests_total", "설명", ["route"])
+    REQUESTS.inc(route="/x")
+    LATENCY = metrics.histogram("app_latency_seconds", "설명", ["route"])
+    LATENCY.observe(0.12, route="/x")
+
+- 기록은 메트릭별 lock + dict 갱신만 한다 (hot path 비용 최소화)
+- 멀티 워커: REDIS_URL 이 있으면 각 프로세스가 스냅샷을 Redis hash(REDIS_KEY)에 주기적으로 올리고,
+  /metrics 는 살아 있는 워커(WORKER_TTL_SECONDS 이내)의 스냅샷을 합산해서 보여준다. 없으면 현재 프로세스 값만.
+- 배치 CLI 처럼 짧게 도는 프로세스는 끝날 때 push_snapshot(key="batch:<이름>") 을 호출한다.
+  batch: 키는 만료되지 않고 다음 실행이 덮어쓴다 (pushgateway 방식, 마지막 실행 값이 계속 보임)
+- get_*_stats() 같은 현재 상태 값은 register_collector() 로 스냅샷 직전에 gauge 로 옮긴다
+  (누적 값은 counter 의 set_total 로)
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import socket
+import threading
+import time
+from bisect import bisect_left
+from typing import Any, Callable, Iterable
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+REDIS_KEY = "metrics:workers"
+PUSH_INTERVAL_SECONDS = float(os.getenv("METRICS_PUSH_INTERVAL_SECONDS", "15"))
+WORKER_TTL_SECONDS = float(os.getenv("METRICS_WORKER_TTL_SECONDS", "120"))
+WORKER_ID = f"{socket.gethostname()}:{os.getpid()}"
+# 이 prefix 로 올린 스냅샷은 WORKER_TTL_SECONDS 가 지나도 지우지 않는다
+BATCH_KEY_PREFIX = "batch:"
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, help: str, labelnames: Iterable[str] = ()) -> None:
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._values: dict[tuple[str, ...], Any] = {}
+
+    def _key(self, labels: dict[str, Any]) -> tuple[str, ...]:
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def _export(self) -> dict[str, Any]:
+        with self._lock:
+            values = [[list(key), value] for key, value in self._values.items()]
+        return {"kind": self.kind, "help": self.help, "labelnames": list(self.labelnames), "values": values}
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, value: float = 1.0, **labels: Any) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + value
+
+    def set_total(self, value: float, **labels: Any) -> None:
+        """
+        collector 전용 — 다른 모듈이 이미 누적해 둔 값(get_*_stats())을 그대로 옮긴다
+        """
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = float(value)
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def set(self, value: float, **labels: Any) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = float(value)
+
+    def inc(self, value: float = 1.0, **labels: Any) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + value
+
+    def dec(self, value: float = 1.0, **labels: Any) -> None:
+        self.inc(-value, **labels)
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labelnames: Iterable[str] = (),
+        buckets: Iterable[float] = DEFAULT_BUCKETS,
+    ) -> None:
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels: Any) -> None:
+        key = self._key(labels)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                # [버킷별 개수(마지막은 +Inf), 합계, 개수]
+                state = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            state[0][index] += 1
+            state[1] += value
+            state[2] += 1
+
+    def _export(self) -> dict[str, Any]:
+        with self._lock:
+            values = [[list(key), [list(counts), total, count]] for key, (counts, total, count) in self._values.items()]
+        return {
+            "kind": self.kind,
+            "help": self.help,
+            "labelnames": list(self.labelnames),
+            "buckets": list(self.buckets),
+            "values": values,
+        }
+
+
+_registry_lock = threading.Lock()
+_registry: dict[str, _Metric] = {}
+_collectors: list[Callable[[], None]] = []
+
+
+def _register(metric: _Metric) -> Any:
+    with _registry_lock:
+        existing = _registry.get(metric.name)
+        if existing is not None:
+            return existing
+        _registry[metric.name] = metric
+        return metric
+
+
+def counter(name: str, help: str, labelnames: Iterable[str] = ()) -> Counter:
+    return _register(Counter(name, help, labelnames))
+
+
+def gauge(name: str, help: str, labelnames: Iterable[str] = ()) -> Gauge:
+    return _register(Gauge(name, help, labelnames))
+
+
+def histogram(
+    name: str,
+    help: str,
+    labelnames: Iterable[str] = (),
+    buckets: Iterable[float] = DEFAULT_BUCKETS,
+) -> Histogram:
+    return _register(Histogram(name, help, labelnames, buckets))
+
+
+def register_collector(collector: Callable[[], None]) -> None:
+    """
+    스냅샷 직전에 호출되는 함수 (get_*_stats() 값을 gauge 로 옮기는 용도)
+    """
+    with _registry_lock:
+        if collector not in _collectors:
+            _collectors.append(collector)
+
+
+def snapshot() -> dict[str, Any]:
+    with _registry_lock:
+        collectors = list(_collectors)
+        metrics = list(_registry.values())
+    for collector in collectors:
+        try:
+            collector()
+        except Exception as exc:
+            print(f"[metrics] collector 실패 {getattr(collector, '__name__', collector)}: {exc}")
+    return {metric.name: metric._export() for metric in metrics}
+
+
+# =========================================================
+# 멀티 워커 (Redis 스냅샷 공유)
+# =========================================================
+def push_snapshot(data: dict[str, Any] | None = None, *, key: str | None = None) -> None:
+    """
+    key 를 생략하면 이 워커(WORKER_ID) 스냅샷, 배치 CLI 는 고정 키(BATCH_KEY_PREFIX + 이름)로 올린다.
+    """
+    if not os.getenv("REDIS_URL"):
+        return
+    try:
+        from backend.core.redis_client import get_redis
+
+        payload = json.dumps({"at": time.time(), "metrics": data if data is not None else snapshot()})
+        get_redis().hset(REDIS_KEY, key or WORKER_ID, payload)
+    except Exception as exc:
+        print(f"[metrics] Redis 스냅샷 저장 실패: {exc}")
+
+
+def _worker_snapshots(local: dict[str, Any]) -> list[dict[str, Any]]:
+    if not os.getenv("REDIS_URL"):
+        return [local]
+    try:
+        from backend.core.redis_client import get_redis
+
+        push_snapshot(local)
+        client = get_redis()
+        snapshots, stale = [], []
+        for worker_id, raw in client.hgetall(REDIS_KEY).items():
+            entry = json.loads(raw)
+            if worker_id.startswith(BATCH_KEY_PREFIX):
+                snapshots.append(entry["metrics"])
+            elif time.time() - entry["at"] > WORKER_TTL_SECONDS:
+                stale.append(worker_id)
+            elif worker_id != WORKER_ID:
+                snapshots.append(entry["metrics"])
+        if stale:
+            client.hdel(REDIS_KEY, *stale)
+        return [local, *snapshots]
+    except Exception as exc:
+        print(f"[metrics] Redis 스냅샷 조회 실패 → 현재 프로세스 값만: {exc}")
+        return [local]
+
+
+def _merge(snapshots: list[dict[str, Any]]) -> dict[str, Any]:
+    merged: dict[str, Any] = {}
+    for data in snapshots:
+        for name, metric in data.items():
+            target = merged.setdefault(name, {**metric, "values": {}})
+            for labels, value in metric["values"]:
+                key = tuple(labels)
+                current = target["values"].get(key)
+                if metric["kind"] == "histogram":
+                    if current is None or len(current[0]) != len(value[0]):
+                        target["values"][key] = [list(value[0]), value[1], value[2]]
+                    else:
+                        current[0] = [a + b for a, b in zip(current[0], value[0])]
+                        current[1] += value[1]
+                        current[2] += value[2]
+                else:
+                    # counter / gauge 모두 워커 합계 (gauge 는 큐 길이 / 실행 중 수 같은 합산 가능한 값만 쓴다)
+                    target["values"][key] = (current or 0.0) + value
+    return merged
+
+
+# =========================================================
+# Prometheus text format
+# =========================================================
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Iterable[str], values: Iterable[str], extra: tuple[str, str] | None = None) -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra is not None:
+        pairs.append(f'{extra[0]}="{extra[1]}"')
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_number(value: float) -> str:
+    if value == int(value) and abs(value) < 1e15:
+        return str(int(value))
+    return repr(float(value))
+
+
+def render(data: dict[str, Any]) -> str:
+    lines: list[str] = []
+    for name in sorted(data):
+        metric = data[name]
+        help_text = metric["help"].replace("\\", "\\\\").replace("\n", "\\n")
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {metric['kind']}")
+        names = metric["labelnames"]
+        for labels, value in sorted(metric["values"].items()):
+            if metric["kind"] != "histogram":
+                lines.append(f"{name}{_labels(names, labels)} {_format_number(value)}")
+                continue
+            counts, total, count = value
+            cumulative = 0
+            for bound, bucket_count in zip([*metric["buckets"], "+Inf"], counts):
+                cumulative += bucket_count
+                le = bound if bound == "+Inf" else _format_number(bound)
+                lines.append(f"{name}_bucket{_labels(names, labels, ('le', le))} {cumulative}")
+            lines.append(f"{name}_sum{_labels(names, labels)} {_format_number(total)}")
+            lines.append(f"{name}_count{_labels(names, labels)} {count}")
+    return "\n".join(lines) + "\n"
+
+
+def render_metrics() -> str:
+    """
+    /metrics 응답 본문 (멀티 워커면 워커 합산)
+    """
+    return render(_merge(_worker_snapshots(snapshot())))
+
+
+async def metrics_pusher() -> None:
+    """
+    lifespan 백그라운드 작업: REDIS_URL 이 있으면 PUSH_INTERVAL_SECONDS 마다 이 워커 스냅샷을 올린다.
+    """
+    if not os.getenv("REDIS_URL"):
+        return
+    while True:
+        await asyncio.to_thread(push_snapshot)
+        await asyncio.sleep(PUSH_INTERVAL_SECONDS)
+
+
+# =========================================================
+# HTTP 요청 지연 (ASGI middleware)
+# =========================================================
+HTTP_REQUEST_SECONDS = histogram(
+    "http_request_duration_seconds",
+    "HTTP 요청 처리 시간 (응답 본문 전송 완료까지)",
+    ["method", "route", "status"],
+)
+HTTP_REQUESTS_IN_PROGRESS = gauge("http_requests_in_progress", "처리 중인 HTTP 요청 수", ["method"])
+
+
+class MetricsMiddleware:
+    """
+    route 라벨은 매칭된 경로 템플릿(/stores/{store_id})을 쓴다. 매칭 안 된 요청은 "unmatched" 하나로 묶는다.
+    """
+
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope.get("method", "")
+        status = {"code": 500}
+        started = time.perf_counter()
+
+        async def send_with_status(message) -> None:
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+            await send(message)
+
+        HTTP_REQUESTS_IN_PROGRESS.inc(method=method)
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            HTTP_REQUESTS_IN_PROGRESS.dec(method=method)
+            route = scope.get("route")
+            HTTP_REQUEST_SECONDS.observe(
+                time.perf_counter() - started,
+                method=method,
+                route=getattr(route, "path", "unmatched"),
+                status=status["code"],
+            )
@@ -1,8 +1,19 @@
 from __future__ import annotations
 
 import os
+import time
+
 import redis
 
+from backend.core import metrics
+
+REDIS_PUBLISH_SECONDS = metrics.histogram(
+    "redis_publish_duration_seconds",
+    "Redis PUBLISH 소요 시간",
+    ["channel", "outcome"],
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0),
+)
+
 _client: redis.Redis | None = None
 
 
@@ -17,4 +28,10 @@ def get_redis() -> redis.Redis:
 
 
 def publish(channel: str, message: str) -> None:
-    get_redis().publish(channel, message)
\ No newline at end of file
+    started = time.perf_counter()
+    outcome = "error"
+    try:
+        get_redis().publish(channel, message)
+        outcome = "ok"
+    finally:
+        REDIS_PUBLISH_SECONDS.observe(time.perf_counter() - started, channel=channel, outcome=outcome)
\ No newline at end of file
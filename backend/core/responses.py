@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import gzip
+import os
+import threading
+import time
+from typing import Any
+
+from starlette.responses import JSONResponse
+from starlette.types import Receive, Scope, Send
+
+from backend.core.serialization import dumps
+
+try:
+    import brotli
+except ImportError:  # brotli 미설치 시 gzip 만 협상
+    brotli = None
+
+
+COMPRESSION_MIN_BYTES = int(os.getenv("RESPONSE_COMPRESSION_MIN_BYTES", "1024"))
+GZIP_LEVEL = int(os.getenv("RESPONSE_GZIP_LEVEL", "6"))
+BROTLI_QUALITY = int(os.getenv("RESPONSE_BROTLI_QUALITY", "5"))
+
+# 프로세스 누적 통계 (직렬화 시간 / 압축 전후 바이트)
+_stats_lock = threading.Lock()
+RESPONSE_STATS: dict[str, float] = {
+    "responses": 0,
+    "serialize_seconds": 0.0,
+    "bytes_raw": 0,
+    "bytes_sent": 0,
+    "compressed": 0,
+}
+
+
+def get_response_stats() -> dict[str, float]:
+    with _stats_lock:
+        stats = dict(RESPONSE_STATS)
+    stats["bytes_saved"] = stats["bytes_raw"] - stats["bytes_sent"]
+    return stats
+
+
+def _record(serialize_seconds: float, raw_size: int, sent_size: int, compressed: bool) -> None:
+    with _stats_lock:
+        RESPONSE_STATS["responses"] += 1
+        RESPONSE_STATS["serialize_seconds"] += serialize_seconds
+        RESPONSE_STATS["bytes_raw"] += raw_size
+        RESPONSE_STATS["bytes_sent"] += sent_size
+        RESPONSE_STATS["compressed"] += int(compressed)
+
+
+def _accepted_encodings(scope: Scope) -> dict[str, float]:
+    accepted: dict[str, float] = {}
+    for key, value in scope.get("headers", []):
+        if key != b"accept-encoding":
+            continue
+        for part in value.decode("latin-1").split(","):
+            name, _, params = part.strip().partition(";")
+            quality = 1.0
+            params = params.strip()
+            if params.startswith("q="):
+                try:
+                    quality = float(params[2:])
+                except ValueError:
+                    quality = 0.0
+            if name:
+                accepted[name.lower()] = quality
+    return accepted
+
+
+def negotiate_encoding(scope: Scope) -> str | None:
+    accepted = _accepted_encodings(scope)
+    candidates = ["br", "gzip"] if brotli is not None else ["gzip"]
+    best: str | None = None
+    best_quality = 0.0
+    for name in candidates:
+        quality = accepted.get(name, accepted.get("*", 0.0))
+        if quality > best_quality:
+            best, best_quality = name, quality
+    return best
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=GZIP_LEVEL)
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    orjson 직렬화 + Accept-Encoding 협상(br/gzip) 압축 JSON 응답.
+
+    라우트에서 dict 를 그대로 반환하면 FastAPI 가 jsonable_encoder 를 먼저 돌리므로,
+    무거운 응답은 `return FastJSONResponse(payload)` 처럼 인스턴스를 직접 반환한다.
+
+    Server-Timing(serialize) / X-Uncompressed-Length 헤더로 직렬화 시간과 압축 효과를 노출한다.
+    """
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        started = time.perf_counter()
+        body = dumps(content)
+        self.serialize_seconds = time.perf_counter() - started
+        return body
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        raw_size = len(self.body)
+        serialize_seconds = getattr(self, "serialize_seconds", 0.0)
+        encoding = negotiate_encoding(scope) if raw_size >= COMPRESSION_MIN_BYTES else None
+
+        if encoding:
+            compressed = compress(self.body, encoding)
+            if len(compressed) < raw_size:
+                self.body = compressed
+                self.raw_headers = [
+                    (key, value) for key, value in self.raw_headers if key != b"content-length"
+                ]
+                self.raw_headers.append((b"content-length", str(len(compressed)).encode("latin-1")))
+                self.raw_headers.append((b"content-encoding", encoding.encode("latin-1")))
+                self.raw_headers.append((b"x-uncompressed-length", str(raw_size).encode("latin-1")))
+            else:
+                encoding = None
+
+        self.raw_headers.append((b"vary", b"Accept-Encoding"))
+        self.raw_headers.append(
+            (b"server-timing", f"serialize;dur={serialize_seconds * 1000:.2f}".encode("latin-1"))
+        )
+
+        _record(serialize_seconds, raw_size, len(self.body), encoding is not None)
+        await super().__call__(scope, receive, send)
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import json
+from dataclasses import asdict, is_dataclass
+from datetime import date, datetime, time
+from decimal import Decimal
+from typing import Any
+from uuid import UUID
+
+try:
+    import orjson
+except ImportError:  # orjson 미설치 환경에서는 표준 json 으로 동작
+    orjson = None
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    if isinstance(value, UUID):
+        return str(value)
+    if isinstance(value, (set, frozenset, tuple)):
+        return list(value)
+    if is_dataclass(value) and not isinstance(value, type):
+        return asdict(value)
+    if hasattr(value, "keys") and hasattr(value, "__getitem__"):
+        # SQLAlchemy RowMapping 등 mapping 계열
+        return {key: value[key] for key in value.keys()}
+    raise TypeError(f"JSON 직렬화 불가 타입: {type(value).__name__}")
+
+
+def dumps(value: Any, *, sort_keys: bool = False) -> bytes:
+    """
+    dict → UTF-8 JSON bytes.
+    orjson 이 있으면 orjson, 없으면 표준 json(ensure_ascii=False, compact) 사용.
+    """
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        return orjson.dumps(value, default=_default, option=option)
+
+    return json.dumps(
+        value,
+        default=_default,
+        ensure_ascii=False,
+        separators=(",", ":"),
+        sort_keys=sort_keys,
+    ).encode("utf-8")
+
+
+def dumps_str(value: Any, *, sort_keys: bool = False) -> str:
+    return dumps(value, sort_keys=sort_keys).decode("utf-8")
+
+
+def canonical_dumps(value: Any) -> bytes:
+    """
+    content hash 용 정규 JSON bytes.
+    orjson 설치 여부와 무관하게 항상 표준 json(키 정렬, compact) 으로 만들어서 호스트마다 같은 bytes 가 나온다.
+    """
+    return json.dumps(
+        value,
+        default=_default,
+        ensure_ascii=False,
+        separators=(",", ":"),
+        sort_keys=True,
+    ).encode("utf-8")
+
+
+def loads(raw: str | bytes) -> Any:
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
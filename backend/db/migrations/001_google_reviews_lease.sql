@@ -0,0 +1,11 @@
+-- google_reviews 분석 작업 lease 컬럼
+-- fetch_unanalyzed_reviews 가 chunk 단위로 작업을 점유할 때 사용한다.
+--   is_analyzed = 'P' 인 행은 lease_owner 워커가 lease_expires_at 까지 점유 중.
+--   lease_expires_at 이 지났거나 NULL 인 'P' 행은 다른 워커가 회수(reclaim)할 수 있다.
+
+ALTER TABLE google_reviews
+    ADD COLUMN IF NOT EXISTS lease_owner TEXT,
+    ADD COLUMN IF NOT EXISTS lease_expires_at TIMESTAMPTZ;
+
+CREATE INDEX IF NOT EXISTS ix_google_reviews_claim
+    ON google_reviews (store_id, is_analyzed, id);
@@ -0,0 +1,14 @@
+-- google_reviews 분석 재시도 예산 / dead-letter 컬럼
+--   analyze_attempts : 점유(claim)될 때마다 1 증가
+--   next_eligible_at : 재시도 가능 시각 (지수 백오프)
+--   last_error       : 마지막 실패 사유
+--   is_analyzed = 'D' : 재시도 예산 소진 (dead-letter), /batch/dead-letter 로 재투입
+
+ALTER TABLE google_reviews
+    ADD COLUMN IF NOT EXISTS analyze_attempts INTEGER NOT NULL DEFAULT 0,
+    ADD COLUMN IF NOT EXISTS next_eligible_at TIMESTAMPTZ,
+    ADD COLUMN IF NOT EXISTS last_error TEXT;
+
+CREATE INDEX IF NOT EXISTS ix_google_reviews_dead_letter
+    ON google_reviews (store_id, id)
+    WHERE is_analyzed = 'D';
@@ -0,0 +1,30 @@
+-- precompute 캐시 response_json 의 content-addressed 저장소
+--   *_cache_blobs   : sha256(정규화 JSON) → response_json 1건
+--   *_cache_history : response_json 대신 response_hash 포인터만 저장
+--   *_cache_current : 조회 경로 유지를 위해 response_json 을 그대로 두고 response_hash 를 함께 저장
+
+CREATE TABLE IF NOT EXISTS cx_analysis_cache_blobs (
+    content_hash TEXT PRIMARY KEY,
+    response_json JSONB NOT NULL,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+CREATE TABLE IF NOT EXISTS b2b_dashboard_cache_blobs (
+    content_hash TEXT PRIMARY KEY,
+    response_json JSONB NOT NULL,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+ALTER TABLE cx_analysis_cache_history
+    ADD COLUMN IF NOT EXISTS response_hash TEXT REFERENCES cx_analysis_cache_blobs (content_hash),
+    ALTER COLUMN response_json DROP NOT NULL;
+
+ALTER TABLE b2b_dashboard_cache_history
+    ADD COLUMN IF NOT EXISTS response_hash TEXT REFERENCES b2b_dashboard_cache_blobs (content_hash),
+    ALTER COLUMN response_json DROP NOT NULL;
+
+ALTER TABLE cx_analysis_cache_current
+    ADD COLUMN IF NOT EXISTS response_hash TEXT;
+
+ALTER TABLE b2b_dashboard_cache_current
+    ADD COLUMN IF NOT EXISTS response_hash TEXT;
@@ -0,0 +1,4 @@
+-- 매장별 high-water mark(MAX(updated_at_google)) 조회용 인덱스
+-- google_review_service.sync_all_reviews_for_user 의 증분 동기화에서 사용
+CREATE INDEX IF NOT EXISTS ix_google_reviews_store_updated
+    ON google_reviews (store_id, updated_at_google DESC);
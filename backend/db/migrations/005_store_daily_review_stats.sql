@@ -0,0 +1,55 @@
+-- 매장 × 일자 리뷰 집계 rollup
+-- 평점 추이(일/주/월) / 별점 분포는 원본 google_reviews 대신 이 테이블에서 계산한다.
+-- (매장당 1년 = 최대 365행)
+-- 적재 경로(google_review_service.sync_all_reviews_for_user)가 영향받은 날짜만 재계산한다.
+
+CREATE TABLE IF NOT EXISTS store_daily_review_stats (
+    store_id        TEXT        NOT NULL,
+    day             DATE        NOT NULL,
+    tenant_id       BIGINT      NOT NULL REFERENCES tenants (id),
+    review_count    INTEGER     NOT NULL DEFAULT 0,
+    rating_sum      INTEGER     NOT NULL DEFAULT 0,
+    star_1          INTEGER     NOT NULL DEFAULT 0,
+    star_2          INTEGER     NOT NULL DEFAULT 0,
+    star_3          INTEGER     NOT NULL DEFAULT 0,
+    star_4          INTEGER     NOT NULL DEFAULT 0,
+    star_5          INTEGER     NOT NULL DEFAULT 0,
+    negative_count  INTEGER     NOT NULL DEFAULT 0,
+    updated_at      TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (store_id, day)
+);
+
+CREATE INDEX IF NOT EXISTS ix_store_daily_review_stats_tenant
+    ON store_daily_review_stats (tenant_id, store_id, day);
+
+-- 기존 리뷰 backfill
+INSERT INTO store_daily_review_stats (
+    store_id, day, tenant_id, review_count, rating_sum,
+    star_1, star_2, star_3, star_4, star_5, negative_count
+)
+SELECT
+    store_id,
+    DATE(created_at_google) AS day,
+    MAX(tenant_id) AS tenant_id,
+    COUNT(*),
+    COALESCE(SUM(rating), 0),
+    COUNT(*) FILTER (WHERE rating = 1),
+    COUNT(*) FILTER (WHERE rating = 2),
+    COUNT(*) FILTER (WHERE rating = 3),
+    COUNT(*) FILTER (WHERE rating = 4),
+    COUNT(*) FILTER (WHERE rating = 5),
+    COUNT(*) FILTER (WHERE rating <= 2)
+FROM google_reviews
+WHERE created_at_google IS NOT NULL
+GROUP BY store_id, DATE(created_at_google)
+ON CONFLICT (store_id, day) DO UPDATE SET
+    tenant_id      = EXCLUDED.tenant_id,
+    review_count   = EXCLUDED.review_count,
+    rating_sum     = EXCLUDED.rating_sum,
+    star_1         = EXCLUDED.star_1,
+    star_2         = EXCLUDED.star_2,
+    star_3         = EXCLUDED.star_3,
+    star_4         = EXCLUDED.star_4,
+    star_5         = EXCLUDED.star_5,
+    negative_count = EXCLUDED.negative_count,
+    updated_at     = NOW();
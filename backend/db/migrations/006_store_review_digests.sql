@@ -0,0 +1,16 @@
+-- 매장 × 일자 리뷰 digest (LLM 요약 1회 결과)
+-- 7D/30D/90D/365D 기간 분석은 이 digest 들을 합산해서 만들고, 원본 리뷰는 다시 LLM 에 보내지 않는다.
+-- source_updated_at: digest 생성 시점의 store_daily_review_stats.updated_at
+--   rollup 이 그 이후 갱신(해당 일자 리뷰 추가/수정)되면 digest 를 다시 만든다.
+
+CREATE TABLE IF NOT EXISTS store_review_digests (
+    store_id          TEXT        NOT NULL,
+    day               DATE        NOT NULL,
+    version           INTEGER     NOT NULL,
+    review_count      INTEGER     NOT NULL DEFAULT 0,
+    digest            JSONB       NOT NULL,
+    source_updated_at TIMESTAMPTZ,
+    created_at        TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    updated_at        TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (store_id, day)
+);
@@ -0,0 +1,22 @@
+-- 리뷰 1건당 1회 계산하는 annotation (감성 / 점수 / aspect / 키워드)
+-- 기간별 감성 분포 / 키워드 클라우드 / 이슈 빈도는 이 테이블 SQL 집계로 계산하고
+-- LLM 은 서술형 텍스트에만 사용한다.
+-- prompt_version 이 현재 버전보다 낮은 행은 annotator 가 다시 계산한다.
+
+CREATE TABLE IF NOT EXISTS review_annotations (
+    review_id       BIGINT      PRIMARY KEY REFERENCES google_reviews (id) ON DELETE CASCADE,
+    tenant_id       BIGINT      NOT NULL,
+    store_id        TEXT        NOT NULL,
+    day             DATE,
+    sentiment       TEXT        NOT NULL,  -- positive / neutral / negative
+    sentiment_score REAL        NOT NULL,  -- -1.0 ~ 1.0
+    aspects         JSONB       NOT NULL DEFAULT '[]'::jsonb,  -- [{"label", "polarity"}]
+    keywords        JSONB       NOT NULL DEFAULT '[]'::jsonb,  -- [{"text", "polarity"}]
+    model           TEXT        NOT NULL,
+    prompt_version  INTEGER     NOT NULL,
+    created_at      TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    updated_at      TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS ix_review_annotations_store_day
+    ON review_annotations (store_id, day);
@@ -0,0 +1,12 @@
+-- annotation 이 어떤 버전의 리뷰로 계산됐는지 (google_reviews.updated_at_google)
+-- 리뷰가 수정돼서 값이 달라지면 annotator 가 다시 계산한다.
+-- 기존 행은 현재 리뷰 기준으로 계산된 것으로 보고 채운다.
+
+ALTER TABLE review_annotations
+    ADD COLUMN IF NOT EXISTS review_updated_at TIMESTAMPTZ;
+
+UPDATE review_annotations a
+SET review_updated_at = r.updated_at_google
+FROM google_reviews r
+WHERE r.id = a.review_id
+  AND a.review_updated_at IS NULL;
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, BigInteger, Text, UniqueConstraint, ForeignKey
+from sqlalchemy import Column, Integer, String, ForeignKey, Date, DateTime, BigInteger, Text, UniqueConstraint, ForeignKey
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
@@ -66,6 +66,14 @@ class GoogleReview(Base):
     created_at_google = Column(DateTime(timezone=True))
     updated_at_google = Column(DateTime(timezone=True))
 
+    # 🔁 시그널 분석 상태 / lease / 재시도 예산 (migrations 001, 002)
+    is_analyzed = Column(String)  # N / P / Y / D
+    lease_owner = Column(Text)
+    lease_expires_at = Column(DateTime(timezone=True))
+    analyze_attempts = Column(Integer, nullable=False, server_default="0")
+    next_eligible_at = Column(DateTime(timezone=True))
+    last_error = Column(Text)
+
     # 🕒 시스템 기준 시간
     created_at = Column(
         DateTime(timezone=True),
@@ -80,4 +88,26 @@ class GoogleReview(Base):
             "google_review_id",
             name="uq_store_google_review",
         ),
-    )
\ No newline at end of file
+    )
+
+class StoreDailyReviewStats(Base):
+    """
+    매장 × 일자(created_at_google 기준) 리뷰 집계 rollup.
+    리뷰 적재 시 review_stats_service.refresh_daily_review_stats 로 갱신한다.
+    """
+    __tablename__ = "store_daily_review_stats"
+
+    store_id = Column(String, primary_key=True)
+    day = Column(Date, primary_key=True)
+    tenant_id = Column(BigInteger, ForeignKey("tenants.id"), nullable=False)
+
+    review_count = Column(Integer, nullable=False, default=0)
+    rating_sum = Column(Integer, nullable=False, default=0)
+    star_1 = Column(Integer, nullable=False, default=0)
+    star_2 = Column(Integer, nullable=False, default=0)
+    star_3 = Column(Integer, nullable=False, default=0)
+    star_4 = Column(Integer, nullable=False, default=0)
+    star_5 = Column(Integer, nullable=False, default=0)
+    negative_count = Column(Integer, nullable=False, default=0)  # rating <= 2
+
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
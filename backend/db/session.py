@@ -1,8 +1,15 @@
+import asyncio
+import math
 import os
-from sqlalchemy import create_engine
+import time
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from sqlalchemy import create_engine, event, text
 from sqlalchemy.orm import sessionmaker
 from dotenv import load_dotenv  # ⭐ 추가
 
+from backend.core import metrics
+
 load_dotenv()  # ⭐ 추가 (가장 중요)
 
 DATABASE_URL = os.getenv("DATABASE_URL")
@@ -10,10 +17,62 @@ DATABASE_URL = os.getenv("DATABASE_URL")
 if not DATABASE_URL:
     raise RuntimeError("❌ DATABASE_URL is not set")
 
+# =========================
+# 커넥션 풀 설정 (sync / async 공용)
+# =========================
+POOL_OPTIONS = {
+    "pool_size": int(os.getenv("DB_POOL_SIZE", "10")),
+    "max_overflow": int(os.getenv("DB_MAX_OVERFLOW", "20")),
+    "pool_recycle": int(os.getenv("DB_POOL_RECYCLE", "1800")),
+    "pool_timeout": int(os.getenv("DB_POOL_TIMEOUT", "30")),
+}
+
+# =========================
+# 쿼리 수 / 소요 시간 (SQLAlchemy event hook)
+# =========================
+DB_QUERY_SECONDS = metrics.histogram(
+    "db_query_duration_seconds",
+    "DB 쿼리 실행 시간 (_count = 쿼리 수)",
+    ["engine", "operation"],
+)
+DB_QUERY_ERRORS = metrics.counter("db_query_errors_total", "DB 쿼리 오류 수", ["engine", "operation"])
+
+_SQL_OPERATIONS = {"SELECT", "INSERT", "UPDATE", "DELETE", "WITH"}
+
+
+def _sql_operation(statement: str) -> str:
+    head = statement.lstrip().split(None, 1)
+    operation = head[0].upper() if head else ""
+    return operation if operation in _SQL_OPERATIONS else "OTHER"
+
+
+def instrument_engine(sync_engine, name: str) -> None:
+    """
+    async 엔진은 .sync_engine 을 넘긴다.
+    """
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        started = conn.info["query_started"].pop()
+        DB_QUERY_SECONDS.observe(time.perf_counter() - started, engine=name, operation=_sql_operation(statement))
+
+    @event.listens_for(sync_engine, "handle_error")
+    def _error(exception_context):
+        conn = exception_context.connection
+        if conn is not None and conn.info.get("query_started"):
+            conn.info["query_started"].pop()
+        DB_QUERY_ERRORS.inc(engine=name, operation=_sql_operation(exception_context.statement or ""))
+
+
 engine = create_engine(
     DATABASE_URL,
     pool_pre_ping=True,
+    **POOL_OPTIONS,
 )
+instrument_engine(engine, "primary")
 
 SessionLocal = sessionmaker(
     autocommit=False,
@@ -26,4 +85,221 @@ def get_db():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+
+# =========================
+# Read replica 라우팅
+# - 읽기 전용 엔드포인트는 get_read_db / get_async_read_db 를 사용
+# - 요청마다 replica 지연(lag)을 확인해서 허용치를 넘거나 오류면 primary 로 보낸다
+# - 배치 writer 등 나머지는 기존 get_db / SessionLocal (primary) 그대로
+# =========================
+REPLICA_DATABASE_URL = os.getenv("REPLICA_DATABASE_URL")
+REPLICA_MAX_LAG_SECONDS = float(os.getenv("REPLICA_MAX_LAG_SECONDS", "5"))
+# lag 조회 결과 재사용 시간(초). 0 이면 요청마다 조회
+REPLICA_LAG_CHECK_INTERVAL = float(os.getenv("REPLICA_LAG_CHECK_INTERVAL", "1"))
+# lag 조회(접속 포함) 제한 시간(초). 넘으면 replica 를 못 쓰는 것으로 보고 primary 로
+REPLICA_PROBE_TIMEOUT_SECONDS = float(os.getenv("REPLICA_PROBE_TIMEOUT_SECONDS", "2"))
+
+# WAL receiver 가 이 시간(초) 안에 primary 메시지(keepalive 포함)를 받았으면 연결이 살아 있는 것으로 본다.
+# primary 는 쓰기가 없어도 wal_sender_timeout / 2 (기본 30초) 마다 keepalive 를 보낸다
+REPLICA_RECEIVER_MAX_IDLE_SECONDS = float(os.getenv("REPLICA_RECEIVER_MAX_IDLE_SECONDS", "60"))
+
+# - 받은 WAL 을 모두 replay 했고 receiver 가 streaming 중이며 최근 메시지가 있으면 0
+#   (primary 에 쓰기가 없어서 replay 시각이 오래된 경우도 여기에 해당)
+# - 그 외에는 마지막으로 replay 된 트랜잭션 시각 기준
+#   (수신이 멈추면 receive == replay LSN 이어도 receiver 조건에서 걸러져 lag 가 커진다)
+# replica 인데 replay 기록이 아직 없으면 NULL → 사용 안 함
+REPLICA_LAG_SQL = text(
+    f"""
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn()
+             AND EXISTS (
+                 SELECT 1 FROM pg_stat_wal_receiver
+                 WHERE status = 'streaming'
+                   AND last_msg_receipt_time > NOW() - make_interval(secs => {REPLICA_RECEIVER_MAX_IDLE_SECONDS})
+             ) THEN 0
+        ELSE EXTRACT(EPOCH FROM NOW() - pg_last_xact_replay_timestamp())
+    END
+    """
+)
+REPLICA_PROBE_STATEMENT_TIMEOUT_SQL = text(
+    f"SET LOCAL statement_timeout = {int(REPLICA_PROBE_TIMEOUT_SECONDS * 1000)}"
+)
+
+replica_engine = (
+    create_engine(
+        REPLICA_DATABASE_URL,
+        pool_pre_ping=True,
+        # 멈춘 replica 에 접속하느라 읽기 요청이 묶이지 않게 (libpq connect_timeout 은 정수 초)
+        connect_args={"connect_timeout": max(math.ceil(REPLICA_PROBE_TIMEOUT_SECONDS), 1)},
+        **POOL_OPTIONS,
+    )
+    if REPLICA_DATABASE_URL
+    else None
+)
+if replica_engine is not None:
+    instrument_engine(replica_engine, "replica")
+
+_replica_state = {"checked_at": 0.0, "usable": False, "lag": None}
+
+
+def _replica_check_due() -> bool:
+    return time.monotonic() - _replica_state["checked_at"] >= REPLICA_LAG_CHECK_INTERVAL
+
+
+def _update_replica_state(lag: float | None, error: Exception | None = None) -> bool:
+    usable = error is None and lag is not None and lag <= REPLICA_MAX_LAG_SECONDS
+    if not usable and _replica_state["usable"]:
+        if error is not None:
+            reason = repr(error)
+        elif lag is None:
+            reason = "replay 기록 없음"
+        else:
+            reason = f"lag={lag:.2f}s > {REPLICA_MAX_LAG_SECONDS}s"
+        print(f"[DB] replica 사용 중단 → primary 로 라우팅 ({reason})")
+    _replica_state.update(checked_at=time.monotonic(), usable=usable, lag=lag)
+    return usable
+
+
+def replica_usable() -> bool:
+    if replica_engine is None:
+        return False
+    if not _replica_check_due():
+        return _replica_state["usable"]
+    try:
+        with replica_engine.connect() as conn:
+            conn.execute(REPLICA_PROBE_STATEMENT_TIMEOUT_SQL)
+            lag = conn.execute(REPLICA_LAG_SQL).scalar()
+        return _update_replica_state(float(lag) if lag is not None else None)
+    except Exception as e:
+        return _update_replica_state(None, e)
+
+
+def get_read_db():
+    db = SessionLocal(bind=replica_engine if replica_usable() else engine)
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+# =========================
+# Async engine (asyncpg) — 읽기 전용 대시보드/알림 조회용
+# =========================
+def to_async_url(url: str) -> str:
+    """
+    postgresql://... → postgresql+asyncpg://...
+    asyncpg 는 sslmode 를 모르므로 ssl 파라미터로 바꿔준다.
+    """
+    parts = urlsplit(url)
+    scheme = parts.scheme.split("+", 1)[0]
+    if scheme in ("postgres", "postgresql"):
+        scheme = "postgresql+asyncpg"
+
+    query = []
+    for key, value in parse_qsl(parts.query, keep_blank_values=True):
+        if key == "sslmode":
+            key = "ssl"
+        query.append((key, value))
+
+    return urlunsplit((scheme, parts.netloc, parts.path, urlencode(query), parts.fragment))
+
+
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL") or to_async_url(DATABASE_URL)
+ASYNC_REPLICA_DATABASE_URL = os.getenv("ASYNC_REPLICA_DATABASE_URL") or (
+    to_async_url(REPLICA_DATABASE_URL) if REPLICA_DATABASE_URL else None
+)
+
+_async_engine = None
+_async_replica_engine = None
+_async_session_factory = None
+
+
+def _create_async_engine(url: str, name: str):
+    from sqlalchemy.ext.asyncio import create_async_engine
+
+    async_engine = create_async_engine(
+        url,
+        pool_pre_ping=True,
+        # pgbouncer(transaction mode) 뒤에서는 prepared statement 캐시를 꺼야 한다
+        connect_args={
+            "statement_cache_size": int(os.getenv("DB_ASYNC_STATEMENT_CACHE_SIZE", "0")),
+            **({"timeout": REPLICA_PROBE_TIMEOUT_SECONDS} if name == "async_replica" else {}),
+        },
+        **POOL_OPTIONS,
+    )
+    instrument_engine(async_engine.sync_engine, name)
+    return async_engine
+
+
+def get_async_engine():
+    """
+    asyncpg 엔진은 첫 사용 시점에 생성한다. (asyncpg 미설치 환경에서도 sync 경로는 동작)
+    """
+    global _async_engine
+    if _async_engine is None:
+        _async_engine = _create_async_engine(ASYNC_DATABASE_URL, "async_primary")
+    return _async_engine
+
+
+def get_async_replica_engine():
+    global _async_replica_engine
+    if _async_replica_engine is None and ASYNC_REPLICA_DATABASE_URL:
+        _async_replica_engine = _create_async_engine(ASYNC_REPLICA_DATABASE_URL, "async_replica")
+    return _async_replica_engine
+
+
+async def async_replica_usable() -> bool:
+    replica = get_async_replica_engine()
+    if replica is None:
+        return False
+    if not _replica_check_due():
+        return _replica_state["usable"]
+
+    async def probe() -> float | None:
+        async with replica.connect() as conn:
+            await conn.execute(REPLICA_PROBE_STATEMENT_TIMEOUT_SQL)
+            return (await conn.execute(REPLICA_LAG_SQL)).scalar()
+
+    try:
+        lag = await asyncio.wait_for(probe(), timeout=REPLICA_PROBE_TIMEOUT_SECONDS)
+        return _update_replica_state(float(lag) if lag is not None else None)
+    except Exception as e:
+        # asyncio.TimeoutError 포함 → primary 로
+        return _update_replica_state(None, e)
+
+
+def get_async_session_factory():
+    global _async_session_factory
+    if _async_session_factory is None:
+        from sqlalchemy.ext.asyncio import async_sessionmaker
+
+        _async_session_factory = async_sessionmaker(
+            bind=get_async_engine(),
+            autoflush=False,
+            expire_on_commit=False,
+        )
+    return _async_session_factory
+
+
+async def get_async_db():
+    async with get_async_session_factory()() as db:
+        yield db
+
+
+async def get_async_read_db():
+    bind = get_async_replica_engine() if await async_replica_usable() else get_async_engine()
+    async with get_async_session_factory()(bind=bind) as db:
+        yield db
+
+
+async def dispose_async_engine() -> None:
+    global _async_engine, _async_replica_engine, _async_session_factory
+    for async_engine in (_async_engine, _async_replica_engine):
+        if async_engine is not None:
+            await async_engine.dispose()
+    _async_engine = None
+    _async_replica_engine = None
+    _async_session_factory = None
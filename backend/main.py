@@ -1,3 +1,8 @@
+import time
+
+# 시작 시간 측정 기준 (이 모듈 import 시작 ~ lifespan 진입)
+_STARTUP_STARTED = time.perf_counter()
+
 from pathlib import Path
 from dotenv import load_dotenv
 
@@ -16,7 +21,9 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from starlette.middleware.sessions import SessionMiddleware
 
+from backend.core.metrics import MetricsMiddleware, metrics_pusher
 from backend.core.socket_manager import sio
+from backend.db.session import dispose_async_engine
 from backend.api.socket_events import redis_listener
 
 from backend.api import (
@@ -35,6 +42,7 @@ from backend.api.batch import router as batch_router
 from backend.api.devices import router as devices_router
 from backend.api.disclosure_candidates import router as disclosure_candidates_router
 from backend.api.disclosure_signals import router as disclosure_signals_router
+from backend.api.metrics import router as metrics_router
 from backend.api.dashboard_competitor_analysis import (
     router as dashboard_competitor_analysis_router,
 )
@@ -47,6 +55,9 @@ from backend.api.precompute_batch import router as precompute_batch_router
 
 ENV = os.getenv("ENV", "local")
 
+# 시작 시간 예산 (초). 검사는 python -m backend.tools.import_profile
+STARTUP_BUDGET_SECONDS = float(os.getenv("STARTUP_BUDGET_SECONDS", "3"))
+
 ALLOWED_ORIGINS = [
     "http://localhost:3000",
     "https://cxnexus.ai",
@@ -59,14 +70,22 @@ ALLOWED_ORIGINS = [
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    # 서버 시작 시 Redis 리스너 백그라운드 실행
-    task = asyncio.create_task(redis_listener())
+    startup_seconds = time.perf_counter() - _STARTUP_STARTED
+    print(f"[startup] ready in {startup_seconds:.2f}s (budget {STARTUP_BUDGET_SECONDS:.1f}s)")
+    if startup_seconds > STARTUP_BUDGET_SECONDS:
+        print("[startup] WARNING 시작 시간 예산 초과 — python -m backend.tools.import_profile 로 원인 확인")
+
+    # 서버 시작 시 Redis 리스너 / 메트릭 스냅샷 업로드 백그라운드 실행
+    tasks = [asyncio.create_task(redis_listener()), asyncio.create_task(metrics_pusher())]
     try:
         yield
     finally:
-        task.cancel()
-        with suppress(asyncio.CancelledError):
-            await task
+        for task in tasks:
+            task.cancel()
+        for task in tasks:
+            with suppress(asyncio.CancelledError):
+                await task
+        await dispose_async_engine()
 
 
 app = FastAPI(
@@ -96,6 +115,11 @@ app.add_middleware(
     https_only=False if ENV == "local" else True,
 )
 
+# =========================
+# 요청 지연 메트릭 (/metrics, 가장 바깥에서 측정)
+# =========================
+app.add_middleware(MetricsMiddleware)
+
 # =========================
 # Routers
 # =========================
@@ -118,6 +142,7 @@ ROUTERS = [
     precompute_batch_router,
     notifications_router,
     devices_router,
+    metrics_router,
 ]
 
 for router in ROUTERS:
@@ -1,5 +1,4 @@
 from typing import List
-import pandas as pd
 from fastapi import UploadFile
 from io import BytesIO
 
@@ -14,6 +13,9 @@ async def extract_reviews_from_file(file: UploadFile) -> List[str]:
     - 셀 내부 줄바꿈은 정리하되, 리뷰를 쪼개지는 않음
     """
 
+    # pandas 는 import 비용이 커서 파일 업로드 분석 때만 불러온다
+    import pandas as pd
+
     content = await file.read()
 
     # =========================
@@ -1,54 +1,220 @@
+from typing import Any, Iterator
+
 from fastapi import UploadFile
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
-from datetime import datetime, timedelta, timezone
+from datetime import date, datetime, timedelta, timezone
 
 from backend.parser.file_parser import extract_reviews_from_file
 from backend.analysis.basic_sentiment import analyze_basic_sentiment
-from backend.analysis.cx_dashboard import analyze_cx_dashboard
+from backend.analysis.cx_dashboard import (
+    analyze_cx_dashboard,
+    analyze_cx_dashboard_from_digest,
+    stream_cx_dashboard,
+)
+from backend.analysis.llm_scheduler import llm_tenant
+from backend.analysis.review_digest import reduce_digests
 
 from backend.db.models import GoogleReview
+from backend.service.review_annotation_service import (
+    apply_annotation_aggregates,
+    get_annotation_aggregates,
+)
+from backend.service.review_digest_service import ensure_daily_digests, load_daily_digests
+from backend.service.review_stats_service import get_rating_distribution
 
 
-async def analyze_file_sentiment(file: UploadFile):
+async def analyze_file_sentiment(file: UploadFile, use_llm: bool = True):
     reviews = await extract_reviews_from_file(file)
-    return analyze_basic_sentiment(reviews)
+    # LLM 호출(스케줄러 대기 포함)이 동기라서 이벤트 루프를 막지 않도록 threadpool 에서 실행
+    return await run_in_threadpool(analyze_basic_sentiment, reviews, use_llm=use_llm)
 
 
-def analyze_store_cx_by_period(
+def _load_store_cx_inputs(
     store_id: str,
     from_date: str,
     to_date: str,
     db: Session,
-):
+) -> tuple[dict, list[dict], dict]:
     """
-    1️⃣ DB에서 리뷰 조회
-    2️⃣ 텍스트만 추출
-    3️⃣ LLM 분석
-    4️⃣ 별점 분포 / 리뷰 수 추가 반환
+    CX 분석 입력 조회: (rollup 리뷰 수/별점 분포, LLM 표본용 리뷰 레코드, annotation 집계)
     """
-
     start_dt, end_dt = _parse_date_range(from_date, to_date)
 
-    reviews = (
-        db.query(GoogleReview)
+    # 리뷰 수 / 별점 분포는 store_daily_review_stats rollup 에서 집계
+    stats = get_rating_distribution(
+        db,
+        store_id=store_id,
+        from_date=start_dt.date(),
+        to_date=(end_dt - timedelta(days=1)).date(),
+    )
+
+    # LLM 표본 추출용 컬럼만 조회 (ORM 객체 전체를 로딩하지 않음)
+    rows = (
+        db.query(
+            GoogleReview.comment,
+            GoogleReview.rating,
+            GoogleReview.created_at_google,
+        )
         .filter(
             GoogleReview.store_id == store_id,
             GoogleReview.created_at_google >= start_dt,
             GoogleReview.created_at_google < end_dt,
         )
-        .order_by(GoogleReview.created_at_google.desc())
         .all()
     )
 
-    print(f"reviews: {reviews}")
+    print(f"reviews: {stats['review_count']}")
 
-    review_texts = [
-        r.comment
-        for r in reviews
-        if r.comment and len(r.comment.strip()) > 3
+    review_records = [
+        {"text": comment, "rating": rating, "created_at": created_at}
+        for comment, rating, created_at in rows
+        if comment and len(comment.strip()) > 3
     ]
 
-    if not review_texts:
+    aggregates = get_annotation_aggregates(
+        db,
+        store_id=store_id,
+        from_date=start_dt.date(),
+        to_date=(end_dt - timedelta(days=1)).date(),
+    ) if review_records else None
+
+    return stats, review_records, aggregates
+
+
+def _empty_cx_response() -> dict:
+    return {
+        "message": "분석할 리뷰가 없습니다.",
+        "total": 0,
+        "review_count": 0,
+        "rating_distribution": [
+            {"stars": 5, "count": 0},
+            {"stars": 4, "count": 0},
+            {"stars": 3, "count": 0},
+            {"stars": 2, "count": 0},
+            {"stars": 1, "count": 0},
+        ],
+    }
+
+
+def analyze_store_cx_by_period(
+    store_id: str,
+    from_date: str,
+    to_date: str,
+    db: Session,
+):
+    """
+    1️⃣ DB에서 리뷰 조회
+    2️⃣ 텍스트만 추출
+    3️⃣ LLM 분석
+    4️⃣ 별점 분포 / 리뷰 수 추가 반환
+    """
+
+    stats, review_records, aggregates = _load_store_cx_inputs(store_id, from_date, to_date, db)
+
+    if not review_records:
+        return _empty_cx_response()
+
+    # 1) LLM 분석 결과 (스케줄러 공정 분배 단위 = 매장)
+    with llm_tenant(f"store:{store_id}"):
+        llm_result = analyze_cx_dashboard(review_records)
+
+    # 2) 감성 분포 / 키워드는 review_annotations 집계값으로 대체 (커버리지 충분할 때)
+    llm_result = apply_annotation_aggregates(llm_result, aggregates, stats["review_count"])
+
+    # 3) LLM 결과 + rollup 집계값 합쳐서 반환
+    return {
+        **llm_result,
+        "review_count": stats["review_count"],
+        "rating_distribution": stats["rating_distribution"],
+    }
+
+
+def stream_store_cx_by_period(
+    store_id: str,
+    from_date: str,
+    to_date: str,
+    db: Session,
+) -> Iterator[tuple[str, Any]]:
+    """
+    analyze_store_cx_by_period 의 스트리밍 버전. (event, data) 를 순서대로 yield 한다.
+    - "meta": 리뷰 수 / 별점 분포 (DB 값이라 바로 나감)
+    - "section": LLM 최상위 섹션이 완성될 때마다 {"name", "data"}
+    - "done": analyze_store_cx_by_period 와 같은 최종 응답
+
+    DB 조회는 여기서 먼저 끝내고 LLM 스트리밍만 generator 로 넘긴다.
+    (응답을 스트리밍하는 동안에는 요청 DB 세션이 이미 닫혀 있을 수 있음)
+    """
+    stats, review_records, aggregates = _load_store_cx_inputs(store_id, from_date, to_date, db)
+    return _stream_store_cx_events(stats, review_records, aggregates, tenant=f"store:{store_id}")
+
+
+def _stream_store_cx_events(
+    stats: dict,
+    review_records: list[dict],
+    aggregates: dict | None,
+    *,
+    tenant: str,
+) -> Iterator[tuple[str, Any]]:
+    yield "meta", {
+        "review_count": stats["review_count"],
+        "rating_distribution": stats["rating_distribution"],
+    }
+
+    if not review_records:
+        yield "done", _empty_cx_response()
+        return
+
+    # annotation 집계로 대체될 섹션은 LLM 값 대신 집계값을 내보낸다
+    overrides = apply_annotation_aggregates({}, aggregates, stats["review_count"])
+
+    for event, data in stream_cx_dashboard(review_records, tenant=tenant):
+        if event == "section":
+            name = data["name"]
+            yield "section", {"name": name, "data": overrides.get(name, data["data"])}
+            continue
+
+        if data.get("error") is True:
+            yield "error", data
+            return
+
+        yield "done", {
+            **data,
+            **overrides,
+            "review_count": stats["review_count"],
+            "rating_distribution": stats["rating_distribution"],
+        }
+
+
+def analyze_store_cx_from_digests(
+    store_id: str,
+    from_date: date,
+    to_date: date,
+    db: Session,
+    *,
+    refresh_digests: bool = True,
+):
+    """
+    analyze_store_cx_by_period 의 배치용 버전.
+    원본 리뷰 대신 일자별 digest 를 합산해서 LLM 에 보낸다.
+
+    refresh_digests=False 면 digest 갱신(ensure_daily_digests)을 호출한 쪽이 이미 했다고 보고 건너뛴다.
+    """
+    if refresh_digests:
+        ensure_daily_digests(db, store_id=store_id, from_date=from_date, to_date=to_date)
+
+    stats = get_rating_distribution(
+        db,
+        store_id=store_id,
+        from_date=from_date,
+        to_date=to_date,
+    )
+
+    digest = reduce_digests(
+        load_daily_digests(db, store_id=store_id, from_date=from_date, to_date=to_date)
+    )
+
+    if not digest["review_count"]:
         return {
             "message": "분석할 리뷰가 없습니다.",
             "total": 0,
@@ -62,32 +228,17 @@ def analyze_store_cx_by_period(
             ],
         }
 
-    # 1) LLM 분석 결과
-    llm_result = analyze_cx_dashboard(review_texts)
-
-    # 2) 기간 내 전체 리뷰 수
-    review_count = len(reviews)
-
-    # 3) 별점 분포 계산
-    rating_counter = {1: 0, 2: 0, 3: 0, 4: 0, 5: 0}
-
-    for r in reviews:
-        if r.rating in rating_counter:
-            rating_counter[r.rating] += 1
-
-    rating_distribution = [
-        {"stars": 5, "count": rating_counter[5]},
-        {"stars": 4, "count": rating_counter[4]},
-        {"stars": 3, "count": rating_counter[3]},
-        {"stars": 2, "count": rating_counter[2]},
-        {"stars": 1, "count": rating_counter[1]},
-    ]
+    llm_result = analyze_cx_dashboard_from_digest(digest)
+    llm_result = apply_annotation_aggregates(
+        llm_result,
+        get_annotation_aggregates(db, store_id=store_id, from_date=from_date, to_date=to_date),
+        stats["review_count"],
+    )
 
-    # 4) LLM 결과 + DB 집계값 합쳐서 반환
     return {
         **llm_result,
-        "review_count": review_count,
-        "rating_distribution": rating_distribution,
+        "review_count": stats["review_count"],
+        "rating_distribution": stats["rating_distribution"],
     }
 
 
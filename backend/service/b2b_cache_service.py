@@ -4,10 +4,16 @@ import os
 import uuid
 from datetime import datetime
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 from dotenv import load_dotenv
-from supabase import Client, create_client
+
+from backend.core.cache import ReadThroughCache
+from backend.service.cache_write_buffer import CacheWriteBuffer, response_hash
+
+# supabase 클라이언트 라이브러리는 첫 get_supabase_client() 때 불러온다
+if TYPE_CHECKING:
+    from supabase import Client
 
 
 env_path = Path(__file__).resolve().parents[1] / ".env"
@@ -15,12 +21,21 @@ load_dotenv(env_path)
 
 _supabase_client: Client | None = None
 
+# 배치가 돌 때만 바뀌는 데이터라 조회는 L1(프로세스) → L2(Redis) 캐시를 먼저 본다.
+_current_cache = ReadThroughCache(
+    "b2b_dashboard_cache_current",
+    local_ttl_seconds=float(os.getenv("DASHBOARD_CACHE_LOCAL_TTL_SECONDS", "60")),
+    redis_ttl_seconds=int(os.getenv("DASHBOARD_CACHE_REDIS_TTL_SECONDS", "3600")),
+)
+
 
 def get_supabase_client() -> Client:
     global _supabase_client
     if _supabase_client is not None:
         return _supabase_client
 
+    from supabase import create_client
+
     supabase_url = os.getenv("SUPABASE_URL", "").strip()
     supabase_service_role_key = os.getenv("SUPABASE_SERVICE_ROLE_KEY", "").strip()
 
@@ -60,6 +75,9 @@ def build_b2b_cache_payloads(
     response_json: dict[str, Any],
     batch_run_id: str | None = None,
 ) -> tuple[dict[str, Any], dict[str, Any]]:
+    content_hash = response_hash(response_json)
+
+    # history 에는 본문 대신 blob 포인터만 저장
     payload_history = {
         "tenant_id": str(tenant_id),
         "analysis_type": analysis_type,
@@ -68,7 +86,7 @@ def build_b2b_cache_payloads(
         "window_end_at": window_end_at.isoformat() if window_end_at else None,
         "generated_at": generated_at.isoformat(),
         "status": status,
-        "response_json": response_json,
+        "response_hash": content_hash,
         "batch_run_id": batch_run_id or str(uuid.uuid4()),
     }
 
@@ -81,11 +99,24 @@ def build_b2b_cache_payloads(
         "generated_at": generated_at.isoformat(),
         "status": status,
         "response_json": response_json,
+        "response_hash": content_hash,
     }
 
     return payload_history, payload_current
 
 
+def make_b2b_cache_writer(flush_size: int = 50) -> CacheWriteBuffer:
+    return CacheWriteBuffer(
+        get_client=get_supabase_client,
+        blob_table="b2b_dashboard_cache_blobs",
+        history_table="b2b_dashboard_cache_history",
+        current_table="b2b_dashboard_cache_current",
+        current_on_conflict="tenant_id,analysis_type,period_type",
+        cache=_current_cache,
+        flush_size=flush_size,
+    )
+
+
 def save_b2b_cache_result(
     *,
     tenant_id: int | str,
@@ -97,9 +128,12 @@ def save_b2b_cache_result(
     status: str,
     response_json: dict[str, Any],
     batch_run_id: str,
+    writer: CacheWriteBuffer | None = None,
 ) -> None:
-    supabase = get_supabase_client()
-
+    """
+    writer 를 넘기면 버퍼에 적재만 하고(저장은 writer.flush 시점),
+    없으면 즉시 저장한다.
+    """
     payload_history, payload_current = build_b2b_cache_payloads(
         tenant_id=tenant_id,
         analysis_type=analysis_type,
@@ -112,17 +146,28 @@ def save_b2b_cache_result(
         batch_run_id=batch_run_id,
     )
 
-    supabase.table("b2b_dashboard_cache_history").insert(payload_history).execute()
-    supabase.table("b2b_dashboard_cache_current").upsert(
-        payload_current,
-        on_conflict="tenant_id,analysis_type,period_type",
-    ).execute()
+    buffered = writer is not None
+    writer = writer or make_b2b_cache_writer()
+    writer.add(payload_history, payload_current, cache_key=(str(tenant_id), analysis_type, period_type))
+    if not buffered:
+        writer.flush()
 
 
 def get_b2b_cache_current(
     tenant_id: int | str,
     analysis_type: str,
     period_type: str,
+) -> dict[str, Any] | None:
+    return _current_cache.get(
+        (str(tenant_id), analysis_type, period_type),
+        lambda: _fetch_b2b_cache_current(tenant_id, analysis_type, period_type),
+    )
+
+
+def _fetch_b2b_cache_current(
+    tenant_id: int | str,
+    analysis_type: str,
+    period_type: str,
 ) -> dict[str, Any] | None:
     supabase = get_supabase_client()
 
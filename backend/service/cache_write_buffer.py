@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import hashlib
+from typing import Any, Callable
+
+from backend.core.cache import ReadThroughCache
+from backend.core.serialization import canonical_dumps
+
+
+def response_hash(response_json: dict[str, Any]) -> str:
+    """
+    response_json 의 content hash.
+    키 순서/공백, orjson 설치 여부와 무관하게 같은 내용이면 같은 hash 가 나오도록 정규화 후 sha256.
+    """
+    return hashlib.sha256(canonical_dumps(response_json)).hexdigest()
+
+
+class CacheWriteBuffer:
+    """
+    precompute 배치 결과를 모아 두었다가 테이블별 multi-row 호출로 한 번에 저장한다.
+
+    flush 1회 = blob upsert 1번 + history insert 1번 + current upsert 1번.
+    같은 response_json 은 blob 1건만 남고 history 에는 response_hash 포인터만 쌓인다.
+    """
+
+    def __init__(
+        self,
+        *,
+        get_client: Callable[[], Any],
+        blob_table: str,
+        history_table: str,
+        current_table: str,
+        current_on_conflict: str,
+        cache: ReadThroughCache | None = None,
+        flush_size: int = 50,
+    ) -> None:
+        self._get_client = get_client
+        self.blob_table = blob_table
+        self.history_table = history_table
+        self.current_table = current_table
+        self.current_on_conflict = current_on_conflict
+        self.current_key_fields = tuple(current_on_conflict.split(","))
+        self.cache = cache
+        self.flush_size = flush_size
+
+        self._blobs: dict[str, dict[str, Any]] = {}
+        self._history: list[dict[str, Any]] = []
+        self._current: dict[tuple, dict[str, Any]] = {}
+        self._cache_keys: list[tuple] = []
+
+        self.stats = {
+            "flushes": 0,
+            "rows": 0,
+            "unique_blobs": 0,
+            "blobs_written": 0,
+        }
+
+    def __len__(self) -> int:
+        return len(self._history)
+
+    def add(
+        self,
+        payload_history: dict[str, Any],
+        payload_current: dict[str, Any],
+        cache_key: tuple | None = None,
+    ) -> None:
+        content_hash = payload_current["response_hash"]
+        if content_hash not in self._blobs:
+            self._blobs[content_hash] = {
+                "content_hash": content_hash,
+                "response_json": payload_current["response_json"],
+            }
+
+        self._history.append(payload_history)
+
+        # 같은 flush 안에서 같은 current 키가 두 번 나오면 upsert 가 실패하므로 마지막 값만 유지
+        current_key = tuple(payload_current[field] for field in self.current_key_fields)
+        self._current[current_key] = payload_current
+
+        if cache_key is not None:
+            self._cache_keys.append(cache_key)
+
+        if len(self._history) >= self.flush_size:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self._history:
+            return
+
+        supabase = self._get_client()
+
+        blobs = list(self._blobs.values())
+        res = (
+            supabase.table(self.blob_table)
+            .upsert(blobs, on_conflict="content_hash", ignore_duplicates=True)
+            .execute()
+        )
+        supabase.table(self.history_table).insert(self._history).execute()
+        supabase.table(self.current_table).upsert(
+            list(self._current.values()),
+            on_conflict=self.current_on_conflict,
+        ).execute()
+
+        if self.cache is not None:
+            for key in self._cache_keys:
+                self.cache.invalidate(key)
+
+        self.stats["flushes"] += 1
+        self.stats["rows"] += len(self._history)
+        self.stats["unique_blobs"] += len(blobs)
+        self.stats["blobs_written"] += len(res.data or [])
+
+        print(
+            f"[cache-writer] flush {self.history_table} "
+            f"rows={len(self._history)} blobs={len(blobs)} new_blobs={len(res.data or [])}"
+        )
+
+        self._blobs.clear()
+        self._history.clear()
+        self._current.clear()
+        self._cache_keys.clear()
@@ -4,10 +4,16 @@ import os
 import uuid
 from datetime import datetime
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 from dotenv import load_dotenv
-from supabase import Client, create_client
+
+from backend.core.cache import ReadThroughCache
+from backend.service.cache_write_buffer import CacheWriteBuffer, response_hash
+
+# supabase 클라이언트 라이브러리는 첫 get_supabase_client() 때 불러온다
+if TYPE_CHECKING:
+    from supabase import Client
 
 
 env_path = Path(__file__).resolve().parents[1] / ".env"
@@ -15,12 +21,23 @@ load_dotenv(env_path)
 
 _supabase_client: Client | None = None
 
+CX_ANALYSIS_TYPE = "CX"
+
+# 배치가 돌 때만 바뀌는 데이터라 조회는 L1(프로세스) → L2(Redis) 캐시를 먼저 본다.
+_current_cache = ReadThroughCache(
+    "cx_analysis_cache_current",
+    local_ttl_seconds=float(os.getenv("DASHBOARD_CACHE_LOCAL_TTL_SECONDS", "60")),
+    redis_ttl_seconds=int(os.getenv("DASHBOARD_CACHE_REDIS_TTL_SECONDS", "3600")),
+)
+
 
 def get_supabase_client() -> Client:
     global _supabase_client
     if _supabase_client is not None:
         return _supabase_client
 
+    from supabase import create_client
+
     supabase_url = os.getenv("SUPABASE_URL", "").strip()
     supabase_service_role_key = os.getenv("SUPABASE_SERVICE_ROLE_KEY", "").strip()
 
@@ -55,6 +72,9 @@ def build_cx_cache_payloads(
     response_json: dict[str, Any],
     batch_run_id: str | None = None,
 ) -> tuple[dict[str, Any], dict[str, Any]]:
+    content_hash = response_hash(response_json)
+
+    # history 에는 본문 대신 blob 포인터만 저장
     payload_history = {
         "store_id": store_id,
         "period_type": period_type,
@@ -62,7 +82,7 @@ def build_cx_cache_payloads(
         "window_end_at": window_end_at.isoformat(),
         "generated_at": generated_at.isoformat(),
         "status": status,
-        "response_json": response_json,
+        "response_hash": content_hash,
         "batch_run_id": batch_run_id or str(uuid.uuid4()),
     }
 
@@ -74,11 +94,24 @@ def build_cx_cache_payloads(
         "generated_at": generated_at.isoformat(),
         "status": status,
         "response_json": response_json,
+        "response_hash": content_hash,
     }
 
     return payload_history, payload_current
 
 
+def make_cx_cache_writer(flush_size: int = 50) -> CacheWriteBuffer:
+    return CacheWriteBuffer(
+        get_client=get_supabase_client,
+        blob_table="cx_analysis_cache_blobs",
+        history_table="cx_analysis_cache_history",
+        current_table="cx_analysis_cache_current",
+        current_on_conflict="store_id,period_type",
+        cache=_current_cache,
+        flush_size=flush_size,
+    )
+
+
 def save_cx_cache_result(
     *,
     store_id: str,
@@ -89,9 +122,12 @@ def save_cx_cache_result(
     status: str,
     response_json: dict[str, Any],
     batch_run_id: str,
+    writer: CacheWriteBuffer | None = None,
 ) -> None:
-    supabase = get_supabase_client()
-
+    """
+    writer 를 넘기면 버퍼에 적재만 하고(저장은 writer.flush 시점),
+    없으면 즉시 저장한다.
+    """
     payload_history, payload_current = build_cx_cache_payloads(
         store_id=store_id,
         period_type=period_type,
@@ -103,14 +139,21 @@ def save_cx_cache_result(
         batch_run_id=batch_run_id,
     )
 
-    supabase.table("cx_analysis_cache_history").insert(payload_history).execute()
-    supabase.table("cx_analysis_cache_current").upsert(
-        payload_current,
-        on_conflict="store_id,period_type",
-    ).execute()
+    buffered = writer is not None
+    writer = writer or make_cx_cache_writer()
+    writer.add(payload_history, payload_current, cache_key=(store_id, CX_ANALYSIS_TYPE, period_type))
+    if not buffered:
+        writer.flush()
 
 
 def get_cx_cache_current(store_id: str, period_type: str) -> dict[str, Any] | None:
+    return _current_cache.get(
+        (store_id, CX_ANALYSIS_TYPE, period_type),
+        lambda: _fetch_cx_cache_current(store_id, period_type),
+    )
+
+
+def _fetch_cx_cache_current(store_id: str, period_type: str) -> dict[str, Any] | None:
     supabase = get_supabase_client()
 
     res = (
@@ -1,18 +1,17 @@
 # backend/service/dashboard_service.py
 
 from sqlalchemy.orm import Session
-from sqlalchemy import func
 from datetime import date
 from typing import Literal
 
-from backend.db.models import GoogleReview
+from backend.service.review_stats_service import get_rating_trend_from_stats
 
 
 def get_rating_trend(
     *,
     db: Session,
     store_id: str,
-    unit: Literal["day", "month"],
+    unit: Literal["day", "week", "month"],
     from_date: date | None,
     to_date: date | None,
 ):
@@ -20,30 +19,15 @@ def get_rating_trend(
     평점 추이 데이터 생성
     """
 
-    # 📌 그룹 기준
-    if unit == "day":
-        group_col = func.date(GoogleReview.created_at_google)
-    else:
-        group_col = func.date_trunc("month", GoogleReview.created_at_google)
-
-    query = (
-        db.query(
-            group_col.label("date"),
-            func.avg(GoogleReview.rating).label("avg_rating"),
-            func.count(GoogleReview.id).label("review_count"),
-        )
-        .filter(GoogleReview.store_id == store_id)
-        .group_by(group_col)
-        .order_by(group_col)
+    # 📌 store_daily_review_stats rollup 에서 unit 단위로 합산
+    rows = get_rating_trend_from_stats(
+        db,
+        store_id=store_id,
+        unit=unit,
+        from_date=from_date,
+        to_date=to_date,
     )
 
-    if from_date:
-        query = query.filter(GoogleReview.created_at_google >= from_date)
-    if to_date:
-        query = query.filter(GoogleReview.created_at_google <= to_date)
-
-    rows = query.all()
-
     # 🔥 highlight 계산
     result = []
     prev_rating = None
@@ -57,11 +41,11 @@ def get_rating_trend(
 
         result.append(
             {
-                "date": r.date.strftime("%Y-%m-%d")
-                if unit == "day"
-                else r.date.strftime("%Y-%m"),
+                "date": r.date.strftime("%Y-%m")
+                if unit == "month"
+                else r.date.strftime("%Y-%m-%d"),
                 "avg_rating": avg_rating,
-                "review_count": r.review_count,
+                "review_count": int(r.review_count),
                 "highlight": highlight,
             }
         )
@@ -5,6 +5,7 @@ from typing import Dict, List
 from sqlalchemy import text
 from sqlalchemy.orm import Session
 
+from backend.analysis.llm_scheduler import llm_tenant
 from backend.service.signal_classifier import classify_signal
 from backend.service.llm_signal_classifier import classify_signal_with_llm
 
@@ -58,10 +59,11 @@ def create_signals_from_candidates(
             skipped_count += 1
             continue
 
-        classified = classify_signal_with_llm(
-            source="dart",
-            text=report_nm,
-        )
+        with llm_tenant(f"tenant:{tenant_id}"):
+            classified = classify_signal_with_llm(
+                source="dart",
+                text=report_nm,
+            )
 
         if not classified:
             classified = classify_signal(report_nm)
@@ -1,11 +1,116 @@
-from sqlalchemy.orm import Session
+import os
+import time as time_module
 from datetime import datetime, date, time
-from typing import Dict
+from typing import Any, Dict, List, Optional, Set
+
+from sqlalchemy import case, func, literal_column, null
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
 
 from backend.collectors.business_profile_client import (
-    fetch_all_google_reviews,
+    fetch_google_reviews_incremental,
+    parse_google_time,
+)
+from backend.db.models import GoogleReview, User
+from backend.service.review_stats_service import (
+    get_rating_trend_from_stats,
+    refresh_daily_review_stats,
 )
-from backend.db.models import GoogleReview
+
+
+# bulk upsert 1회당 최대 row 수
+UPSERT_CHUNK_SIZE = int(os.getenv("GOOGLE_REVIEW_UPSERT_CHUNK_SIZE", "500"))
+
+STAR_RATING = {
+    "ONE": 1,
+    "TWO": 2,
+    "THREE": 3,
+    "FOUR": 4,
+    "FIVE": 5,
+}
+
+
+def _get_high_water_marks(db: Session, tenant_id: int) -> Dict[str, datetime]:
+    """
+    매장(store_id = Location name)별 마지막으로 저장된 Google updateTime.
+    """
+    rows = (
+        db.query(
+            GoogleReview.store_id,
+            func.max(GoogleReview.updated_at_google),
+        )
+        .filter(GoogleReview.tenant_id == tenant_id)
+        .group_by(GoogleReview.store_id)
+        .all()
+    )
+    return {store_id: updated for store_id, updated in rows if updated is not None}
+
+
+def _to_review_row(tenant_id: int, store_id: str, r: Dict) -> Optional[Dict]:
+    name = r.get("name") or r.get("reviewId")
+    if not name:
+        return None
+
+    return {
+        "tenant_id": tenant_id,
+        "store_id": store_id,
+        "google_review_id": name,
+        "author_name": (r.get("reviewer") or {}).get("displayName"),
+        "rating": STAR_RATING.get(r.get("starRating")),
+        "comment": r.get("comment"),
+        "created_at_google": parse_google_time(r.get("createTime")),
+        "updated_at_google": parse_google_time(r.get("updateTime")),
+    }
+
+
+def _bulk_upsert_reviews(db: Session, rows: List[Dict]) -> Dict[str, Any]:
+    """
+    INSERT ... ON CONFLICT (store_id, google_review_id) DO UPDATE
+    - 수정된 리뷰(updateTime 변경)만 갱신하고, 변경 없는 리뷰는 건드리지 않는다.
+    """
+    inserted = 0
+    updated = 0
+    # store_id → insert/update 된 리뷰의 일자(DATE(created_at_google)) : rollup 재계산 대상
+    changed: Dict[str, Set[date]] = {}
+
+    for i in range(0, len(rows), UPSERT_CHUNK_SIZE):
+        chunk = rows[i:i + UPSERT_CHUNK_SIZE]
+        stmt = insert(GoogleReview).values(chunk)
+        # 본문이 바뀐 리뷰는 시그널 분석을 처음부터 다시 하도록 분석 상태 / 재시도 예산 / lease 를 초기화
+        comment_changed = GoogleReview.comment.is_distinct_from(stmt.excluded.comment)
+        stmt = stmt.on_conflict_do_update(
+            constraint="uq_store_google_review",
+            set_={
+                "author_name": stmt.excluded.author_name,
+                "rating": stmt.excluded.rating,
+                "comment": stmt.excluded.comment,
+                "updated_at_google": stmt.excluded.updated_at_google,
+                "is_analyzed": case((comment_changed, "N"), else_=GoogleReview.is_analyzed),
+                "analyze_attempts": case((comment_changed, 0), else_=GoogleReview.analyze_attempts),
+                "next_eligible_at": case((comment_changed, null()), else_=GoogleReview.next_eligible_at),
+                "last_error": case((comment_changed, null()), else_=GoogleReview.last_error),
+                "lease_owner": case((comment_changed, null()), else_=GoogleReview.lease_owner),
+                "lease_expires_at": case((comment_changed, null()), else_=GoogleReview.lease_expires_at),
+            },
+            where=GoogleReview.updated_at_google.is_distinct_from(
+                stmt.excluded.updated_at_google
+            ),
+        ).returning(
+            GoogleReview.store_id,
+            func.date(GoogleReview.created_at_google).label("day"),
+            literal_column("(xmax = 0)").label("inserted"),
+        )
+
+        for row in db.execute(stmt):
+            if row.inserted:
+                inserted += 1
+            else:
+                updated += 1
+
+            if row.day is not None:
+                changed.setdefault(row.store_id, set()).add(row.day)
+
+    return {"inserted": inserted, "updated": updated, "changed": changed}
 
 
 # =========================================================
@@ -18,48 +123,48 @@ def sync_all_reviews_for_user(
 ) -> Dict[str, int]:
     """
     로그인한 유저의 Google 계정 기준
-    모든 매장의 리뷰를 DB에 저장
+    모든 매장의 신규/수정 리뷰만 받아서 DB에 bulk upsert
+
+    - 매장별 high-water mark(updated_at_google 최대값) 이후 리뷰만 수집
+    - Location 단위로 병렬 수집
     """
+    started = time_module.perf_counter()
 
-    reviews = fetch_all_google_reviews(
+    user = db.query(User).filter(User.id == user_id).one()
+    high_water_marks = _get_high_water_marks(db, user.tenant_id)
+
+    by_location = fetch_google_reviews_incremental(
         user_id=user_id,
         db=db,
+        high_water_marks=high_water_marks,
     )
-
-    saved = 0
-    skipped = 0
-
-    for r in reviews:
-        review_id = r["name"]  # Google review resource name
-
-        exists = (
-            db.query(GoogleReview)
-            .filter(GoogleReview.review_id == review_id)
-            .first()
-        )
-
-        if exists:
-            skipped += 1
-            continue
-
-        review = GoogleReview(
-            review_id=review_id,
-            store_id=r["name"].split("/reviews/")[0],
-            rating=r.get("starRating"),
-            comment=r.get("comment"),
-            create_time=r.get("createTime"),
-        )
-
-        db.add(review)
-        saved += 1
-
+    fetched_at = time_module.perf_counter()
+
+    rows: Dict[tuple, Dict] = {}
+    total_fetched = 0
+    for store_id, reviews in by_location.items():
+        total_fetched += len(reviews)
+        for r in reviews:
+            row = _to_review_row(user.tenant_id, store_id, r)
+            if row is not None:
+                rows[(store_id, row["google_review_id"])] = row
+
+    result = _bulk_upsert_reviews(db, list(rows.values()))
+    stats_days = refresh_daily_review_stats(db, result["changed"])
     db.commit()
 
-    return {
-        "total_fetched": len(reviews),
-        "saved": saved,
-        "skipped": skipped,
+    stats = {
+        "locations": len(by_location),
+        "total_fetched": total_fetched,
+        "saved": result["inserted"],
+        "updated": result["updated"],
+        "skipped": total_fetched - result["inserted"] - result["updated"],
+        "stats_days": stats_days,
+        "fetch_seconds": round(fetched_at - started, 3),
+        "upsert_seconds": round(time_module.perf_counter() - fetched_at, 3),
     }
+    print(f"[google-review-sync] user_id={user_id} {stats}")
+    return stats
 
 
 # =========================================================
@@ -97,31 +202,21 @@ def get_rating_trend_by_period(
     start_date: date,
     end_date: date,
 ):
-    from sqlalchemy import func
-
-    start_dt = datetime.combine(start_date, time.min)
-    end_dt = datetime.combine(end_date, time.max)
-
-    rows = (
-        db.query(
-            func.date(GoogleReview.created_at_google).label("date"),
-            func.avg(GoogleReview.rating).label("avg_rating"),
-            func.count().label("count"),
-        )
-        .filter(GoogleReview.tenant_id == tenant_id)
-        .filter(GoogleReview.store_id == store_id)
-        .filter(GoogleReview.created_at_google >= start_dt)
-        .filter(GoogleReview.created_at_google <= end_dt)
-        .group_by(func.date(GoogleReview.created_at_google))
-        .order_by(func.date(GoogleReview.created_at_google))
-        .all()
+    # store_daily_review_stats rollup 에서 조회 (매장당 기간 일수만큼의 row)
+    rows = get_rating_trend_from_stats(
+        db,
+        store_id=store_id,
+        unit="day",
+        from_date=start_date,
+        to_date=end_date,
+        tenant_id=tenant_id,
     )
 
     return [
         {
             "date": r.date,
-            "avg_rating": round(float(r.avg_rating), 2),
-            "count": r.count,
+            "avg_rating": round(float(r.avg_rating or 0), 2),
+            "count": int(r.review_count),
         }
         for r in rows
     ]
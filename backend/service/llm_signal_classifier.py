@@ -2,9 +2,18 @@ from __future__ import annotations
 
 import json
 import os
-from typing import Optional, Dict
+import time
+from typing import TYPE_CHECKING, Optional, Dict
 
-from openai import OpenAI
+
+from backend.analysis.llm_resilience import LLMUnavailable
+from backend.analysis.model_router import call_model
+from backend.analysis.llm_usage import record_llm_call, response_tokens
+from backend.analysis.prompt_builder import build_prompt
+from backend.analysis.tokens import count_tokens
+
+if TYPE_CHECKING:
+    from openai import OpenAI
 
 
 SYSTEM_PROMPT = """
@@ -29,6 +38,9 @@ SYSTEM_PROMPT = """
 - 확신이 낮으면 보수적으로 분류한다.
 """
 
+# 본문 토큰 예산 (기존 6000자 자르기 대체)
+TEXT_TOKEN_BUDGET = int(os.getenv("SIGNAL_TEXT_TOKEN_BUDGET", "2000"))
+
 USER_PROMPT_TEMPLATE = """
 [source]
 {source}
@@ -42,13 +54,16 @@ def _get_client() -> Optional[OpenAI]:
     api_key = os.getenv("OPENAI_API_KEY")
     if not api_key:
         return None
-    return OpenAI(api_key=api_key)
+
+    from openai import OpenAI
+
+    return OpenAI(api_key=api_key, max_retries=0)
 
 
 def classify_signal_with_llm(
     source: str,
     text: str,
-    model: str = "gpt-4.1-mini",
+    model: Optional[str] = None,
 ) -> Optional[Dict[str, str]]:
     client = _get_client()
     if client is None:
@@ -57,28 +72,59 @@ def classify_signal_with_llm(
     if not text or not text.strip():
         return None
 
-    user_prompt = USER_PROMPT_TEMPLATE.format(
+    user_prompt = build_prompt(
+        USER_PROMPT_TEMPLATE,
+        {"text": TEXT_TOKEN_BUDGET},
         source=source,
-        text=text[:6000],
+        text=text,
     )
 
-    response = client.chat.completions.create(
-        model=model,
-        temperature=0,
-        response_format={"type": "json_object"},
-        messages=[
-            {"role": "system", "content": SYSTEM_PROMPT},
-            {"role": "user", "content": user_prompt},
-        ],
-    )
-
-    content = response.choices[0].message.content
-    if not content:
+    def _create(model_name: str, timeout: float):
+        return client.chat.completions.create(
+            model=model_name,
+            temperature=0,
+            response_format={"type": "json_object"},
+            messages=[
+                {"role": "system", "content": SYSTEM_PROMPT},
+                {"role": "user", "content": user_prompt},
+            ],
+            timeout=timeout,
+        )
+
+    started = time.perf_counter()
+    try:
+        # model 을 넘기지 않으면 라우터가 tier 선택 (기본 tier: standard = 기존 gpt-4.1-mini)
+        response, _ = call_model(
+            _create,
+            model=model,
+            input_tokens=count_tokens(SYSTEM_PROMPT) + count_tokens(user_prompt),
+            preferred="standard",
+            caller="llm_signal_classifier",
+        )
+    except LLMUnavailable as e:
+        # deadline 초과 / circuit open → None (호출 측이 signal_classifier 규칙으로 분류)
+        record_llm_call("llm_signal_classifier", elapsed=time.perf_counter() - started, error=True)
+        print(f"[WARN] LLM 분류 생략: {e}")
         return None
+    except Exception:
+        record_llm_call("llm_signal_classifier", elapsed=time.perf_counter() - started, error=True)
+        raise
 
+    content = response.choices[0].message.content
+    prompt_tokens, completion_tokens, cached_tokens = response_tokens(response, SYSTEM_PROMPT + user_prompt, content or "")
     try:
-        data = json.loads(content)
+        data = json.loads(content) if content else None
     except json.JSONDecodeError:
+        data = None
+    record_llm_call(
+        "llm_signal_classifier",
+        prompt_tokens=prompt_tokens,
+        completion_tokens=completion_tokens,
+        cached_tokens=cached_tokens,
+        elapsed=time.perf_counter() - started,
+        outcome="ok" if data is not None else "parse_error",
+    )
+    if data is None:
         return None
 
     required_keys = [
@@ -4,6 +4,7 @@ from typing import Dict, List, Optional
 from sqlalchemy import text
 from sqlalchemy.orm import Session
 
+from backend.analysis.llm_scheduler import llm_tenant
 from backend.service.llm_signal_classifier import classify_signal_with_llm
 from backend.service.signal_classifier import classify_signal
 
@@ -116,10 +117,11 @@ def create_news_signals(
             continue
 
         full_text = " ".join([title, article_summary, content])
-        classified = classify_signal_with_llm(
-            source="news",
-            text=full_text,
-        )
+        with llm_tenant(f"tenant:{tenant_id}"):
+            classified = classify_signal_with_llm(
+                source="news",
+                text=full_text,
+            )
 
         if not classified:
             classified = classify_signal(full_text)
@@ -0,0 +1,300 @@
+from __future__ import annotations
+
+import os
+import time
+from datetime import date
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from backend.analysis.review_annotator import (
+    ANNOTATION_PROMPT_VERSION,
+    annotate_reviews,
+    sentiment_from_rating,
+)
+from backend.core.serialization import dumps_str
+
+
+# LLM 1회당 annotation 할 리뷰 수
+ANNOTATION_CHUNK_SIZE = int(os.getenv("REVIEW_ANNOTATION_CHUNK_SIZE", "20"))
+# annotation 된 리뷰 비율이 이 값 이상일 때만 기간 집계를 annotation 기준으로 대체
+ANNOTATION_MIN_COVERAGE = float(os.getenv("REVIEW_ANNOTATION_MIN_COVERAGE", "0.8"))
+
+KEYWORD_CLOUD_LIMIT = 20
+ISSUE_LIMIT = 10
+
+
+# =========================================================
+# annotator (리뷰 적재 후 백그라운드 / 배치)
+# =========================================================
+def fetch_unannotated_reviews(
+    db: Session,
+    *,
+    store_id: Optional[str] = None,
+    after_id: int = 0,
+    limit: int = ANNOTATION_CHUNK_SIZE,
+) -> List[Dict[str, Any]]:
+    """
+    annotation 이 없거나 prompt_version 이 낮거나, annotation 이후 수정된 리뷰를 id 순으로 조회
+    """
+    rows = db.execute(
+        text(
+            """
+            SELECT r.id, r.tenant_id, r.store_id, r.rating, r.comment,
+                   DATE(r.created_at_google) AS day, r.updated_at_google
+            FROM google_reviews r
+            LEFT JOIN review_annotations a ON a.review_id = r.id
+            WHERE r.id > :after_id
+              AND (CAST(:store_id AS TEXT) IS NULL OR r.store_id = :store_id)
+              AND (
+                  a.review_id IS NULL
+                  OR a.prompt_version < :prompt_version
+                  OR a.review_updated_at IS DISTINCT FROM r.updated_at_google
+              )
+            ORDER BY r.id
+            LIMIT :limit
+            """
+        ),
+        {
+            "after_id": after_id,
+            "store_id": store_id,
+            "prompt_version": ANNOTATION_PROMPT_VERSION,
+            "limit": limit,
+        },
+    ).mappings().all()
+    return [dict(row) for row in rows]
+
+
+def _save_annotations(db: Session, rows: List[Dict[str, Any]], annotations: List[Dict[str, Any]]) -> None:
+    db.execute(
+        text(
+            """
+            INSERT INTO review_annotations (
+                review_id, tenant_id, store_id, day,
+                sentiment, sentiment_score, aspects, keywords,
+                model, prompt_version, review_updated_at
+            )
+            VALUES (
+                :review_id, :tenant_id, :store_id, :day,
+                :sentiment, :sentiment_score, CAST(:aspects AS jsonb), CAST(:keywords AS jsonb),
+                :model, :prompt_version, :review_updated_at
+            )
+            ON CONFLICT (review_id) DO UPDATE SET
+                day             = EXCLUDED.day,
+                sentiment       = EXCLUDED.sentiment,
+                sentiment_score = EXCLUDED.sentiment_score,
+                aspects         = EXCLUDED.aspects,
+                keywords        = EXCLUDED.keywords,
+                model           = EXCLUDED.model,
+                prompt_version  = EXCLUDED.prompt_version,
+                review_updated_at = EXCLUDED.review_updated_at,
+                updated_at      = NOW()
+            """
+        ),
+        [
+            {
+                "review_id": row["id"],
+                "tenant_id": row["tenant_id"],
+                "store_id": row["store_id"],
+                "day": row["day"],
+                "sentiment": annotation["sentiment"],
+                "sentiment_score": annotation["sentiment_score"],
+                "aspects": dumps_str(annotation["aspects"]),
+                "keywords": dumps_str(annotation["keywords"]),
+                "model": annotation["model"],
+                "prompt_version": ANNOTATION_PROMPT_VERSION,
+                "review_updated_at": row["updated_at_google"],
+            }
+            for row, annotation in zip(rows, annotations)
+        ],
+    )
+
+
+def run_annotate_reviews_batch(
+    db: Session,
+    *,
+    store_id: Optional[str] = None,
+    chunk_size: int = ANNOTATION_CHUNK_SIZE,
+    max_reviews: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    annotation 이 없는 리뷰를 chunk 단위로 annotation 해서 저장.
+    - 텍스트 없는(3자 이하) 리뷰는 LLM 없이 별점 기반으로 저장
+    - LLM 실패 chunk 는 건너뛰고 다음 실행에서 다시 시도
+    """
+    started = time.perf_counter()
+    stats = {"total": 0, "llm": 0, "rating_only": 0, "failed": 0, "chunks": 0}
+    after_id = 0
+
+    while max_reviews is None or stats["total"] < max_reviews:
+        rows = fetch_unannotated_reviews(db, store_id=store_id, after_id=after_id, limit=chunk_size)
+        if not rows:
+            break
+
+        after_id = rows[-1]["id"]
+        stats["chunks"] += 1
+
+        text_rows = [r for r in rows if r["comment"] and len(r["comment"].strip()) > 3]
+        rating_rows = [r for r in rows if not (r["comment"] and len(r["comment"].strip()) > 3)]
+
+        if rating_rows:
+            _save_annotations(db, rating_rows, [sentiment_from_rating(r["rating"]) for r in rating_rows])
+            stats["rating_only"] += len(rating_rows)
+
+        if text_rows:
+            annotations = annotate_reviews(text_rows)
+            if isinstance(annotations, dict):
+                stats["failed"] += len(text_rows)
+                print(f"[annotator] LLM 실패 ids={[r['id'] for r in text_rows]}: {annotations.get('message')}")
+            else:
+                _save_annotations(db, text_rows, annotations)
+                stats["llm"] += len(text_rows)
+
+        db.commit()
+        stats["total"] += len(rows)
+
+    stats["elapsed_seconds"] = round(time.perf_counter() - started, 3)
+    print(f"[annotator] store_id={store_id} {stats}")
+    return stats
+
+
+def annotate_reviews_in_background(store_id: Optional[str] = None) -> None:
+    """
+    FastAPI BackgroundTasks 용 — 요청 세션과 별도로 세션을 열어서 실행
+    """
+    from backend.db.session import SessionLocal
+
+    db = SessionLocal()
+    try:
+        run_annotate_reviews_batch(db, store_id=store_id)
+    except Exception as exc:
+        db.rollback()
+        print(f"[annotator] 백그라운드 annotation 실패: {exc}")
+    finally:
+        db.close()
+
+
+# =========================================================
+# 기간 집계 (SQL)
+# =========================================================
+def get_annotation_aggregates(
+    db: Session,
+    *,
+    store_id: str,
+    from_date: date,
+    to_date: date,
+) -> Dict[str, Any]:
+    """
+    기간 내 감성 분포 / 키워드 클라우드 / 이슈(부정 aspect) 빈도
+    """
+    params = {"store_id": store_id, "from_date": from_date, "to_date": to_date}
+
+    sentiment_rows = db.execute(
+        text(
+            """
+            SELECT sentiment, COUNT(*) AS cnt
+            FROM review_annotations
+            WHERE store_id = :store_id
+              AND day BETWEEN :from_date AND :to_date
+            GROUP BY sentiment
+            """
+        ),
+        params,
+    ).mappings().all()
+
+    keyword_rows = db.execute(
+        text(
+            """
+            SELECT kw->>'text' AS text, kw->>'polarity' AS polarity, COUNT(*) AS cnt
+            FROM review_annotations a
+            CROSS JOIN LATERAL jsonb_array_elements(a.keywords) AS kw
+            WHERE a.store_id = :store_id
+              AND a.day BETWEEN :from_date AND :to_date
+              AND kw->>'polarity' IN ('positive', 'negative')
+            GROUP BY 1, 2
+            ORDER BY cnt DESC
+            """
+        ),
+        params,
+    ).mappings().all()
+
+    issue_rows = db.execute(
+        text(
+            """
+            SELECT asp->>'label' AS label, COUNT(*) AS cnt
+            FROM review_annotations a
+            CROSS JOIN LATERAL jsonb_array_elements(a.aspects) AS asp
+            WHERE a.store_id = :store_id
+              AND a.day BETWEEN :from_date AND :to_date
+              AND asp->>'polarity' = 'negative'
+            GROUP BY 1
+            ORDER BY cnt DESC
+            LIMIT :limit
+            """
+        ),
+        {**params, "limit": ISSUE_LIMIT},
+    ).mappings().all()
+
+    sentiment = {"positive": 0, "neutral": 0, "negative": 0}
+    for row in sentiment_rows:
+        if row["sentiment"] in sentiment:
+            sentiment[row["sentiment"]] = int(row["cnt"])
+
+    keywords: Dict[str, List[Dict[str, Any]]] = {"positive": [], "negative": []}
+    for row in keyword_rows:
+        bucket = keywords[row["polarity"]]
+        if len(bucket) < KEYWORD_CLOUD_LIMIT:
+            bucket.append({"text": row["text"], "count": int(row["cnt"])})
+
+    return {
+        "annotated": sum(sentiment.values()),
+        "sentiment": sentiment,
+        "positive_keywords": keywords["positive"],
+        "negative_keywords": keywords["negative"],
+        "issues": [{"label": row["label"], "count": int(row["cnt"])} for row in issue_rows],
+    }
+
+
+def _keyword_cloud(items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    # 빈도 → size 10~40 (대시보드 워드클라우드 규격)
+    if not items:
+        return []
+    top = max(item["count"] for item in items)
+    return [
+        {"text": item["text"], "size": 10 + round(30 * item["count"] / top)}
+        for item in items
+    ]
+
+
+def apply_annotation_aggregates(
+    result: Dict[str, Any],
+    aggregates: Dict[str, Any],
+    review_count: int,
+) -> Dict[str, Any]:
+    """
+    LLM 결과의 감성 분포 / 키워드를 annotation 집계값으로 대체한다.
+    annotation 커버리지가 ANNOTATION_MIN_COVERAGE 미만이면 LLM 값을 그대로 둔다.
+    """
+    annotated = aggregates["annotated"]
+    if not review_count or annotated / review_count < ANNOTATION_MIN_COVERAGE:
+        return result
+
+    result["sentiment"] = {
+        name: round(count * 100 / annotated, 1)
+        for name, count in aggregates["sentiment"].items()
+    }
+    if aggregates["positive_keywords"]:
+        result["positive_keywords"] = _keyword_cloud(aggregates["positive_keywords"])
+    if aggregates["negative_keywords"]:
+        result["negative_keywords"] = _keyword_cloud(aggregates["negative_keywords"])
+    # all_keywords 도 같은 집계에서 다시 만든다 (LLM 키워드와 섞이면 감성 키워드와 어긋난다)
+    counts: Dict[str, int] = {}
+    for item in aggregates["positive_keywords"] + aggregates["negative_keywords"]:
+        counts[item["text"]] = counts.get(item["text"], 0) + item["count"]
+    if counts:
+        top = sorted(counts.items(), key=lambda kv: kv[1], reverse=True)[:KEYWORD_CLOUD_LIMIT]
+        result["all_keywords"] = _keyword_cloud([{"text": text, "count": count} for text, count in top])
+    result["issue_frequencies"] = aggregates["issues"]
+    result["annotation_coverage"] = round(annotated / review_count, 3)
+    return result
@@ -0,0 +1,188 @@
+from __future__ import annotations
+
+import os
+from datetime import date, timedelta
+from typing import Any
+
+from sqlalchemy import bindparam, text
+from sqlalchemy.orm import Session
+
+from backend.analysis.review_digest import DIGEST_VERSION, summarize_daily_reviews
+from backend.core.serialization import dumps_str
+
+
+# 실행 1회에 LLM 으로 다시 요약할 최대 일수 (버전 변경 / 대량 수정 시 비용 상한, 나머지는 다음 실행에서)
+MAX_DIGEST_DAYS_PER_RUN = int(os.getenv("REVIEW_DIGEST_MAX_DAYS_PER_RUN", "31"))
+
+STALE_DAYS_SQL = text(
+    """
+    SELECT s.day, s.updated_at, COUNT(*) OVER () AS total_stale
+    FROM store_daily_review_stats s
+    LEFT JOIN store_review_digests d
+      ON d.store_id = s.store_id
+     AND d.day = s.day
+     AND d.version = :version
+    WHERE s.store_id = :store_id
+      AND s.day BETWEEN :from_date AND :to_date
+      AND s.review_count > 0
+      AND (d.day IS NULL OR d.source_updated_at IS NULL OR d.source_updated_at < s.updated_at)
+    ORDER BY s.day DESC
+    LIMIT :limit
+    """
+)
+
+DAY_COMMENTS_SQL = text(
+    """
+    SELECT DATE(created_at_google) AS day, comment
+    FROM google_reviews
+    WHERE store_id = :store_id
+      AND created_at_google >= :start_day
+      AND created_at_google < :end_day
+      AND DATE(created_at_google) IN :days
+    ORDER BY created_at_google DESC
+    """
+).bindparams(bindparam("days", expanding=True))
+
+UPSERT_DIGEST_SQL = text(
+    """
+    INSERT INTO store_review_digests (
+        store_id, day, version, review_count, digest, source_updated_at
+    )
+    VALUES (
+        :store_id, :day, :version, :review_count, CAST(:digest AS jsonb), :source_updated_at
+    )
+    ON CONFLICT (store_id, day) DO UPDATE SET
+        version           = EXCLUDED.version,
+        review_count      = EXCLUDED.review_count,
+        digest            = EXCLUDED.digest,
+        source_updated_at = EXCLUDED.source_updated_at,
+        updated_at        = NOW()
+    """
+)
+
+LOAD_DIGESTS_SQL = text(
+    """
+    SELECT day, digest
+    FROM store_review_digests
+    WHERE store_id = :store_id
+      AND version = :version
+      AND day BETWEEN :from_date AND :to_date
+    ORDER BY day DESC
+    """
+)
+
+
+def _load_day_comments(
+    db: Session,
+    store_id: str,
+    days: list[date],
+) -> dict[date, list[str]]:
+    rows = db.execute(
+        DAY_COMMENTS_SQL,
+        {
+            "store_id": store_id,
+            "start_day": min(days),
+            "end_day": max(days) + timedelta(days=1),
+            "days": days,
+        },
+    ).mappings()
+
+    comments: dict[date, list[str]] = {day: [] for day in days}
+    for row in rows:
+        comment = row["comment"]
+        if comment and len(comment.strip()) > 3:
+            comments[row["day"]].append(comment)
+    return comments
+
+
+def ensure_daily_digests(
+    db: Session,
+    *,
+    store_id: str,
+    from_date: date,
+    to_date: date,
+) -> dict[str, Any]:
+    """
+    [from_date, to_date] 에서 digest 가 없거나 오래된(rollup 이 더 최근에 갱신된) 일자만 LLM 으로 요약한다.
+    평소에는 새로 리뷰가 들어온 날(보통 오늘/어제)만 LLM 입력이 된다.
+    최근 일자부터 MAX_DIGEST_DAYS_PER_RUN 일까지만 처리하고 나머지는 다음 실행으로 미룬다.
+    """
+    stale = db.execute(
+        STALE_DAYS_SQL,
+        {
+            "store_id": store_id,
+            "from_date": from_date,
+            "to_date": to_date,
+            "version": DIGEST_VERSION,
+            "limit": MAX_DIGEST_DAYS_PER_RUN,
+        },
+    ).mappings().all()
+
+    total_stale = int(stale[0]["total_stale"]) if stale else 0
+    stats = {
+        "stale_days": total_stale,
+        "deferred_days": total_stale - len(stale),
+        "summarized": 0,
+        "failed": 0,
+        "llm_reviews": 0,
+    }
+    if not stale:
+        return stats
+    if stats["deferred_days"]:
+        print(
+            f"[digest] store_id={store_id} stale {total_stale}일 중 최근 {len(stale)}일만 요약 "
+            f"(REVIEW_DIGEST_MAX_DAYS_PER_RUN={MAX_DIGEST_DAYS_PER_RUN}), 나머지는 다음 실행"
+        )
+
+    comments = _load_day_comments(db, store_id, [row["day"] for row in stale])
+
+    for row in stale:
+        day = row["day"]
+        reviews = comments.get(day, [])
+        digest = summarize_daily_reviews(reviews)
+
+        if digest.get("error") is True:
+            stats["failed"] += 1
+            print(f"[digest] 요약 실패 store_id={store_id} day={day}: {digest.get('message')}")
+            continue
+
+        db.execute(
+            UPSERT_DIGEST_SQL,
+            {
+                "store_id": store_id,
+                "day": day,
+                "version": DIGEST_VERSION,
+                "review_count": digest["review_count"],
+                "digest": dumps_str(digest),
+                "source_updated_at": row["updated_at"],
+            },
+        )
+        db.commit()
+
+        stats["summarized"] += 1
+        stats["llm_reviews"] += len(reviews)
+
+    print(f"[digest] store_id={store_id} {from_date}~{to_date} {stats}")
+    return stats
+
+
+def load_daily_digests(
+    db: Session,
+    *,
+    store_id: str,
+    from_date: date,
+    to_date: date,
+) -> list[dict]:
+    """
+    기간 내 digest 목록 (최신 일자 먼저)
+    """
+    rows = db.execute(
+        LOAD_DIGESTS_SQL,
+        {
+            "store_id": store_id,
+            "from_date": from_date,
+            "to_date": to_date,
+            "version": DIGEST_VERSION,
+        },
+    ).mappings()
+    return [row["digest"] for row in rows]
@@ -3,9 +3,17 @@ from __future__ import annotations
 import json
 import os
 import re
-from typing import Dict, Optional, Tuple
+import time
+from typing import TYPE_CHECKING, Dict, Optional, Tuple
 
-from openai import OpenAI
+
+from backend.analysis.model_router import call_model
+from backend.analysis.llm_usage import record_llm_call, response_tokens
+from backend.analysis.prompt_builder import build_prompt
+from backend.analysis.tokens import count_tokens
+
+if TYPE_CHECKING:
+    from openai import OpenAI
 
 
 SYSTEM_PROMPT = """
@@ -58,6 +66,13 @@ USER_PROMPT_TEMPLATE = """
 {content}
 """
 
+# 필드별 토큰 예산 (글자 수가 아니라 토큰 기준으로 자름)
+PROMPT_TOKEN_BUDGETS = {
+    "title": 150,
+    "article_summary": 400,
+    "content": int(os.getenv("SIGNAL_CONTENT_TOKEN_BUDGET", "2000")),
+}
+
 GENERIC_TERMS = {"허가", "승인", "계약", "투자", "출시", "규제", "이슈", "변경", "공시"}
 
 
@@ -85,7 +100,10 @@ def _get_client() -> Optional[OpenAI]:
     api_key = os.getenv("OPENAI_API_KEY")
     if not api_key:
         return None
-    return OpenAI(api_key=api_key)
+
+    from openai import OpenAI
+
+    return OpenAI(api_key=api_key, max_retries=0)
 
 
 def _normalize_short_label(value: str, limit: int = 40) -> str:
@@ -196,7 +214,7 @@ def classify_review_signal(
     content: str,
     title: str = "",
     article_summary: str = "",
-    model: str = "gpt-4.1-mini",
+    model: Optional[str] = None,
 ) -> Optional[Dict[str, str]]:
     """
     google_reviews 기반 텍스트를 LLM으로 분석한다.
@@ -211,34 +229,58 @@ def classify_review_signal(
     if not content or not content.strip():
         return None
 
-    user_prompt = USER_PROMPT_TEMPLATE.format(
+    user_prompt = build_prompt(
+        USER_PROMPT_TEMPLATE,
+        PROMPT_TOKEN_BUDGETS,
         source_type=source_type or "unknown",
-        title=(title or "")[:500],
-        article_summary=(article_summary or "")[:1000],
-        content=content[:6000],
+        title=title,
+        article_summary=article_summary,
+        content=content,
     )
 
-    try:
-        response = client.chat.completions.create(
-            model=model,
+    def _create(model_name: str, timeout: float):
+        return client.chat.completions.create(
+            model=model_name,
             temperature=0,
             response_format={"type": "json_object"},
             messages=[
                 {"role": "system", "content": SYSTEM_PROMPT},
                 {"role": "user", "content": user_prompt},
             ],
+            timeout=timeout,
+        )
+
+    started = time.perf_counter()
+    try:
+        # deadline / 재시도 / circuit breaker (open 이면 바로 실패 → 호출 측 규칙 분류)
+        # model 을 넘기지 않으면 라우터가 tier 선택 (기본 tier: standard = 기존 gpt-4.1-mini)
+        response, _ = call_model(
+            _create,
+            model=model,
+            input_tokens=count_tokens(SYSTEM_PROMPT) + count_tokens(user_prompt),
+            preferred="standard",
+            caller="review_signal_classifier",
         )
     except Exception as e:
+        record_llm_call("review_signal_classifier", elapsed=time.perf_counter() - started, error=True)
         print(f"[ERROR] OpenAI API 호출 실패: {e}")
         return None
 
     content_str = response.choices[0].message.content
-    if not content_str:
-        return None
-
+    prompt_tokens, completion_tokens, cached_tokens = response_tokens(response, SYSTEM_PROMPT + user_prompt, content_str or "")
     try:
-        data = json.loads(content_str)
+        data = json.loads(content_str) if content_str else None
     except json.JSONDecodeError:
+        data = None
+    record_llm_call(
+        "review_signal_classifier",
+        prompt_tokens=prompt_tokens,
+        completion_tokens=completion_tokens,
+        cached_tokens=cached_tokens,
+        elapsed=time.perf_counter() - started,
+        outcome="ok" if data is not None else "parse_error",
+    )
+    if data is None:
         print("[ERROR] LLM 응답 JSON 파싱 실패")
         return None
 
@@ -1,7 +1,10 @@
 from __future__ import annotations
 
-import json
+import os
 import re
+import socket
+import time
+import uuid
 from datetime import date, datetime
 from typing import Any, Dict, List, Optional, Tuple
 
@@ -10,7 +13,11 @@ from sqlalchemy.orm import Session
 
 from backend.core.fcm_client import send_fcm_to_devices
 from backend.core.redis_client import publish
+from backend.core.serialization import dumps_str
+from backend.analysis.llm_scheduler import llm_tenant
+from backend.analysis.model_router import all_circuits_open
 from backend.service.review_signal_classifier import classify_review_signal
+from backend.service.signal_classifier import classify_signal
 
 
 TENANT_ID = 7
@@ -33,6 +40,17 @@ SIGNAL_TYPE_TO_LABEL = {
 }
 
 NOTIFIABLE_LEVELS = {"HIGH", "MEDIUM", "LOW"}
+
+# 한 번에 점유할 리뷰 수 / 점유 유지 시간(초)
+CLAIM_CHUNK_SIZE = int(os.getenv("REVIEW_CLAIM_CHUNK_SIZE", "20"))
+LEASE_SECONDS = int(os.getenv("REVIEW_CLAIM_LEASE_SECONDS", "900"))
+
+# 재시도 예산: 최대 시도 횟수 / 백오프 기본값·상한(초)
+MAX_ANALYZE_ATTEMPTS = int(os.getenv("REVIEW_MAX_ANALYZE_ATTEMPTS", "5"))
+RETRY_BACKOFF_BASE_SECONDS = int(os.getenv("REVIEW_RETRY_BACKOFF_BASE_SECONDS", "600"))
+RETRY_BACKOFF_MAX_SECONDS = int(os.getenv("REVIEW_RETRY_BACKOFF_MAX_SECONDS", "86400"))
+# LLM 장애(모든 circuit open) 중 규칙으로도 분류 못 한 행을 미루는 시간 (시도 횟수는 차감하지 않음)
+OUTAGE_DEFER_SECONDS = int(os.getenv("REVIEW_OUTAGE_DEFER_SECONDS", "600"))
 GENERIC_EVENT_TERMS = {"허가", "승인", "계약", "투자", "출시", "규제", "이슈", "변경"}
 
 
@@ -165,7 +183,28 @@ def _build_notification_message(
     return f"{prefix}: " + " · ".join(parts)
 
 
-def fetch_unanalyzed_reviews(db: Session, store_id: str = STORE_ID) -> List[Dict[str, Any]]:
+def make_worker_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+
+def fetch_unanalyzed_reviews(
+    db: Session,
+    store_id: str = STORE_ID,
+    *,
+    worker_id: str,
+    limit: int = CLAIM_CHUNK_SIZE,
+    lease_seconds: int = LEASE_SECONDS,
+    after_id: int = 0,
+) -> List[Dict[str, Any]]:
+    """
+    분석 대상 리뷰를 최대 limit 건 점유(claim)한다.
+
+    - is_analyzed = 'N' 행, 또는 lease 가 만료된 'P' 행(죽은 워커가 남긴 행)이 대상
+    - next_eligible_at 이 아직 오지 않은 행, 재시도 예산을 소진한 행은 제외
+    - 점유한 행은 'P' + lease_owner / lease_expires_at 을 기록
+    - FOR UPDATE SKIP LOCKED 로 여러 워커가 동시에 실행해도 같은 행을 잡지 않음
+    - after_id 이후만 조회해서 한 번의 배치 안에서 재시도 행을 다시 잡지 않음
+    """
     rows = db.execute(
         text(
             """
@@ -173,7 +212,16 @@ def fetch_unanalyzed_reviews(db: Session, store_id: str = STORE_ID) -> List[Dict
                 SELECT id
                 FROM google_reviews
                 WHERE store_id = :store_id
-                  AND is_analyzed = 'N'
+                  AND id > :after_id
+                  AND analyze_attempts < :max_attempts
+                  AND (next_eligible_at IS NULL OR next_eligible_at <= NOW())
+                  AND (
+                        is_analyzed = 'N'
+                        OR (
+                            is_analyzed = 'P'
+                            AND (lease_expires_at IS NULL OR lease_expires_at < NOW())
+                        )
+                  )
                   AND COALESCE(
                         NULLIF(BTRIM(raw_comment), ''),
                         NULLIF(BTRIM(comment), ''),
@@ -181,13 +229,18 @@ def fetch_unanalyzed_reviews(db: Session, store_id: str = STORE_ID) -> List[Dict
                         NULLIF(BTRIM(article_title), '')
                   ) IS NOT NULL
                 ORDER BY id
+                LIMIT :limit
                 FOR UPDATE SKIP LOCKED
             )
             UPDATE google_reviews gr
-            SET is_analyzed = 'P'
+            SET is_analyzed = 'P',
+                lease_owner = :worker_id,
+                lease_expires_at = NOW() + make_interval(secs => :lease_seconds),
+                analyze_attempts = gr.analyze_attempts + 1
             FROM candidates c
             WHERE gr.id = c.id
             RETURNING
+                gr.id,
                 gr.google_review_id,
                 gr.author_name,
                 gr.source_type,
@@ -197,16 +250,147 @@ def fetch_unanalyzed_reviews(db: Session, store_id: str = STORE_ID) -> List[Dict
                 gr.published_at,
                 gr.raw_comment,
                 gr.comment,
-                gr.target_type_code
+                gr.target_type_code,
+                gr.lease_owner,
+                gr.analyze_attempts
             """
         ),
-        {"store_id": store_id},
+        {
+            "store_id": store_id,
+            "after_id": after_id,
+            "limit": limit,
+            "worker_id": worker_id,
+            "lease_seconds": lease_seconds,
+            "max_attempts": MAX_ANALYZE_ATTEMPTS,
+        },
     ).mappings().all()
 
     db.commit()
+    return sorted((dict(r) for r in rows), key=lambda r: r["id"])
+
+
+def count_stuck_reviews(db: Session, store_id: str = STORE_ID) -> int:
+    """
+    lease 가 만료(또는 lease 정보 없이)된 채 'P' 로 남아 있는 행 수.
+    """
+    row = db.execute(
+        text(
+            """
+            SELECT COUNT(*)
+            FROM google_reviews
+            WHERE store_id = :store_id
+              AND is_analyzed = 'P'
+              AND (lease_expires_at IS NULL OR lease_expires_at < NOW())
+            """
+        ),
+        {"store_id": store_id},
+    ).fetchone()
+    return int(row[0] or 0) if row else 0
+
+
+def _dead_letter_exhausted_leases(db: Session, store_id: str = STORE_ID) -> int:
+    """
+    재시도 예산을 다 쓴 상태에서 lease 가 만료된 'P' 행(처리 도중 워커가 죽는 행)을 'D' 로 옮긴다.
+    """
+    rows = db.execute(
+        text(
+            """
+            UPDATE google_reviews
+            SET is_analyzed = 'D',
+                lease_owner = NULL,
+                lease_expires_at = NULL,
+                last_error = COALESCE(last_error, 'lease 만료 반복 (워커 중단)')
+            WHERE store_id = :store_id
+              AND is_analyzed = 'P'
+              AND (lease_expires_at IS NULL OR lease_expires_at < NOW())
+              AND analyze_attempts >= :max_attempts
+            RETURNING id
+            """
+        ),
+        {"store_id": store_id, "max_attempts": MAX_ANALYZE_ATTEMPTS},
+    ).fetchall()
+    db.commit()
+    return len(rows)
+
+
+def list_dead_letter_reviews(
+    db: Session,
+    store_id: Optional[str] = None,
+    limit: int = 100,
+) -> List[Dict[str, Any]]:
+    rows = db.execute(
+        text(
+            """
+            SELECT
+                id,
+                store_id,
+                google_review_id,
+                source_type,
+                article_title,
+                analyze_attempts,
+                last_error,
+                next_eligible_at
+            FROM google_reviews
+            WHERE is_analyzed = 'D'
+              AND (CAST(:store_id AS TEXT) IS NULL OR store_id = :store_id)
+            ORDER BY id
+            LIMIT :limit
+            """
+        ),
+        {"store_id": store_id, "limit": limit},
+    ).mappings().all()
     return [dict(r) for r in rows]
 
 
+def requeue_dead_letter_reviews(
+    db: Session,
+    *,
+    ids: Optional[List[int]] = None,
+    store_id: Optional[str] = None,
+    all_stores: bool = False,
+) -> List[int]:
+    """
+    dead-letter 행을 'N' 으로 되돌리고 재시도 예산을 초기화한다.
+    ids 를 주면 해당 행만, 없으면 store_id 의 dead-letter 전부.
+    테이블 전체 재투입은 all_stores=True 로 명시해야 한다 (필터 없이 호출하면 ValueError).
+    """
+    if not ids and not store_id and not all_stores:
+        raise ValueError("ids 또는 store_id 가 필요합니다. (전체 재투입은 all_stores=True)")
+
+    if ids:
+        query = text(
+            """
+            UPDATE google_reviews
+            SET is_analyzed = 'N',
+                analyze_attempts = 0,
+                next_eligible_at = NULL,
+                last_error = NULL
+            WHERE is_analyzed = 'D'
+              AND id IN :ids
+            RETURNING id
+            """
+        ).bindparams(bindparam("ids", expanding=True))
+        params: Dict[str, Any] = {"ids": ids}
+    else:
+        query = text(
+            """
+            UPDATE google_reviews
+            SET is_analyzed = 'N',
+                analyze_attempts = 0,
+                next_eligible_at = NULL,
+                last_error = NULL
+            WHERE is_analyzed = 'D'
+              AND (CAST(:store_id AS TEXT) IS NULL OR store_id = :store_id)
+            RETURNING id
+            """
+        )
+        params = {"store_id": store_id}
+
+    rows = db.execute(query, params).fetchall()
+    db.commit()
+    return sorted(int(r[0]) for r in rows)
+
+
 def _find_signal_id_by_source(db: Session, source: str, source_id: str) -> Optional[int]:
     row = db.execute(
         text(
@@ -561,29 +745,83 @@ def _upsert_notification(
     return _insert_notification_without_signal_conflict(db, data), True
 
 
-def _mark_as_analyzed(db: Session, google_review_id: str) -> None:
+def _mark_as_analyzed(db: Session, row: Dict[str, Any]) -> None:
+    db.execute(
+        text(
+            """
+            UPDATE google_reviews
+            SET is_analyzed = 'Y',
+                lease_owner = NULL,
+                lease_expires_at = NULL
+            WHERE id = :id
+              AND lease_owner = :lease_owner
+            """
+        ),
+        {"id": row["id"], "lease_owner": row["lease_owner"]},
+    )
+
+
+def _retry_backoff_seconds(attempts: int) -> int:
+    return min(RETRY_BACKOFF_BASE_SECONDS * (2 ** max(attempts - 1, 0)), RETRY_BACKOFF_MAX_SECONDS)
+
+
+def _mark_for_retry(db: Session, row: Dict[str, Any], reason: str, *, permanent: bool = False) -> bool:
+    """
+    실패한 행을 재시도 대기('N' + next_eligible_at)로 돌린다.
+    재시도 예산을 소진했거나 다시 해도 같은 결과인 실패(permanent=True)면 dead-letter('D')로 보내고 True 반환.
+    """
+    attempts = int(row.get("analyze_attempts") or 0)
+    dead_letter = permanent or attempts >= MAX_ANALYZE_ATTEMPTS
+
     db.execute(
         text(
             """
             UPDATE google_reviews
-            SET is_analyzed = 'Y'
-            WHERE google_review_id = :google_review_id
+            SET is_analyzed = :next_state,
+                lease_owner = NULL,
+                lease_expires_at = NULL,
+                next_eligible_at = NOW() + make_interval(secs => :backoff_seconds),
+                last_error = :reason
+            WHERE id = :id
+              AND lease_owner = :lease_owner
             """
         ),
-        {"google_review_id": google_review_id},
+        {
+            "id": row["id"],
+            "lease_owner": row["lease_owner"],
+            "next_state": "D" if dead_letter else "N",
+            "backoff_seconds": _retry_backoff_seconds(attempts),
+            "reason": reason[:500],
+        },
     )
+    return dead_letter
 
 
-def _mark_for_retry(db: Session, google_review_id: str) -> None:
+def _defer_without_attempt(db: Session, row: Dict[str, Any], reason: str) -> None:
+    """
+    점유를 풀고 OUTAGE_DEFER_SECONDS 뒤로 미룬다. 점유 때 올린 analyze_attempts 는 되돌린다.
+    (LLM 장애처럼 행 자체와 무관한 실패로 재시도 예산을 쓰지 않기 위함)
+    """
     db.execute(
         text(
             """
             UPDATE google_reviews
-            SET is_analyzed = 'N'
-            WHERE google_review_id = :google_review_id
+            SET is_analyzed = 'N',
+                lease_owner = NULL,
+                lease_expires_at = NULL,
+                analyze_attempts = GREATEST(analyze_attempts - 1, 0),
+                next_eligible_at = NOW() + make_interval(secs => :defer_seconds),
+                last_error = :reason
+            WHERE id = :id
+              AND lease_owner = :lease_owner
             """
         ),
-        {"google_review_id": google_review_id},
+        {
+            "id": row["id"],
+            "lease_owner": row["lease_owner"],
+            "defer_seconds": OUTAGE_DEFER_SECONDS,
+            "reason": reason[:500],
+        },
     )
 
 
@@ -596,17 +834,18 @@ def _process_review(db: Session, row: Dict[str, Any]) -> Dict[str, Any]:
         "status": "failed",
         "notification_id": None,
         "notification_changed": False,
+        "dead_lettered": False,
     }
 
     if not source:
         print(f"[WARN] source_type 없음 — google_review_id={google_review_id}")
-        _mark_for_retry(db, google_review_id)
+        result["dead_lettered"] = _mark_for_retry(db, row, "source_type 없음", permanent=True)
         db.commit()
         return result
 
     if not content:
         print(f"[WARN] 분석 본문 없음 — google_review_id={google_review_id}")
-        _mark_for_retry(db, google_review_id)
+        result["dead_lettered"] = _mark_for_retry(db, row, "분석 본문 없음", permanent=True)
         db.commit()
         return result
 
@@ -616,9 +855,21 @@ def _process_review(db: Session, row: Dict[str, Any]) -> Dict[str, Any]:
         title=str(row.get("article_title") or ""),
         article_summary=str(row.get("article_summary") or ""),
     )
+    if not llm_raw and all_circuits_open():
+        # LLM 장애 중에는 timeout 을 기다리지 않고 규칙 기반 분류로 처리
+        llm_raw = classify_signal(
+            " ".join([str(row.get("article_title") or ""), str(row.get("article_summary") or ""), content])
+        )
+        if llm_raw:
+            print(f"[WARN] LLM circuit open — 규칙 분류 사용 google_review_id={google_review_id}")
+        else:
+            _defer_without_attempt(db, row, "LLM 장애 — 규칙 분류 불가")
+            db.commit()
+            result["status"] = "deferred"
+            return result
     if not llm_raw:
         print(f"[WARN] LLM 분석 실패 — google_review_id={google_review_id}")
-        _mark_for_retry(db, google_review_id)
+        result["dead_lettered"] = _mark_for_retry(db, row, "LLM 분석 실패")
         db.commit()
         return result
 
@@ -684,7 +935,7 @@ def _process_review(db: Session, row: Dict[str, Any]) -> Dict[str, Any]:
                 detected_at=detected_at,
             )
 
-        _mark_as_analyzed(db, google_review_id)
+        _mark_as_analyzed(db, row)
         db.commit()
 
         result["notification_id"] = notification_id
@@ -697,7 +948,7 @@ def _process_review(db: Session, row: Dict[str, Any]) -> Dict[str, Any]:
         print(f"[ERROR] 리뷰 처리 실패 — google_review_id={google_review_id}: {e}")
 
         try:
-            _mark_for_retry(db, google_review_id)
+            result["dead_lettered"] = _mark_for_retry(db, row, f"처리 실패: {e}")
             db.commit()
         except Exception as retry_e:
             db.rollback()
@@ -710,31 +961,81 @@ def run_analyze_reviews_batch(
     db: Session,
     tenant_id: int = TENANT_ID,
     store_id: str = STORE_ID,
-) -> Dict[str, int]:
+    *,
+    worker_id: Optional[str] = None,
+    chunk_size: int = CLAIM_CHUNK_SIZE,
+    lease_seconds: int = LEASE_SECONDS,
+) -> Dict[str, Any]:
+    """
+    chunk 단위로 리뷰를 점유 → 처리하는 것을 대상이 없을 때까지 반복한다.
+    여러 워커가 같은 store_id 로 동시에 실행해도 된다.
+    """
     tenant_id = TENANT_ID
-    rows = fetch_unanalyzed_reviews(db, store_id)
+    worker_id = worker_id or make_worker_id()
 
-    stats: Dict[str, int] = {
-        "total": len(rows),
+    stuck_before = count_stuck_reviews(db, store_id)
+    dead_lettered = _dead_letter_exhausted_leases(db, store_id)
+
+    stats: Dict[str, Any] = {
+        "total": 0,
         "inserted": 0,
         "skipped": 0,
         "failed": 0,
+        "deferred": 0,
+        "dead_lettered": dead_lettered,
+        "chunks": 0,
+        "claim_seconds": 0.0,
+        "claims_per_sec": 0.0,
+        "stuck_before": stuck_before,
+        "stuck_after": 0,
+        "worker_id": worker_id,
     }
 
     changed_notification_ids: List[int] = []
+    after_id = 0
+    started = time.perf_counter()
+
+    while True:
+        claim_started = time.perf_counter()
+        rows = fetch_unanalyzed_reviews(
+            db,
+            store_id,
+            worker_id=worker_id,
+            limit=chunk_size,
+            lease_seconds=lease_seconds,
+            after_id=after_id,
+        )
+        stats["claim_seconds"] += time.perf_counter() - claim_started
+
+        if not rows:
+            break
+
+        stats["chunks"] += 1
+        stats["total"] += len(rows)
+        after_id = rows[-1]["id"]
+
+        for row in rows:
+            with llm_tenant(f"tenant:{tenant_id}"):
+                outcome = _process_review(db, row)
+            stats[outcome["status"]] += 1
+            stats["dead_lettered"] += int(outcome["dead_lettered"])
 
-    for row in rows:
-        outcome = _process_review(db, row)
-        stats[outcome["status"]] += 1
+            if outcome.get("notification_changed") and outcome.get("notification_id"):
+                changed_notification_ids.append(outcome["notification_id"])
 
-        if outcome.get("notification_changed") and outcome.get("notification_id"):
-            changed_notification_ids.append(outcome["notification_id"])
+    elapsed = time.perf_counter() - started
+    stats["claim_seconds"] = round(stats["claim_seconds"], 3)
+    stats["claims_per_sec"] = round(stats["total"] / elapsed, 2) if elapsed > 0 else 0.0
+    stats["stuck_after"] = count_stuck_reviews(db, store_id)
 
     print(
         f"[BATCH] analyze-reviews 완료 | "
-        f"tenant_id={tenant_id} total={stats['total']} "
+        f"tenant_id={tenant_id} worker={worker_id} total={stats['total']} "
         f"inserted={stats['inserted']} skipped={stats['skipped']} "
-        f"failed={stats['failed']} notifications_changed={len(changed_notification_ids)}"
+        f"failed={stats['failed']} deferred={stats['deferred']} dead_lettered={stats['dead_lettered']} "
+        f"notifications_changed={len(changed_notification_ids)} "
+        f"chunks={stats['chunks']} claims_per_sec={stats['claims_per_sec']} "
+        f"stuck_before={stats['stuck_before']} stuck_after={stats['stuck_after']}"
     )
 
     if changed_notification_ids:
@@ -775,7 +1076,7 @@ def _send_alerts(db: Session, notification_ids: List[int]) -> None:
 
     try:
         for row in rows:
-            payload = json.dumps(
+            payload = dumps_str(
                 {
                     "tenant_id": 7,
                     "db_id": row["id"],
@@ -786,6 +1087,8 @@ def _send_alerts(db: Session, notification_ids: List[int]) -> None:
                     "company_name": row["company_name"],
                     "link_url": row["link_url"],
                     "open_panel": False,
+                    # 리스너 지연(redis_listener_lag_seconds) 측정용
+                    "published_at": time.time(),
                 }
             )
             publish("alert_channel", payload)
@@ -795,7 +1098,7 @@ def _send_alerts(db: Session, notification_ids: List[int]) -> None:
         print(f"[ERROR] Redis 건별 발송 실패: {e}")
 
     try:
-        payload = json.dumps(
+        payload = dumps_str(
             {
                 "tenant_id": 7,
                 "message": summary_message,
@@ -803,6 +1106,7 @@ def _send_alerts(db: Session, notification_ids: List[int]) -> None:
                 "signal_type_label": "시스템 알림",
                 "company_name": "",
                 "open_panel": True,
+                "published_at": time.time(),
             }
         )
         publish("alert_channel", payload)
@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+from datetime import date, datetime
+from typing import Dict, Iterable, Literal, Optional
+
+from sqlalchemy import bindparam, func, text
+from sqlalchemy.orm import Session
+
+from backend.db.models import StoreDailyReviewStats
+
+
+S = StoreDailyReviewStats
+
+_RATED_COUNT = S.star_1 + S.star_2 + S.star_3 + S.star_4 + S.star_5
+
+
+# =========================================================
+# rollup 갱신 (리뷰 적재 시)
+# =========================================================
+REFRESH_SQL = text(
+    """
+    INSERT INTO store_daily_review_stats (
+        store_id, day, tenant_id, review_count, rating_sum,
+        star_1, star_2, star_3, star_4, star_5, negative_count
+    )
+    SELECT
+        store_id,
+        DATE(created_at_google) AS day,
+        MAX(tenant_id),
+        COUNT(*),
+        COALESCE(SUM(rating), 0),
+        COUNT(*) FILTER (WHERE rating = 1),
+        COUNT(*) FILTER (WHERE rating = 2),
+        COUNT(*) FILTER (WHERE rating = 3),
+        COUNT(*) FILTER (WHERE rating = 4),
+        COUNT(*) FILTER (WHERE rating = 5),
+        COUNT(*) FILTER (WHERE rating <= 2)
+    FROM google_reviews
+    WHERE store_id = :store_id
+      AND created_at_google IS NOT NULL
+      AND DATE(created_at_google) IN :days
+    GROUP BY store_id, DATE(created_at_google)
+    ON CONFLICT (store_id, day) DO UPDATE SET
+        tenant_id      = EXCLUDED.tenant_id,
+        review_count   = EXCLUDED.review_count,
+        rating_sum     = EXCLUDED.rating_sum,
+        star_1         = EXCLUDED.star_1,
+        star_2         = EXCLUDED.star_2,
+        star_3         = EXCLUDED.star_3,
+        star_4         = EXCLUDED.star_4,
+        star_5         = EXCLUDED.star_5,
+        negative_count = EXCLUDED.negative_count,
+        updated_at     = NOW()
+    """
+).bindparams(bindparam("days", expanding=True))
+
+
+def refresh_daily_review_stats(
+    db: Session,
+    changed_days: Dict[str, Iterable[date]],
+) -> int:
+    """
+    이번 적재에서 insert/update 된 리뷰가 있는 (매장, 일자) rollup 만 재계산한다.
+    (그 사이 변경 없는 일자의 updated_at 은 건드리지 않음 — digest stale 판정 기준)
+    changed_days: {store_id: {day, ...}}
+    commit 은 호출한 쪽에서 한다.
+    """
+    refreshed = 0
+    for store_id, days in changed_days.items():
+        days = sorted(set(days))
+        if not days:
+            continue
+        res = db.execute(REFRESH_SQL, {"store_id": store_id, "days": days})
+        refreshed += res.rowcount or 0
+    return refreshed
+
+
+# =========================================================
+# rollup 조회
+# =========================================================
+def get_rating_trend_from_stats(
+    db: Session,
+    *,
+    store_id: str,
+    unit: Literal["day", "week", "month"] = "day",
+    from_date: Optional[date] = None,
+    to_date: Optional[date] = None,
+    tenant_id: Optional[int] = None,
+):
+    """
+    일/주/월 단위 평점 추이. (date, avg_rating, review_count) row 목록
+    """
+    if unit == "day":
+        group_col = S.day
+    else:
+        group_col = func.date_trunc(unit, S.day)
+
+    query = (
+        db.query(
+            group_col.label("date"),
+            (func.sum(S.rating_sum) / func.nullif(func.sum(_RATED_COUNT), 0)).label("avg_rating"),
+            func.sum(S.review_count).label("review_count"),
+        )
+        .filter(S.store_id == store_id)
+        .group_by(group_col)
+        .order_by(group_col)
+    )
+
+    if tenant_id is not None:
+        query = query.filter(S.tenant_id == tenant_id)
+    if from_date:
+        query = query.filter(S.day >= from_date)
+    if to_date:
+        query = query.filter(S.day <= to_date)
+
+    return query.all()
+
+
+def get_rating_distribution(
+    db: Session,
+    *,
+    store_id: str,
+    from_date: date,
+    to_date: date,
+) -> Dict:
+    """
+    [from_date, to_date] 기간 리뷰 수 / 별점 분포 (5점 → 1점 순)
+    """
+    row = (
+        db.query(
+            func.coalesce(func.sum(S.review_count), 0).label("review_count"),
+            func.coalesce(func.sum(S.star_1), 0).label("star_1"),
+            func.coalesce(func.sum(S.star_2), 0).label("star_2"),
+            func.coalesce(func.sum(S.star_3), 0).label("star_3"),
+            func.coalesce(func.sum(S.star_4), 0).label("star_4"),
+            func.coalesce(func.sum(S.star_5), 0).label("star_5"),
+            func.coalesce(func.sum(S.negative_count), 0).label("negative_count"),
+        )
+        .filter(
+            S.store_id == store_id,
+            S.day >= from_date,
+            S.day <= to_date,
+        )
+        .one()
+    )
+
+    return {
+        "review_count": int(row.review_count),
+        "negative_count": int(row.negative_count),
+        "rating_distribution": [
+            {"stars": stars, "count": int(getattr(row, f"star_{stars}"))}
+            for stars in (5, 4, 3, 2, 1)
+        ],
+    }
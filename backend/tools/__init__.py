@@ -0,0 +1 @@
+"""Offline load / concurrency tools for the LLM call paths."""
@@ -0,0 +1,475 @@
+"""
+오프라인 부하 테스트용 가짜 OpenAI 호환 서버 (POST /v1/chat/completions)
+
+- 지연 분포: fixed:0.5 / uniform:0.2,1.5 / lognormal:1.2,0.5 (중앙값, sigma) / exp:0.8 (평균)
+- 모델별 지연 / 오류율: --model-latency gpt-4o-mini=fixed:3 --model-error-rate gpt-4.1-mini=0.5
+  (요청 body 의 model 기준, 없으면 전역 --latency / --error-rate). 모델 라우팅 순서 / fallback 확인용
+- 오류: --error-rate (500), --rate-limit-rate (무작위 429), --rpm (분당 요청 한도 초과 시 429 + retry-after),
+  --hang-rate (응답을 --hang-seconds 동안 붙잡아 deadline / hedge 경로 확인)
+- 응답: system 메시지의 스키마를 보고 cx_dashboard / basic_sentiment / signal classifier /
+  daily digest / review annotation 형식의 고정 JSON 을 돌려준다. stream=True 면 SSE 청크로 나눠 보낸다.
+- usage: estimate_tokens 기준 토큰 수 (서버 자체는 tiktoken / 네트워크 없이 동작).
+  같은 system prefix(1024 토큰 이상)가 다시 오면 cached_tokens 로 보고
+
+    python -m backend.tools.fake_openai --port 8900 --latency lognormal:1.2,0.5 --rate-limit-rate 0.05
+    OPENAI_BASE_URL=http://127.0.0.1:8900/v1 OPENAI_API_KEY=fake uvicorn backend.main:app
+
+실행 중 설정 변경: POST /_fake/config (JSON, 예: {"error_rate": 1.0} 또는 {"model_latency": {"gpt-4o-mini": "fixed:5"}}) / 요청 통계: GET /_fake/stats
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import re
+import threading
+import time
+import uuid
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+
+from backend.analysis.tokens import estimate_tokens
+
+PROMPT_CACHE_MIN_TOKENS = 1024
+PROMPT_CACHE_BLOCK = 128
+STREAM_CHUNK_CHARS = 24
+
+DEFAULT_CONFIG: dict[str, Any] = {
+    "latency": "lognormal:1.0,0.4",
+    "error_rate": 0.0,
+    # {model: 지연 분포} / {model: 오류율} — 없는 모델은 latency / error_rate 사용
+    "model_latency": {},
+    "model_error_rate": {},
+    "rate_limit_rate": 0.0,
+    "rpm": 0,
+    "hang_rate": 0.0,
+    "hang_seconds": 120.0,
+    "stream_chunk_delay": 0.01,
+    "seed": None,
+}
+
+
+# =========================================================
+# 고정 응답 (스키마별)
+# =========================================================
+def _keywords(words: list[str]) -> list[dict]:
+    return [{"text": word, "size": 40 - index * 3} for index, word in enumerate(words)]
+
+
+CX_DASHBOARD_RESPONSE = {
+    "report_logic": {
+        "repeated_strengths": ["음식 맛", "직원 친절"],
+        "repeated_pains": ["대기 시간"],
+        "primary_focus_type": "IMPROVEMENT",
+        "primary_focus_label": "대기 경험",
+    },
+    "executive_summary": {
+        "summary": "음식 맛과 직원 응대에 대한 호평이 반복된다. 다만 주말 대기 시간에 대한 아쉬움이 이어진다. 대기 경험을 먼저 손보는 것이 효과적이다.",
+        "opportunity": "주말 대기 경험 완화",
+    },
+    "rating": 4.2,
+    "sentiment": {"positive": 68.0, "neutral": 17.0, "negative": 15.0},
+    "nps": {"score": 32.0, "promoters": 52.0, "passives": 28.0, "detractors": 20.0, "segment": "PASSIVES"},
+    "drivers_of_satisfaction": [
+        {"label": "음식 맛", "value": 72.0},
+        {"label": "직원 친절", "value": 58.0},
+    ],
+    "areas_for_improvement": [
+        {"label": "대기 시간", "value": 34.0, "urgency": "HIGH", "reason": "주말 웨이팅이 길다는 언급이 반복된다"},
+    ],
+    "strategic_insights": [
+        {"title": "맛이 재방문을 이끈다", "description": "음식 만족이 재방문 의사로 이어지는 언급이 많다"},
+    ],
+    "action_plan": [
+        {
+            "priority": "HIGH",
+            "title": "주말 대기 관리",
+            "description": "원격 줄서기와 예상 대기 시간 안내를 도입한다",
+            "expected_effect": "대기 불만 감소",
+            "timeline": "2주 이내",
+            "linked_to": "대기 시간",
+        },
+    ],
+    "positive_keywords": _keywords(["음식 맛", "친절한 직원", "깔끔한 매장", "푸짐한 양", "분위기", "재방문", "가성비", "신선한 재료", "빠른 서빙", "주차 편리"]),
+    "negative_keywords": _keywords(["대기 시간", "웨이팅", "좁은 좌석", "소음", "주차 불편", "가격", "응대 지연", "예약 어려움", "짠맛", "환기"]),
+    "neutral_keywords": _keywords(["주말 방문", "점심", "가족 모임", "포장", "메뉴 구성", "위치", "좌석", "영업시간", "주문", "배달"]),
+    "all_keywords": _keywords(["음식 맛", "대기 시간", "친절한 직원", "웨이팅", "분위기", "가성비", "좁은 좌석", "재방문", "주차", "메뉴 구성"]),
+}
+
+BASIC_SENTIMENT_RESPONSE = {
+    "score": 7.6,
+    "summary": "맛과 응대에 대한 만족이 높다. 대기 시간과 좌석 간격은 아쉽다는 의견이 반복된다.",
+    "strengths": ["음식 맛", "직원 친절"],
+    "improvements": ["대기 시간", "좌석 간격"],
+    "action_plans": [
+        {"title": "즉시 실행", "desc": "예상 대기 시간 안내"},
+        {"title": "운영 개선", "desc": "피크 타임 인력 보강"},
+        {"title": "중장기 전략", "desc": "좌석 배치 재설계"},
+    ],
+    "issue_matrix": [
+        {"label": "대기 시간", "frequency": 60, "impact": -4},
+        {"label": "음식 맛", "frequency": 80, "impact": 4},
+    ],
+}
+
+SIGNAL_RESPONSE = {
+    "signal_keyword": "공급계약 체결",
+    "signal_category": "계약",
+    "signal_level": "MEDIUM",
+    "signal_type": "OPPORTUNITY",
+    "event_type": "대규모 공급계약 체결",
+    "summary": "대상 기업, 해외 고객사와 대규모 공급계약 체결",
+    "industry_label": "제약/바이오",
+}
+
+
+def _digest_response(user_text: str) -> dict:
+    match = re.search(r"리뷰 수:\s*(\d+)", user_text)
+    total = int(match.group(1)) if match else 1
+    positive = round(total * 0.7)
+    negative = round(total * 0.15)
+    return {
+        "sentiment": {"positive": positive, "neutral": max(total - positive - negative, 0), "negative": negative},
+        "themes": [{"label": "음식 맛", "count": max(total // 2, 1)}],
+        "strengths": [{"label": "직원 친절", "count": max(total // 3, 1)}],
+        "pains": [{"label": "대기 시간", "count": max(total // 5, 1)}],
+        "positive_keywords": [{"text": "맛있는 음식", "weight": 8}],
+        "negative_keywords": [{"text": "긴 웨이팅", "weight": 5}],
+        "quotes": ["음식이 맛있고 직원분들이 친절해요"],
+    }
+
+
+def _annotation_response(user_text: str) -> dict:
+    annotations = []
+    for index in re.findall(r"^\[(\d+)\]", user_text, re.MULTILINE):
+        sentiment = ("positive", "positive", "neutral", "negative")[int(index) % 4]
+        annotations.append({
+            "i": int(index),
+            "sentiment": sentiment,
+            "score": {"positive": 0.8, "neutral": 0.0, "negative": -0.7}[sentiment],
+            "aspects": [{"label": "음식 맛", "polarity": sentiment}],
+            "keywords": [{"text": "음식 맛", "polarity": sentiment}],
+        })
+    return {"annotations": annotations}
+
+
+def canned_response(system_text: str, user_text: str) -> dict:
+    """
+    system 메시지의 JSON 스키마 키로 어느 호출인지 판별해서 그 형식의 응답을 만든다.
+    """
+    if '"annotations"' in system_text:
+        return _annotation_response(user_text)
+    if '"report_logic"' in system_text:
+        return CX_DASHBOARD_RESPONSE
+    if '"issue_matrix"' in system_text:
+        return BASIC_SENTIMENT_RESPONSE
+    if '"signal_keyword"' in system_text:
+        return SIGNAL_RESPONSE
+    if '"themes"' in system_text:
+        return _digest_response(user_text)
+    return {}
+
+
+# =========================================================
+# 서버
+# =========================================================
+def sample_latency(spec: str, rng: random.Random) -> float:
+    kind, _, params = spec.partition(":")
+    values = [float(value) for value in params.split(",") if value.strip()]
+    if kind == "fixed":
+        return values[0]
+    if kind == "uniform":
+        return rng.uniform(values[0], values[1])
+    if kind == "lognormal":
+        median, sigma = values
+        return median * rng.lognormvariate(0.0, sigma)
+    if kind == "exp":
+        return rng.expovariate(1.0 / values[0])
+    raise ValueError(f"알 수 없는 지연 분포: {spec}")
+
+
+def _validate_config(config: dict[str, Any]) -> None:
+    for spec in [config["latency"], *config["model_latency"].values()]:
+        sample_latency(spec, random.Random())
+    for rate in [config["error_rate"], *config["model_error_rate"].values()]:
+        if not 0.0 <= float(rate) <= 1.0:
+            raise ValueError(f"오류율은 0~1: {rate}")
+
+
+class FakeOpenAIState:
+    def __init__(self, config: dict[str, Any]) -> None:
+        self.lock = threading.Lock()
+        self.config = {**DEFAULT_CONFIG, **config}
+        _validate_config(self.config)
+        self.rng = random.Random(self.config["seed"])
+        self.request_times: deque[float] = deque()
+        self.seen_prefixes: set[int] = set()
+        self.stats = {"requests": 0, "ok": 0, "errors": 0, "rate_limited": 0, "hung": 0, "streamed": 0, "by_model": {}}
+
+    def update(self, changes: dict[str, Any]) -> dict[str, Any]:
+        with self.lock:
+            unknown = set(changes) - set(DEFAULT_CONFIG)
+            if unknown:
+                raise ValueError(f"알 수 없는 설정: {sorted(unknown)}")
+            config = {**self.config, **changes}
+            _validate_config(config)
+            self.config = config
+            return dict(config)
+
+    def decide(self, model: str = "") -> tuple[str, float]:
+        """
+        이번 요청의 결과("ok" / "error" / "rate_limited" / "hang")와 응답 전 대기 시간
+        """
+        with self.lock:
+            config = self.config
+            self.stats["requests"] += 1
+            self.stats["by_model"][model] = self.stats["by_model"].get(model, 0) + 1
+            error_rate = config["model_error_rate"].get(model, config["error_rate"])
+            now = time.monotonic()
+
+            if config["rpm"]:
+                while self.request_times and now - self.request_times[0] >= 60:
+                    self.request_times.popleft()
+                if len(self.request_times) >= config["rpm"]:
+                    self.stats["rate_limited"] += 1
+                    return "rate_limited", 60 - (now - self.request_times[0])
+                self.request_times.append(now)
+
+            roll = self.rng.random()
+            latency = sample_latency(config["model_latency"].get(model, config["latency"]), self.rng)
+            if roll < config["rate_limit_rate"]:
+                self.stats["rate_limited"] += 1
+                return "rate_limited", 1.0
+            roll -= config["rate_limit_rate"]
+            if roll < error_rate:
+                self.stats["errors"] += 1
+                return "error", latency
+            roll -= error_rate
+            if roll < config["hang_rate"]:
+                self.stats["hung"] += 1
+                return "hang", config["hang_seconds"]
+            self.stats["ok"] += 1
+            return "ok", latency
+
+    def cached_tokens(self, system_text: str, system_tokens: int) -> int:
+        if system_tokens < PROMPT_CACHE_MIN_TOKENS:
+            return 0
+        key = hash(system_text)
+        with self.lock:
+            if key not in self.seen_prefixes:
+                self.seen_prefixes.add(key)
+                return 0
+        return system_tokens - system_tokens % PROMPT_CACHE_BLOCK
+
+
+def _message_text(messages: list[dict], role: str) -> str:
+    return "\n".join(str(m.get("content") or "") for m in messages if m.get("role") == role)
+
+
+def make_handler(state: FakeOpenAIState) -> type[BaseHTTPRequestHandler]:
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, format: str, *args: Any) -> None:
+            pass
+
+        def _send_json(self, status: int, body: dict, headers: dict[str, str] | None = None) -> None:
+            data = json.dumps(body, ensure_ascii=False).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            for key, value in (headers or {}).items():
+                self.send_header(key, value)
+            self.end_headers()
+            self.wfile.write(data)
+
+        def _read_json(self) -> dict:
+            length = int(self.headers.get("Content-Length") or 0)
+            return json.loads(self.rfile.read(length) or b"{}")
+
+        def do_GET(self) -> None:
+            if self.path == "/_fake/stats":
+                with state.lock:
+                    stats = {**state.stats, "by_model": dict(state.stats["by_model"]), "config": dict(state.config)}
+                self._send_json(200, stats)
+                return
+            self._send_json(404, {"error": {"message": "not found", "type": "invalid_request_error"}})
+
+        def do_POST(self) -> None:
+            try:
+                body = self._read_json()
+            except ValueError:
+                self._send_json(400, {"error": {"message": "invalid json", "type": "invalid_request_error"}})
+                return
+
+            if self.path == "/_fake/config":
+                try:
+                    self._send_json(200, state.update(body))
+                except ValueError as exc:
+                    self._send_json(400, {"error": {"message": str(exc), "type": "invalid_request_error"}})
+                return
+            if self.path.rstrip("/").endswith("/chat/completions"):
+                try:
+                    self._chat_completions(body)
+                except (BrokenPipeError, ConnectionResetError):
+                    # 클라이언트 timeout / hedge 패자 연결 종료
+                    pass
+                return
+            self._send_json(404, {"error": {"message": "not found", "type": "invalid_request_error"}})
+
+        def _chat_completions(self, body: dict) -> None:
+            outcome, delay = state.decide(str(body.get("model") or ""))
+            if outcome == "rate_limited":
+                self._send_json(
+                    429,
+                    {"error": {"message": "Rate limit reached (fake)", "type": "rate_limit_exceeded", "code": "rate_limit_exceeded"}},
+                    {"retry-after": f"{max(delay, 0.0):.2f}"},
+                )
+                return
+
+            time.sleep(delay)
+            if outcome == "error":
+                self._send_json(500, {"error": {"message": "The server had an error (fake)", "type": "server_error"}})
+                return
+            if outcome == "hang":
+                self._send_json(504, {"error": {"message": "Gateway timeout (fake)", "type": "server_error"}})
+                return
+
+            messages = body.get("messages") or []
+            system_text = _message_text(messages, "system")
+            user_text = _message_text(messages, "user")
+            content = json.dumps(canned_response(system_text, user_text), ensure_ascii=False)
+
+            system_tokens = estimate_tokens(system_text)
+            usage = {
+                "prompt_tokens": system_tokens + estimate_tokens(user_text),
+                "completion_tokens": estimate_tokens(content),
+                "prompt_tokens_details": {"cached_tokens": state.cached_tokens(system_text, system_tokens)},
+            }
+            usage["total_tokens"] = usage["prompt_tokens"] + usage["completion_tokens"]
+
+            completion_id = f"chatcmpl-fake-{uuid.uuid4().hex[:12]}"
+            model = body.get("model") or "fake"
+            if body.get("stream"):
+                with state.lock:
+                    state.stats["streamed"] += 1
+                self._stream(completion_id, model, content, usage, body)
+                return
+
+            self._send_json(200, {
+                "id": completion_id,
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": model,
+                "choices": [{
+                    "index": 0,
+                    "message": {"role": "assistant", "content": content},
+                    "finish_reason": "stop",
+                }],
+                "usage": usage,
+            })
+
+        def _stream(self, completion_id: str, model: str, content: str, usage: dict, body: dict) -> None:
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Cache-Control", "no-cache")
+            self.send_header("Connection", "close")
+            self.end_headers()
+            self.close_connection = True
+
+            def send(choices: list, extra: dict | None = None) -> None:
+                chunk = {
+                    "id": completion_id,
+                    "object": "chat.completion.chunk",
+                    "created": int(time.time()),
+                    "model": model,
+                    "choices": choices,
+                    **(extra or {}),
+                }
+                self.wfile.write(f"data: {json.dumps(chunk, ensure_ascii=False)}\n\n".encode("utf-8"))
+                self.wfile.flush()
+
+            chunk_delay = state.config["stream_chunk_delay"]
+            for start in range(0, len(content), STREAM_CHUNK_CHARS):
+                send([{"index": 0, "delta": {"content": content[start:start + STREAM_CHUNK_CHARS]}, "finish_reason": None}])
+                time.sleep(chunk_delay)
+            send([{"index": 0, "delta": {}, "finish_reason": "stop"}])
+            if (body.get("stream_options") or {}).get("include_usage"):
+                send([], {"usage": usage})
+            self.wfile.write(b"data: [DONE]\n\n")
+            self.wfile.flush()
+
+    return Handler
+
+
+def make_server(host: str = "127.0.0.1", port: int = 0, **config: Any) -> ThreadingHTTPServer:
+    """
+    port=0 이면 빈 포트를 잡는다 (server.server_address[1] 로 확인). 설정은 DEFAULT_CONFIG 키.
+    """
+    server = ThreadingHTTPServer((host, port), make_handler(FakeOpenAIState(config)))
+    server.daemon_threads = True
+    return server
+
+
+def start_in_background(host: str = "127.0.0.1", port: int = 0, **config: Any) -> tuple[ThreadingHTTPServer, str]:
+    """
+    같은 프로세스에서 스레드로 띄우고 (server, base_url) 반환. 종료는 server.shutdown()
+    """
+    server = make_server(host, port, **config)
+    threading.Thread(target=server.serve_forever, name="fake-openai", daemon=True).start()
+    bound_host, bound_port = server.server_address[:2]
+    return server, f"http://{bound_host}:{bound_port}/v1"
+
+
+def _model_option(value: str) -> tuple[str, str]:
+    model, sep, setting = value.partition("=")
+    if not sep or not model or not setting:
+        raise argparse.ArgumentTypeError(f"MODEL=값 형식이어야 합니다: {value}")
+    return model, setting
+
+
+def add_config_args(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--latency", default=DEFAULT_CONFIG["latency"], help="지연 분포. 예: fixed:0.5, uniform:0.2,1.5, lognormal:1.2,0.5, exp:0.8")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="500 응답 비율")
+    parser.add_argument(
+        "--model-latency", action="append", type=_model_option, default=[], metavar="MODEL=SPEC",
+        help="모델별 지연 분포 (여러 번 지정 가능). 예: gpt-4o-mini=fixed:3",
+    )
+    parser.add_argument(
+        "--model-error-rate", action="append", type=_model_option, default=[], metavar="MODEL=RATE",
+        help="모델별 500 응답 비율 (여러 번 지정 가능). 예: gpt-4.1-mini=0.5",
+    )
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="무작위 429 응답 비율")
+    parser.add_argument("--rpm", type=int, default=0, help="분당 요청 한도 (초과 시 429). 0 이면 무제한")
+    parser.add_argument("--hang-rate", type=float, default=0.0, help="--hang-seconds 동안 응답하지 않는 비율")
+    parser.add_argument("--hang-seconds", type=float, default=DEFAULT_CONFIG["hang_seconds"])
+    parser.add_argument("--stream-chunk-delay", type=float, default=DEFAULT_CONFIG["stream_chunk_delay"], help="stream 청크 간격(초)")
+    parser.add_argument("--seed", type=int, default=None)
+
+
+def config_from_args(args: argparse.Namespace) -> dict[str, Any]:
+    config = {key: getattr(args, key) for key in DEFAULT_CONFIG}
+    config["model_latency"] = dict(args.model_latency)
+    config["model_error_rate"] = {model: float(rate) for model, rate in args.model_error_rate}
+    return config
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8900)
+    add_config_args(parser)
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    server = make_server(args.host, args.port, **config_from_args(args))
+    print(f"[fake-openai] listening on http://{args.host}:{server.server_address[1]}/v1 config={config_from_args(args)}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
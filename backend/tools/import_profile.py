@@ -0,0 +1,137 @@
+"""
+서버 시작(import) 비용 측정 + 시작 시간 예산 검사
+
+새 인터프리터에서 `python -X importtime` 으로 backend.main 을 import 해서
+- 모듈별 cumulative / self import 시간 상위 N개
+- 최상위 패키지별 self 시간 합계
+- 전체 import 시간과 STARTUP_BUDGET_SECONDS 비교
+- 시작 시 불러오면 안 되는 무거운 패키지(LAZY_MODULES)가 import 됐는지
+를 출력한다. 예산 초과 / 무거운 패키지 import 시 exit 1 (CI 에서 검사용), import 실패 시 exit 2.
+
+    python -m backend.tools.import_profile
+    python -m backend.tools.import_profile --budget-seconds 2.5 --top 40
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+from pathlib import Path
+from typing import Any
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+
+STARTUP_BUDGET_SECONDS = float(os.getenv("STARTUP_BUDGET_SECONDS", "3"))
+
+# 첫 사용 시점에 불러오도록 바꾼 패키지 (시작 시 sys.modules 에 있으면 회귀)
+LAZY_MODULES = [
+    "pandas",
+    "googleapiclient",
+    "google_auth_oauthlib",
+    "firebase_admin",
+    "supabase",
+    "openai",
+]
+
+_IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)$")
+
+_PROBE = """
+import json, sys, time
+started = time.perf_counter()
+import {module}
+seconds = time.perf_counter() - started
+print(json.dumps({{"seconds": seconds, "loaded": [m for m in {lazy!r} if m in sys.modules]}}))
+"""
+
+
+def profile_imports(module: str = "backend.main") -> dict[str, Any]:
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _PROBE.format(module=module, lazy=LAZY_MODULES)],
+        cwd=REPO_ROOT,
+        env={**os.environ, "PYTHONPATH": os.pathsep.join(filter(None, [str(REPO_ROOT), os.getenv("PYTHONPATH")]))},
+        capture_output=True,
+        text=True,
+    )
+
+    modules = []
+    other_stderr = []
+    for line in proc.stderr.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if not match:
+            if not line.startswith("import time:"):
+                other_stderr.append(line)
+            continue
+        self_us, cumulative_us, indent, name = match.groups()
+        modules.append({
+            "module": name,
+            "depth": len(indent) // 2,
+            "self_seconds": int(self_us) / 1e6,
+            "cumulative_seconds": int(cumulative_us) / 1e6,
+        })
+
+    if proc.returncode != 0:
+        return {"ok": False, "module": module, "error": "\n".join(other_stderr[-20:])}
+
+    probe = json.loads(proc.stdout.strip().splitlines()[-1])
+    packages: dict[str, float] = {}
+    for item in modules:
+        package = item["module"].split(".")[0]
+        packages[package] = packages.get(package, 0.0) + item["self_seconds"]
+
+    return {
+        "ok": True,
+        "module": module,
+        "seconds": probe["seconds"],
+        "lazy_modules_loaded": probe["loaded"],
+        "modules": modules,
+        "packages": dict(sorted(packages.items(), key=lambda kv: kv[1], reverse=True)),
+    }
+
+
+def check_budget(report: dict[str, Any], budget_seconds: float) -> list[str]:
+    problems = []
+    if report["seconds"] > budget_seconds:
+        problems.append(f"import {report['seconds']:.2f}s > budget {budget_seconds:.2f}s")
+    if report["lazy_modules_loaded"]:
+        problems.append(f"시작 시 import 된 지연 로딩 대상: {', '.join(report['lazy_modules_loaded'])}")
+    return problems
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--module", default="backend.main")
+    parser.add_argument("--budget-seconds", type=float, default=STARTUP_BUDGET_SECONDS)
+    parser.add_argument("--top", type=int, default=25)
+    parser.add_argument("--json", action="store_true", help="결과를 JSON 으로만 출력")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    report = profile_imports(args.module)
+
+    if not report["ok"]:
+        print(f"[import-profile] {args.module} import 실패\n{report['error']}")
+        sys.exit(2)
+
+    problems = check_budget(report, args.budget_seconds)
+    if args.json:
+        print(json.dumps({**report, "budget_seconds": args.budget_seconds, "problems": problems}, ensure_ascii=False, indent=2))
+    else:
+        print(f"[import-profile] {args.module} import={report['seconds']:.3f}s budget={args.budget_seconds:.2f}s")
+        print(f"[import-profile] top {args.top} modules by cumulative time")
+        for item in sorted(report["modules"], key=lambda m: m["cumulative_seconds"], reverse=True)[:args.top]:
+            print(
+                f"  {item['cumulative_seconds'] * 1000:9.1f}ms  self {item['self_seconds'] * 1000:8.1f}ms  "
+                f"{'  ' * item['depth']}{item['module']}"
+            )
+        print(f"[import-profile] top {args.top} packages by self time")
+        for package, seconds in list(report["packages"].items())[:args.top]:
+            print(f"  {seconds * 1000:9.1f}ms  {package}")
+        for problem in problems:
+            print(f"[import-profile] FAIL {problem}")
+
+    sys.exit(1 if problems else 0)
@@ -0,0 +1,332 @@
+"""
+LLM 호출 경로 부하 테스트 (네트워크 없이 fake_openai 서버 대상)
+
+실제 코드 경로(analyze_cx_dashboard, 분류기 등 → model_router → llm_resilience → llm_scheduler)를
+동시에 돌려서 시나리오별 처리량 / 지연 분위수 / 실패 수와 각 모듈의 get_*_stats() 를 출력한다.
+
+    python -m backend.tools.llm_bench --scenario signal --requests 300 --concurrency 32
+    python -m backend.tools.llm_bench --scenario cx --scenario digest --latency lognormal:2,0.6 --rate-limit-rate 0.05
+    python -m backend.tools.llm_bench --base-url http://127.0.0.1:8900/v1 --scenario basic   # 따로 띄운 서버 사용
+    python -m backend.tools.llm_bench --scenario route_shift --requests 120 --slow-latency fixed:5
+    python -m backend.tools.llm_bench --no-tiktoken --min-success-rate 0.9 $(for s in cx cx_stream basic digest annotate signal review_signal; do echo --scenario $s; done)
+
+--base-url 이 없으면 같은 프로세스에 fake 서버를 띄운다 (지연 / 오류 옵션은 이 경우에만 적용).
+--no-tiktoken 은 tiktoken 인코딩 없이(오프라인 머신과 같은 조건) 토큰 추정치로 실행하고,
+--min-success-rate 는 시나리오별 성공률이 그보다 낮으면 exit 1 (오프라인 동작 확인 / CI 용).
+route_shift 는 interactive CX 호출을 두 단계로 보낸다. 2단계에서는 preferred tier 모델만 --slow-latency 로 느리게 해서
+단계별 모델 요청 수로 p95 기반 tier 교체(model_router 정책 4)를 보여준다.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import random
+import sys
+import threading
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable
+
+from backend.tools.fake_openai import add_config_args, config_from_args, start_in_background
+
+SCENARIOS = ["cx", "cx_stream", "basic", "digest", "annotate", "signal", "review_signal"]
+ROUTE_SHIFT = "route_shift"
+# route_shift 에서 tier 교체 기준 p95 (LLM_ROUTER_INTERACTIVE_P95_SECONDS 를 따로 주지 않았을 때).
+# fake 서버 기본 지연(lognormal:1.0,0.4)의 p95 보다 크고 --slow-latency 기본값보다 작게 잡는다
+ROUTE_SHIFT_P95_SECONDS = "3"
+
+REVIEW_PHRASES = [
+    "음식이 정말 맛있어요",
+    "직원분들이 친절하셨어요",
+    "주말에는 웨이팅이 너무 길어요",
+    "가격 대비 양이 많아요",
+    "매장이 깔끔하고 분위기가 좋아요",
+    "주차가 불편했어요",
+    "좌석 간격이 좁아서 시끄러웠어요",
+    "재방문 의사 있습니다",
+    "음식이 늦게 나왔어요",
+    "국물이 조금 짰어요",
+]
+
+NEWS_TEXTS = [
+    "A사, 미국 FDA 품목허가 획득… 하반기 현지 출시 예정",
+    "B사 공장 GMP 부적합 판정으로 일부 라인 생산중단",
+    "C사, 유럽 제약사와 2천억 원 규모 공급계약 체결",
+    "D사 제품 자진 회수(리콜) 결정, 품질 조사 착수",
+]
+
+
+def make_reviews(rng: random.Random, count: int) -> list[dict]:
+    return [
+        {
+            "comment": " ".join(rng.sample(REVIEW_PHRASES, rng.randint(1, 3))),
+            "rating": rng.randint(1, 5),
+        }
+        for _ in range(count)
+    ]
+
+
+def build_jobs(scenario: str, rng: random.Random, reviews_per_call: int) -> Callable[[], bool]:
+    """
+    시나리오 1건 실행 함수. 반환값: 성공(LLM 결과를 받음) 여부
+    """
+    # OPENAI_BASE_URL 등은 첫 LLM 호출 전에 정해져 있어야 한다 (engine.get_client 가 그때 클라이언트를 만든다)
+    from backend.analysis.basic_sentiment import analyze_basic_sentiment
+    from backend.analysis.cx_dashboard import analyze_cx_dashboard, stream_cx_dashboard
+    from backend.analysis.review_annotator import annotate_reviews
+    from backend.analysis.review_digest import summarize_daily_reviews
+    from backend.service.llm_signal_classifier import classify_signal_with_llm
+    from backend.service.review_signal_classifier import classify_review_signal
+
+    reviews = make_reviews(rng, reviews_per_call)
+    comments = [review["comment"] for review in reviews]
+    news = rng.choice(NEWS_TEXTS)
+
+    if scenario == "cx":
+        return lambda: not analyze_cx_dashboard(reviews).get("error")
+    if scenario == "cx_stream":
+        def run_stream() -> bool:
+            result: dict = {}
+            for event, data in stream_cx_dashboard(reviews):
+                if event == "result":
+                    result = data
+            return not result.get("error")
+        return run_stream
+    if scenario == "basic":
+        # basic_sentiment 은 LLM 실패 시 로컬 결과로 대체되므로 summary 로 LLM 응답 여부를 본다
+        return lambda: bool(analyze_basic_sentiment(comments).get("summary"))
+    if scenario == "digest":
+        return lambda: not summarize_daily_reviews(comments).get("error")
+    if scenario == "annotate":
+        return lambda: isinstance(annotate_reviews(reviews), list)
+    if scenario == "signal":
+        return lambda: classify_signal_with_llm(source="news", text=news) is not None
+    if scenario == "review_signal":
+        return lambda: classify_review_signal(source_type="google_review", content=" ".join(comments)) is not None
+    raise ValueError(f"알 수 없는 시나리오: {scenario}")
+
+
+def percentile(values: list[float], q: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * q), len(ordered) - 1)]
+
+
+def run_bench(
+    *,
+    scenarios: list[str],
+    requests: int,
+    concurrency: int,
+    tenants: int,
+    reviews_per_call: int,
+    seed: int | None,
+) -> dict[str, Any]:
+    from backend.analysis.llm_scheduler import llm_tenant
+
+    rng = random.Random(seed)
+    # 시나리오를 번갈아 섞어서 interactive / batch 가 동시에 경쟁하게 한다
+    jobs = [
+        (index, scenarios[index % len(scenarios)], build_jobs(scenarios[index % len(scenarios)], rng, reviews_per_call))
+        for index in range(requests)
+    ]
+
+    lock = threading.Lock()
+    results: dict[str, dict[str, Any]] = {
+        scenario: {"latencies": [], "ok": 0, "failed": 0, "exceptions": 0} for scenario in scenarios
+    }
+
+    def run(job: tuple[int, str, Callable[[], bool]]) -> None:
+        index, scenario, fn = job
+        started = time.perf_counter()
+        outcome = "exceptions"
+        try:
+            with llm_tenant(f"bench:{index % tenants}"):
+                outcome = "ok" if fn() else "failed"
+        except Exception as exc:
+            print(f"[bench] {scenario} 예외: {exc}")
+        elapsed = time.perf_counter() - started
+        with lock:
+            results[scenario]["latencies"].append(elapsed)
+            results[scenario][outcome] += 1
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="bench") as pool:
+        list(pool.map(run, jobs))
+    wall = time.perf_counter() - started
+
+    summary: dict[str, Any] = {"wall_seconds": round(wall, 3), "throughput_per_sec": round(requests / wall, 2), "scenarios": {}}
+    for scenario, values in results.items():
+        latencies = values.pop("latencies")
+        summary["scenarios"][scenario] = {
+            **values,
+            "requests": len(latencies),
+            "p50_seconds": round(percentile(latencies, 0.5), 3),
+            "p95_seconds": round(percentile(latencies, 0.95), 3),
+            "p99_seconds": round(percentile(latencies, 0.99), 3),
+            "max_seconds": round(max(latencies, default=0.0), 3),
+        }
+    return summary
+
+
+def _fake_admin(base_url: str, path: str, body: dict | None = None) -> dict:
+    url = base_url.rstrip("/").removesuffix("/v1") + path
+    data = json.dumps(body).encode("utf-8") if body is not None else None
+    request = urllib.request.Request(url, data=data, headers={"Content-Type": "application/json"})
+    with urllib.request.urlopen(request, timeout=10) as response:
+        return json.loads(response.read())
+
+
+def run_route_shift(
+    base_url: str,
+    *,
+    requests: int,
+    concurrency: int,
+    tenants: int,
+    reviews_per_call: int,
+    seed: int | None,
+    slow_latency: str,
+) -> dict[str, Any]:
+    """
+    1단계(baseline) 뒤 preferred tier 모델을 slow_latency 로 바꾸고 2단계(slow_preferred)를 돌린다.
+    단계별로 fake 서버가 받은 모델별 요청 수(by_model)와 router 통계를 돌려준다. (끝나면 설정 복구)
+    """
+    from backend.analysis.model_router import MODEL_TIERS, get_router_stats, route
+
+    preferred_model = MODEL_TIERS["mini"]["model"]
+    original = _fake_admin(base_url, "/_fake/stats")["config"]["model_latency"]
+    phases: dict[str, Any] = {}
+    try:
+        for phase, model_latency in (
+            ("baseline", original),
+            ("slow_preferred", {**original, preferred_model: slow_latency}),
+        ):
+            _fake_admin(base_url, "/_fake/config", {"model_latency": model_latency})
+            before = _fake_admin(base_url, "/_fake/stats")["by_model"]
+            summary = run_bench(
+                scenarios=["cx"],
+                requests=max(requests // 2, 1),
+                concurrency=concurrency,
+                tenants=tenants,
+                reviews_per_call=reviews_per_call,
+                seed=seed,
+            )
+            after = _fake_admin(base_url, "/_fake/stats")["by_model"]
+            phases[phase] = {
+                **summary["scenarios"]["cx"],
+                "by_model": {model: count - before.get(model, 0) for model, count in after.items() if count - before.get(model, 0)},
+                "order_after": route(input_tokens=1000, workload="interactive"),
+                "router": get_router_stats(),
+            }
+    finally:
+        _fake_admin(base_url, "/_fake/config", {"model_latency": original})
+    return {"preferred_model": preferred_model, "slow_latency": slow_latency, "phases": phases}
+
+
+def collect_stats() -> dict[str, Any]:
+    from backend.analysis.llm_resilience import get_resilience_stats
+    from backend.analysis.llm_scheduler import get_scheduler_stats
+    from backend.analysis.llm_usage import get_llm_usage_stats
+    from backend.analysis.model_router import get_router_stats
+
+    return {
+        "llm_usage": get_llm_usage_stats(),
+        "resilience": get_resilience_stats(),
+        "router": get_router_stats(),
+        "scheduler": get_scheduler_stats(),
+    }
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--scenario", action="append", dest="scenarios", choices=[*SCENARIOS, ROUTE_SHIFT], help="여러 번 지정 가능 (기본: signal)")
+    parser.add_argument("--slow-latency", default="fixed:5", help="route_shift 2단계에서 preferred tier 모델에 줄 지연 분포")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--tenants", type=int, default=4, help="요청을 나눠 줄 스케줄러 tenant 수")
+    parser.add_argument("--reviews-per-call", type=int, default=30)
+    parser.add_argument("--base-url", help="이미 떠 있는 OpenAI 호환 서버. 없으면 fake 서버를 같은 프로세스에 띄운다")
+    parser.add_argument("--json", action="store_true", help="결과를 JSON 으로만 출력")
+    parser.add_argument("--no-tiktoken", action="store_true", help="tiktoken 대신 토큰 추정치 사용 (오프라인 조건 재현)")
+    parser.add_argument("--min-success-rate", type=float, default=0.0, help="시나리오별 ok 비율 하한. 미달 시 exit 1")
+    add_config_args(parser)
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    if args.no_tiktoken:
+        os.environ["TOKEN_COUNTER"] = "estimate"
+
+    server = None
+    if args.base_url:
+        base_url = args.base_url
+    else:
+        server, base_url = start_in_background(**config_from_args(args))
+    os.environ["OPENAI_BASE_URL"] = base_url
+    os.environ.setdefault("OPENAI_API_KEY", "fake-key")
+
+    scenarios = args.scenarios or ["signal"]
+    route_shift = ROUTE_SHIFT in scenarios
+    scenarios = [scenario for scenario in scenarios if scenario != ROUTE_SHIFT]
+    if route_shift:
+        # model_router / llm_scheduler 가 import 되기 전에 정해야 한다.
+        # TPM 버킷 대기가 지연에 섞이지 않도록 따로 주지 않았으면 끈다
+        os.environ.setdefault("LLM_ROUTER_INTERACTIVE_P95_SECONDS", ROUTE_SHIFT_P95_SECONDS)
+        os.environ.setdefault("LLM_TOKENS_PER_MINUTE", "0")
+    if not args.json:
+        print(f"[bench] base_url={base_url} scenarios={scenarios} requests={args.requests} concurrency={args.concurrency}")
+
+    try:
+        report = run_bench(
+            scenarios=scenarios,
+            requests=args.requests,
+            concurrency=args.concurrency,
+            tenants=max(args.tenants, 1),
+            reviews_per_call=args.reviews_per_call,
+            seed=args.seed,
+        ) if scenarios else {"wall_seconds": 0.0, "throughput_per_sec": 0.0, "scenarios": {}}
+        if route_shift:
+            report[ROUTE_SHIFT] = run_route_shift(
+                base_url,
+                requests=args.requests,
+                concurrency=args.concurrency,
+                tenants=max(args.tenants, 1),
+                reviews_per_call=args.reviews_per_call,
+                seed=args.seed,
+                slow_latency=args.slow_latency,
+            )
+        report["stats"] = collect_stats()
+    finally:
+        if server is not None:
+            server.shutdown()
+
+    if args.json:
+        print(json.dumps(report, ensure_ascii=False, indent=2, default=str))
+    else:
+        print(f"[bench] wall={report['wall_seconds']}s throughput={report['throughput_per_sec']}/s")
+        for scenario, values in report["scenarios"].items():
+            print(
+                f"[bench] {scenario:<14} n={values['requests']} ok={values['ok']} failed={values['failed']} "
+                f"exceptions={values['exceptions']} p50={values['p50_seconds']}s p95={values['p95_seconds']}s "
+                f"p99={values['p99_seconds']}s max={values['max_seconds']}s"
+            )
+        if route_shift:
+            shift = report[ROUTE_SHIFT]
+            for phase, values in shift["phases"].items():
+                print(
+                    f"[bench] {ROUTE_SHIFT} {phase:<15} n={values['requests']} ok={values['ok']} "
+                    f"p50={values['p50_seconds']}s p95={values['p95_seconds']}s "
+                    f"by_model={values['by_model']} order_after={','.join(values['order_after'])}"
+                )
+        print(json.dumps(report["stats"], ensure_ascii=False, indent=2, default=str))
+
+    below = [
+        scenario for scenario, values in report["scenarios"].items()
+        if values["requests"] and values["ok"] / values["requests"] < args.min_success_rate
+    ]
+    if below:
+        print(f"[bench] FAIL 성공률 {args.min_success_rate:.0%} 미만: {', '.join(below)}")
+        sys.exit(1)